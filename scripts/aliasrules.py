@@ -0,0 +1,193 @@
+"""Check the cleanup rules deriving quantities from aliases, and time them.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.aliasrules [PATH ...]
+
+The aliases of every entry in the JSON files under each PATH (by default,
+the catalog's output and boneyard repositories) are passed through the rule
+table of the cleanup task, and through each rule's prefixes tried one by one
+on every alias, as the cleanup task did before the table. Exits with status
+1 if any derived discovery date or coordinates differ.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+from astrocats.catalog.utils import is_number
+
+from ..tasks import cleanup
+from .nameclean import default_paths
+
+
+def corpus(paths):
+    """Return the aliases of each entry in the JSON files under `paths`,
+    led by its name as in `Entry.get_aliases`.
+    """
+    entries = []
+    for path in paths:
+        for fname in sorted(glob.glob(os.path.join(path, '*.json'))):
+            with open(fname, 'r') as f:
+                data = json.load(f)
+            for name, entry in data.items():
+                aliases = [x['value'] for x in entry.get('alias', [])]
+                if name not in aliases:
+                    aliases = [name] + aliases
+                entries.append(aliases)
+    return entries
+
+
+def derived(aliases):
+    """Return the values derived from `aliases` by each cleanup rule."""
+    return [list(cleanup._alias_values(rule, aliases))
+            for rule in cleanup._ALIAS_RULES]
+
+
+def derived_linear(aliases):
+    """Return the values derived from `aliases` as `derived` does, trying
+    every prefix of every rule on every alias.
+    """
+    table = []
+
+    def first(prefixes, test):
+        values = []
+        for alias in aliases:
+            value = None
+            for prefix in prefixes:
+                if alias.startswith(prefix):
+                    value = test(alias, prefix)
+                    if value is not None:
+                        break
+            values.append(value)
+        table.append(values)
+
+    def yymmdd(alias, prefix):
+        if is_number(alias.replace(prefix, '')[:2]):
+            return '/'.join([
+                '20' + alias.replace(prefix, '')[:2],
+                alias.replace(prefix, '')[2:4],
+                alias.replace(prefix, '')[4:6]
+            ])
+
+    def yy(alias, prefix):
+        if (is_number(alias.replace(prefix, '')[:2]) and
+                is_number(alias.replace(prefix, '')[:1])):
+            return '20' + alias.replace(prefix, '')[:2]
+
+    def yyyymmdd(alias, prefix):
+        if is_number(alias.replace(prefix, '')[:4]):
+            return '/'.join([
+                alias.replace(prefix, '')[:4],
+                alias.replace(prefix, '')[4:6],
+                alias.replace(prefix, '')[6:8]
+            ])
+
+    def yymm(alias, prefix):
+        if is_number(alias.replace(prefix, '')[:2]):
+            return '/'.join([
+                '20' + alias.replace(prefix, '')[:2],
+                alias.replace(prefix, '')[2:4]
+            ])
+
+    def year(alias, prefix):
+        year = re.findall(r'\d+', alias)
+        if len(year) != 1:
+            return None
+        year = year[0]
+        if alias.replace(prefix, '').index(year) != 0:
+            return None
+        if year and is_number(year) and '.' not in year and len(year) <= 4:
+            return year
+
+    def radec(alias, prefix):
+        if not is_number(alias.replace(prefix, '')[:6]):
+            return None
+        noprefix = alias.split(':')[-1].replace(prefix, '').replace('.', '')
+        decsign = '+' if '+' in noprefix else '-'
+        noprefix = noprefix.replace('+', '|').replace('-', '|')
+        nops = noprefix.split('|')
+        if len(nops) < 2:
+            return None
+        rastr = nops[0]
+        decstr = nops[1]
+        ra = ':'.join([rastr[:2], rastr[2:4], rastr[4:6]]) + \
+            ('.' + rastr[6:] if len(rastr) > 6 else '')
+        dec = (
+            decsign + ':'.join([decstr[:2], decstr[2:4], decstr[4:6]]) +
+            ('.' + decstr[6:] if len(decstr) > 6 else ''))
+        return ra, dec
+
+    first(['MLS', 'SSS', 'CSS', 'GRB '], yymmdd)
+    first([
+        'ASASSN-', 'PS1-', 'PS1', 'PS', 'iPTF', 'PTF', 'SCP-', 'SNLS-',
+        'SPIRITS', 'LSQ', 'DES', 'SNHiTS', 'Gaia', 'GND', 'GNW', 'GSD',
+        'GSW', 'EGS', 'COS', 'OGLE', 'HST'
+    ], yy)
+    first(['SNF'], yyyymmdd)
+    first(['PTFS', 'SNSDF'], yymm)
+    first(['AT', 'SN', 'OGLE-', 'SM ', 'KSN'], year)
+    first([
+        'PSN J', 'MASJ', 'CSS', 'SSS', 'MASTER OT J', 'HST J', 'TCP J',
+        'MACS J', '2MASS J', 'EQ J', 'CRTS J', 'SMT J'
+    ], radec)
+    return table
+
+
+def apply(func, entries):
+    """Return the result of `func` for each entry, or the error it raised."""
+    results = []
+    for aliases in entries:
+        try:
+            results.append(func(aliases))
+        except Exception as err:
+            results.append(type(err).__name__)
+    return results
+
+
+def rate(func, entries):
+    """Return the entries passed through `func` per second."""
+    start = time.perf_counter()
+    apply(func, entries)
+    return len(entries) / max(time.perf_counter() - start, 1.0e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*',
+                        help='Directories of entry JSON files.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Passes over the corpus when timing.')
+    args = parser.parse_args()
+
+    entries = corpus(args.paths or default_paths())
+    if not entries:
+        print('No entries found.')
+        sys.exit(1)
+    print('Entries: {}, aliases: {}'.format(
+        len(entries), sum(len(x) for x in entries)))
+
+    expected = apply(derived_linear, entries)
+    mismatches = [
+        (aliases, x, y) for aliases, x, y in zip(
+            entries, expected, apply(derived, entries))
+        if x != y
+    ]
+    for aliases, x, y in mismatches[:20]:
+        print('{!r}: {!r} != {!r}'.format(aliases, y, x))
+    print('Mismatches: {}'.format(len(mismatches)))
+
+    repeated = entries * args.repeat
+    print('Entries per second:')
+    for label, func in (('every prefix', derived_linear),
+                        ('rule table', derived)):
+        print('{:>14.0f}  {}'.format(rate(func, repeated), label))
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Check `AsciiTable` and the batched ASCII photometry against reading and
+adding them row by row.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.asciicheck [PATH]
+
+Every file in the ASCII/ directory of PATH (by default, the catalog's
+`sne-external` input repository) is read with each delimiter `do_ascii`
+uses, both by `AsciiTable` and by `csv.reader`, and the rows, columns,
+numbers and MJDs each gives are compared. The ASCII task is then run twice
+on entries created empty, once as it is and once with
+`add_photometry_batch` adding each point with `add_photometry`, and the
+entries are compared. The output repositories are left untouched. Exits
+with status 1 if anything differs.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from math import isnan
+
+import numpy as np
+from astrocats.catalog.utils import is_number, jd_to_mjd, logger
+
+from ..supernova import Supernova
+from ..supernovacatalog import SupernovaCatalog
+from ..tasks.ascii import do_ascii
+from ..utils import AsciiTable
+from .nameclean import PATH_BASE
+
+DELIMITERS = ['\t', ',', ' ', '/']
+
+
+class ReplayCatalog(SupernovaCatalog):
+    """A catalog that runs a task on a given input repository, and keeps its
+    entries in memory instead of loading them from, or writing them to, the
+    output repositories.
+    """
+
+    def __init__(self, repo, *args, **kwargs):
+        super(ReplayCatalog, self).__init__(*args, **kwargs)
+        self.repo = repo
+
+    def load_entry_from_name(self, name, delete=True, merge=True):
+        return None
+
+    def get_current_task_repo(self):
+        return self.repo
+
+    def get_current_task_str(self):
+        return 'Replaying ASCII'
+
+    def journal_entries(self, *args, **kwargs):
+        pass
+
+
+def csv_rows(path, delimiter):
+    """Return the rows of `path` as `do_ascii` read them before
+    `AsciiTable`.
+    """
+    with open(path, 'r') as f:
+        return list(csv.reader(f, delimiter=delimiter, skipinitialspace=True))
+
+
+def table_differences(path, delimiter):
+    """Return what `AsciiTable` reads differently from `csv.reader` in
+    `path`.
+    """
+    diffs = []
+    rows = csv_rows(path, delimiter)
+    table = AsciiTable(path, delimiter=delimiter)
+    if table.rows != rows:
+        diffs.append('rows')
+    commented = AsciiTable(path, delimiter=delimiter, comment='#', skip=1)
+    if commented.rows != [x for x in rows[1:]
+                          if x and not x[0].startswith('#')]:
+        diffs.append('comment rows')
+    width = max([len(x) for x in rows] or [0])
+    for index in range(-2, width):
+        cells = [x[index] if -len(x) <= index < len(x) else '' for x in rows]
+        if table.column(index).tolist() != cells:
+            diffs.append('column {}'.format(index))
+            continue
+        numbers = [float(x) if is_number(x) and
+                   x not in AsciiTable.MISSING else np.nan for x in cells]
+        if not np.array_equal(table.numbers(index), numbers, equal_nan=True):
+            diffs.append('numbers {}'.format(index))
+        if all(is_number(x) and not isnan(float(x)) for x in cells):
+            for offset in (None, '2450000'):
+                mjds = [str(jd_to_mjd(Decimal(offset) + Decimal(x)
+                                      if offset else Decimal(x)))
+                        for x in cells]
+                if table.mjd(index, offset=offset).tolist() != mjds:
+                    diffs.append('mjd {} {}'.format(index, offset))
+    return diffs
+
+
+def add_points(self, compare_to_existing=True, **columns):
+    """Add the columns of an `add_photometry_batch` call point by point."""
+    cols = {}
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == 'f':
+                values = np.where(np.isnan(values), None, values)
+            values = values.tolist()
+        cols[name] = values
+    npoints = max([len(x) for x in cols.values()
+                   if isinstance(x, list)] or [1])
+    for ii in range(npoints):
+        photodict = {}
+        for name, values in cols.items():
+            value = values[ii] if isinstance(values, (list, tuple)) else values
+            if value is not None and value != '':
+                photodict[name] = value
+        self.add_photometry(
+            compare_to_existing=compare_to_existing, **photodict)
+    return npoints
+
+
+def replay(catalog):
+    """Run the ASCII task on an empty `catalog`, and return the entries as
+    JSON.
+    """
+    catalog.entries.clear()
+    catalog.aliases = {}
+    do_ascii(catalog)
+    return json.dumps(catalog.entries, sort_keys=True, default=dict)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', default=os.path.join(
+        PATH_BASE, 'input', 'sne-external'),
+        help='Directory holding the ASCII/ input files.')
+    args = parser.parse_args()
+
+    fnames = sorted(glob.glob(os.path.join(args.path, 'ASCII', '*.*')))
+    if not fnames:
+        print('No ASCII files found under ' + args.path)
+        sys.exit(1)
+
+    differ = 0
+    for fname in fnames:
+        for delimiter in DELIMITERS:
+            try:
+                diffs = table_differences(fname, delimiter)
+            except UnicodeDecodeError:
+                # Binary and non-UTF-8 files are not read with `csv`.
+                break
+            if diffs:
+                differ += 1
+                print('Read differently: {} {!r} ({})'.format(
+                    os.path.basename(fname), delimiter, ', '.join(diffs)))
+    print('Files read: {}, read differently: {}'.format(len(fnames), differ))
+
+    catalog = ReplayCatalog(
+        args.path,
+        argparse.Namespace(base_path='', private=True, travis=False,
+                           update=False),
+        logger.get_logger(stream_level=logger.WARNING))
+    batch = Supernova.add_photometry_batch
+    entries = []
+    timings = []
+    try:
+        for func in (batch, add_points):
+            Supernova.add_photometry_batch = func
+            start = time.time()
+            entries.append(replay(catalog))
+            timings.append(time.time() - start)
+    finally:
+        Supernova.add_photometry_batch = batch
+    for name, timing in zip(('batch', 'points'), timings):
+        print('{:>8}: {:.3f} s'.format(name, timing))
+    if entries[0] != entries[1]:
+        differ += 1
+    print('ASCII entries added differently: {}'.format(
+        int(entries[0] != entries[1])))
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Check that a parallel cleanup writes the same files as a serial one.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.cleanupcheck [--processes 4]
+
+The cleanup task is run on the entries in the output and boneyard
+repositories twice: once serially, and once with
+`ASTROCATS_CLEANUP_PROCESSES` set to the given number of processes. The
+repositories and the cache directory are restored from a copy before each
+run and once both are done, so they are left as they were found. Exits with
+status 1 if any file written by the two runs differs.
+
+Bibcode authors and extinctions missing from the caches are looked up
+again in each run, so the lookups should be cached beforehand for a
+meaningful comparison. The stub index, which records the modification
+time of each entry file, is not compared.
+"""
+import argparse
+import filecmp
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from .nameclean import PATH_BASE, default_paths
+
+COMMAND = ['-m', 'astrocats', '--no-predelete', 'supernovae', 'import',
+           '--load-stubs', '--tasks', 'cleanup']
+# Files that are expected to differ between any two runs.
+IGNORE = [os.path.join('cache', 'entry-stubs.json')]
+
+
+def folders():
+    """Return the directories a cleanup run writes to."""
+    return default_paths() + [os.path.join(PATH_BASE, 'output', 'cache')]
+
+
+def copy_folders(dest):
+    """Copy the files of each of `folders` under `dest`."""
+    for path in folders():
+        if os.path.isdir(path):
+            shutil.copytree(path, os.path.join(dest, os.path.basename(path)),
+                            ignore=shutil.ignore_patterns('.git'))
+
+
+def restore_folders(src):
+    """Replace the files of each of `folders` with those copied to `src`."""
+    for path in folders():
+        if os.path.isdir(path):
+            for fname in os.listdir(path):
+                if fname == '.git':
+                    continue
+                fpath = os.path.join(path, fname)
+                if os.path.isdir(fpath):
+                    shutil.rmtree(fpath)
+                else:
+                    os.remove(fpath)
+        copy = os.path.join(src, os.path.basename(path))
+        if os.path.isdir(copy):
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            for fname in os.listdir(copy):
+                fpath = os.path.join(copy, fname)
+                if os.path.isdir(fpath):
+                    shutil.copytree(fpath, os.path.join(path, fname))
+                else:
+                    shutil.copy2(fpath, path)
+
+
+def run_cleanup(processes):
+    """Run the cleanup task with `processes` processes."""
+    env = dict(os.environ)
+    env['ASTROCATS_CLEANUP_PROCESSES'] = str(processes)
+    subprocess.check_call([sys.executable] + COMMAND, env=env)
+
+
+def differences(dir1, dir2):
+    """Return the paths under `dir1` and `dir2` that are missing from one
+    or differ between them.
+    """
+    diffs = []
+    comparison = filecmp.dircmp(dir1, dir2)
+    stack = [('', comparison)]
+    while stack:
+        prefix, comp = stack.pop()
+        diffs.extend(os.path.join(prefix, x) for x in
+                     comp.left_only + comp.right_only + comp.funny_files)
+        _, mismatch, errors = filecmp.cmpfiles(
+            comp.left, comp.right, comp.common_files, shallow=False)
+        diffs.extend(os.path.join(prefix, x) for x in mismatch + errors)
+        for name, sub in comp.subdirs.items():
+            stack.append((os.path.join(prefix, name), sub))
+    return sorted(x for x in diffs if x not in IGNORE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4,
+                        help='Processes used by the parallel run.')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    original = os.path.join(tmpdir, 'original')
+    serial = os.path.join(tmpdir, 'serial')
+    parallel = os.path.join(tmpdir, 'parallel')
+    copy_folders(original)
+    try:
+        run_cleanup(1)
+        copy_folders(serial)
+        restore_folders(original)
+        run_cleanup(args.processes)
+        copy_folders(parallel)
+    finally:
+        restore_folders(original)
+
+    diffs = differences(serial, parallel)
+    for path in diffs[:20]:
+        print('Differs: ' + path)
+    print('Files differing between serial and parallel cleanup: {}'.format(
+        len(diffs)))
+    shutil.rmtree(tmpdir)
+    sys.exit(1 if diffs else 0)
+
+
+if __name__ == '__main__':
+    main()
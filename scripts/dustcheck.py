@@ -0,0 +1,76 @@
+"""Check the E(B-V) of `SFDMap` against values returned by IRSA.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.dustcheck [FIXTURE] [--tolerance T]
+
+FIXTURE (by default, `irsa-ebv.json` next to this script) lists
+`[name, ra, dec, ebv, ebverr]` for a set of positions, where `ebv` and
+`ebverr` are the 'ext SandF mean' and 'ext SandF std' IRSA returned. The
+bundled fixture takes them from the extinction cache of objects named
+after their coordinates, spread over both Galactic hemispheres. Each
+position is looked up in the local maps, and a mean differing from IRSA's
+by more than T times the IRSA value, or 0.002 mag if larger, is reported.
+Exits with status 1 if any does, or if the maps are missing.
+
+Cleanup only uses the local maps when `SupernovaCatalog.LOCAL_DUST` or the
+`ASTROCATS_LOCAL_DUST` environment variable is set.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from ..supernovacatalog import SupernovaCatalog
+from ..utils import SFDMap
+
+FLOOR = 0.002
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('fixture', nargs='?', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'irsa-ebv.json'),
+        help='JSON list of [name, ra, dec, ebv, ebverr] from IRSA.')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='Largest relative difference of the means.')
+    args = parser.parse_args()
+
+    path = os.path.join(SupernovaCatalog.PATHS.PATH_BASE, 'input', 'sfd')
+    dust_map = SFDMap(path)
+    if not dust_map.available():
+        print('SFD maps not found in ' + path)
+        sys.exit(1)
+    with open(args.fixture, 'r') as f:
+        fixture = json.load(f)
+
+    start = time.time()
+    results = dust_map.query([x[1] for x in fixture], [x[2] for x in fixture])
+    elapsed = time.time() - start
+
+    differ = 0
+    diffs = []
+    for (name, ra, dec, ebv, ebverr), result in zip(fixture, results):
+        if result is None:
+            differ += 1
+            print('Not found: {} ({} {})'.format(name, ra, dec))
+            continue
+        diff = result[0] - ebv
+        diffs.append(abs(diff))
+        if abs(diff) > max(FLOOR, args.tolerance * ebv):
+            differ += 1
+            print('Differs: {} ({} {}): {:.4f} +- {:.4f}, IRSA {:.4f} +- '
+                  '{:.4f}'.format(name, ra, dec, result[0], result[1], ebv,
+                                  ebverr))
+
+    print('Positions: {}, looked up in {:.3f} s'.format(len(fixture), elapsed))
+    if diffs:
+        print('Largest difference from IRSA: {:.4f} mag, mean {:.4f} '
+              'mag'.format(max(diffs), sum(diffs) / len(diffs)))
+    print('Positions differing from IRSA: {}'.format(differ))
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == '__main__':
+    main()
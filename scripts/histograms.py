@@ -9,6 +9,7 @@ from bokeh.plotting import Figure, reset_output
 from bokeh.resources import CDN
 
 from astrocats.catalog.utils import is_number, tq
+from astrocats.supernovae.utils import invert_synonyms
 
 outdir = "astrocats/supernovae/output/"
 
@@ -18,7 +19,8 @@ with open(outdir + 'catalog.min.json', 'r') as f:
     filetext = f.read()
     meta = json.loads(filetext, object_pairs_hook=OrderedDict)
 with open('astrocats/supernovae/input/type-synonyms.json', 'r') as f:
-    typereps = json.loads(f.read(), object_pairs_hook=OrderedDict)
+    typereps = invert_synonyms(
+        json.loads(f.read(), object_pairs_hook=OrderedDict))
 with open('astrocats/supernovae/input/non-sne-types.json', 'r') as f:
     nonsnetypes = json.loads(f.read(), object_pairs_hook=OrderedDict)
     nonsnetypes = [x.upper() for x in nonsnetypes]
@@ -29,10 +31,7 @@ for event in meta:
     if 'claimedtype' in event and event['claimedtype']:
         for ct in event['claimedtype']:
             ctv = ct['value'].strip('?* ')
-            for rep in typereps:
-                if ctv in typereps[rep]:
-                    ctv = rep
-                    break
+            ctv = typereps.get(ctv, ctv)
             if not ctv:
                 continue
             if (ctv not in sntypes and ctv.upper() not in nonsnetypes and
@@ -0,0 +1,122 @@
+"""Report the import time the catalog adds to CLI startup.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.importtime [--budget 0.25] [--tasks]
+
+The startup modules are imported with `python -X importtime` in a fresh
+interpreter after the astrocats framework, so only the time this catalog
+adds is counted. Exits with status 1 if that exceeds the budget, if
+startup imports a module that should only be loaded once a task runs, or
+if no import times are reported, as on Python versions before 3.7, which
+do not support `-X importtime`.
+`--tasks` also reports the time to import each active task module.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import OrderedDict
+
+PACKAGE = __package__.rsplit('.', 1)[0]
+FRAMEWORK = ['astrocats.catalog.catalog', 'astrocats.catalog.argshandler']
+STARTUP = [PACKAGE + '.main', PACKAGE + '.supernovacatalog']
+# Dependencies that task modules and helpers import at call time.
+DEFERRED = ['astropy.coordinates', 'astropy.cosmology', 'astroquery', 'bs4',
+            'dropbox', 'html5lib', 'sncosmo']
+MARKER = '--- importtime marker ---'
+LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def import_times(before, modules):
+    """Return `(self, cumulative, depth, name)` in microseconds for each module
+    loaded by importing `modules` after `before`.
+    """
+    code = '\n'.join(['import ' + x for x in before] + [
+        'import sys', 'sys.stderr.write(' + repr(MARKER + '\n') + ')'
+    ] + ['import ' + x for x in modules])
+    with open(os.devnull, 'w') as devnull:
+        proc = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=devnull, stderr=subprocess.PIPE, universal_newlines=True)
+        stderr = proc.communicate()[1]
+    if proc.returncode:
+        raise ImportError(stderr.strip().splitlines()[-1])
+    times = []
+    for line in stderr.split(MARKER, 1)[-1].splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            times.append((int(match.group(1)), int(match.group(2)),
+                          len(match.group(3)) // 2, match.group(4)))
+    return times
+
+
+def total(times):
+    """Return the total time in seconds of the top-level imports."""
+    return sum(x[1] for x in times if x[2] == 0) / 1.0e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=0.25,
+                        help='Maximum startup import time in seconds.')
+    parser.add_argument('--top', type=int, default=15,
+                        help='Number of slowest modules to list.')
+    parser.add_argument('--tasks', action='store_true',
+                        help='Also time the import of every active task.')
+    args = parser.parse_args()
+
+    if sys.version_info < (3, 7):
+        print('Import times need Python 3.7 or later (`-X importtime`).')
+        sys.exit(1)
+
+    times = import_times(FRAMEWORK, STARTUP)
+    if not times:
+        print('No import times were reported.')
+        sys.exit(1)
+    startup = total(times)
+    print('Slowest modules imported at startup (ms, self / cumulative):')
+    for self_us, cum_us, depth, name in sorted(
+            times, key=lambda x: -x[0])[:args.top]:
+        print('{:10.1f} {:10.1f}  {}'.format(self_us / 1.0e3, cum_us / 1.0e3,
+                                              name))
+    print('Startup import time: {:.3f} s (budget {:.3f} s)'.format(
+        startup, args.budget))
+
+    failed = startup > args.budget
+    eager = sorted(set(x[3] for x in times
+                       if any(x[3] == y or x[3].startswith(y + '.')
+                              for y in DEFERRED)))
+    if eager:
+        print('Imported at startup but should be deferred: ' +
+              ', '.join(eager))
+        failed = True
+
+    if args.tasks:
+        path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            'input', 'tasks.json')
+        with open(path, 'r') as f:
+            tasks = json.load(f, object_pairs_hook=OrderedDict)
+        modules = OrderedDict()
+        for task in tasks.values():
+            if task.get('active', True):
+                modules['astrocats.' + task['module']] = None
+        print('Task module import time (s, after startup):')
+        for module in modules:
+            try:
+                mtimes = import_times(FRAMEWORK + STARTUP, [module])
+            except ImportError as err:
+                mtime = 'failed (' + str(err) + ')'
+            else:
+                mtime = ('{:.3f}'.format(total(mtimes)) if mtimes else
+                         'failed (no import times reported)')
+            print('{:>10}  {}'.format(mtime, module))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""Check the `replace_better` merge of quantities against its former rules.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.mergerules [PATH ...] [--random N]
+        [--length L]
+
+The values of every `replace_better` quantity of each entry in the JSON
+files under each PATH (by default, the catalog's output and boneyard
+repositories) are added again one by one, merged by
+`Supernova._replace_better` and by the rules `Supernova.add_quantity`
+applied before comparison records were cached. `--random` also merges N
+random sequences of up to L values (12 by default). Sequences on which the
+former rules raised, for kinds missing from the key's `kind_preference`,
+are not compared. Exits with status 1 if any merge differs.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+from astrocats.catalog.key import KEY_TYPES, Key
+from astrocats.catalog.quantity import QUANTITY
+from astrocats.catalog.utils import get_sig_digits, listify
+
+from ..supernova import SUPERNOVA, Supernova
+from ..supernovacatalog import SupernovaCatalog
+from .nameclean import default_paths
+
+DATE_KEYS = [SUPERNOVA.DISCOVER_DATE, SUPERNOVA.MAX_DATE]
+
+
+def replace_better_keys():
+    """Return the keys merged by `replace_better`."""
+    return [x for x in SUPERNOVA.vals() if isinstance(x, Key) and
+            x.replace_better and (x in DATE_KEYS or x.type in [
+                KEY_TYPES.NUMERIC, KEY_TYPES.STRING])]
+
+
+def merge_former(quantity, kept, added):
+    """Merge `added` into `kept` by the former rules, returning the kept
+    quantities and whether `added` is worse than all of them.
+    """
+    newquantities = []
+    isworse = True
+    pref = quantity.kind_preference
+
+    def ranked(item):
+        return len(pref) > 0 and not set(
+            listify(item.get(QUANTITY.KIND, []))).isdisjoint(pref)
+
+    def rank(item):
+        return min([pref.index(x) for x in listify(item[QUANTITY.KIND])])
+
+    if quantity in DATE_KEYS:
+        for ct in kept:
+            if (len(ct[QUANTITY.VALUE].split('/')) <
+                    len(added[QUANTITY.VALUE].split('/'))):
+                isworse = False
+                continue
+            newquantities.append(ct)
+    elif quantity.type == KEY_TYPES.NUMERIC:
+        newsig = get_sig_digits(added[QUANTITY.VALUE])
+        for ct in kept:
+            addct = False
+            checke = False
+            if ranked(ct) and ranked(added):
+                aqi = rank(added)
+                qqi = rank(ct)
+                if aqi > qqi:
+                    addct = True
+                if aqi == qqi:
+                    checke = True
+                if aqi <= qqi:
+                    isworse = False
+            else:
+                checke = True
+            if checke and QUANTITY.E_VALUE in ct:
+                if QUANTITY.E_VALUE in added:
+                    if (float(added[QUANTITY.E_VALUE]) >=
+                            float(ct[QUANTITY.E_VALUE])):
+                        addct = True
+                    if (float(added[QUANTITY.E_VALUE]) <=
+                            float(ct[QUANTITY.E_VALUE])):
+                        isworse = False
+            elif checke and QUANTITY.E_VALUE in added:
+                isworse = False
+            else:
+                oldsig = get_sig_digits(ct[QUANTITY.VALUE])
+                if oldsig >= newsig:
+                    addct = True
+                if newsig >= oldsig:
+                    isworse = False
+            if addct:
+                newquantities.append(ct)
+    else:
+        for ct in kept:
+            addct = False
+            if ranked(ct) and ranked(added):
+                aqi = rank(added)
+                qqi = rank(ct)
+                if aqi >= qqi:
+                    addct = True
+                if aqi <= qqi:
+                    isworse = False
+            else:
+                addct = True
+                isworse = False
+            if addct:
+                newquantities.append(ct)
+    return newquantities, isworse
+
+
+def replay(merge, quantity, values):
+    """Add `values` one by one as `Supernova.add_quantity` does, merging
+    with `merge`, and return the list kept at each step, or None if a merge
+    raised `ValueError`.
+    """
+    kept = []
+    steps = []
+    for value in values:
+        if kept:
+            try:
+                newquantities, isworse = merge(quantity, kept, value)
+            except ValueError:
+                return None
+            if not isworse:
+                newquantities.append(value)
+            if newquantities:
+                kept = newquantities
+        else:
+            kept = [value]
+        steps.append(list(kept))
+    return steps
+
+
+def corpus(paths, keys):
+    """Return `(key, values)` for each `replace_better` quantity of each
+    entry in the JSON files under `paths`.
+    """
+    sequences = []
+    for path in paths:
+        for fname in sorted(glob.glob(os.path.join(path, '*.json'))):
+            with open(fname, 'r') as f:
+                data = json.load(f)
+            for entry in data.values():
+                for key in keys:
+                    if len(entry.get(key, [])) > 1:
+                        sequences.append((key, entry[key]))
+    return sequences
+
+
+def random_values(key, rng, length=12):
+    """Return a random sequence of up to `length` values of `key`."""
+    values = []
+    kinds = list(key.kind_preference) + ['other']
+    for ii in range(rng.randint(2, length)):
+        if key in DATE_KEYS:
+            value = {QUANTITY.VALUE: '/'.join(
+                ['2016', '03', '14'][:rng.randint(1, 3)])}
+        else:
+            value = {QUANTITY.VALUE: rng.choice(
+                ['0.1', '0.12', '0.123', '1', 'Ia', 'II'])}
+            if rng.random() < 0.5:
+                value[QUANTITY.E_VALUE] = rng.choice(['0.01', '0.02', '0.1'])
+        if kinds and rng.random() < 0.7:
+            value[QUANTITY.KIND] = rng.sample(kinds, rng.randint(
+                1, min(2, len(kinds))))
+            if len(value[QUANTITY.KIND]) == 1:
+                value[QUANTITY.KIND] = value[QUANTITY.KIND][0]
+        values.append(value)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', default=None,
+                        help='Directories of entry JSON files.')
+    parser.add_argument('--random', type=int, default=0,
+                        help='Number of random sequences to merge as well.')
+    parser.add_argument('--length', type=int, default=12,
+                        help='Largest number of values in a random sequence.')
+    args = parser.parse_args()
+
+    keys = replace_better_keys()
+    sequences = corpus(args.paths or default_paths(), keys)
+    rng = random.Random(0)
+    for ii in range(args.random):
+        key = rng.choice(keys)
+        sequences.append((key, random_values(key, rng, args.length)))
+
+    catalog = SupernovaCatalog(
+        argparse.Namespace(base_path='', private=True, travis=False,
+                           update=False), logging.getLogger(__name__))
+    entry = Supernova(catalog, 'SN2000A')
+    merges = (('cached', entry._replace_better), ('former', merge_former))
+    results = {}
+    for name, merge in merges:
+        results[name] = [replay(merge, key, values)
+                         for key, values in sequences]
+
+    # Both are timed on the sequences both merge, as the former rules stop
+    # early on the others, taking the best of several runs of each.
+    timed = [x for x, former in zip(sequences, results['former'])
+             if former is not None]
+    timings = {}
+    for ii in range(5):
+        for name, merge in merges:
+            start = time.time()
+            for key, values in timed:
+                replay(merge, key, values)
+            timings[name] = min(timings.get(name, float('inf')),
+                                time.time() - start)
+
+    differ = 0
+    raised = 0
+    for (key, values), cached, former in zip(
+            sequences, results['cached'], results['former']):
+        # The former rules raised on kinds missing from `kind_preference`.
+        if former is None:
+            raised += 1
+        elif cached != former:
+            differ += 1
+            if differ <= 20:
+                print('Differs: {} {}'.format(key, json.dumps(values)))
+    print('Sequences merged: {} ({} not compared, the former rules '
+          'raised)'.format(len(sequences), raised))
+    print('Best of 5 runs on the {} sequences compared:'.format(len(timed)))
+    for name in ('cached', 'former'):
+        print('{:>8}: {:.3f} s'.format(name, timings[name]))
+    print('Sequences merged differently: {}'.format(differ))
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""Check `name_clean` against the function it replaced, and time it.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.nameclean [PATH ...]
+
+Every entry name and alias in the JSON files under each PATH (by default,
+the catalog's output and boneyard repositories) is cleaned by `name_clean`,
+which visits only the rules matching the first character of the name, and
+by a copy of the `name_clean` that applied every rule in turn. Exits with
+status 1 if any result differs.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from astrocats.catalog.utils import is_integer, is_number
+
+from ..utils import clean
+
+PATH_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_paths():
+    """Return the output and boneyard repositories of the catalog."""
+    with open(os.path.join(PATH_BASE, 'input', 'repos.json'), 'r') as f:
+        repos = json.load(f)
+    return [os.path.join(PATH_BASE, 'output', x)
+            for x in repos['output'] + repos['boneyard']]
+
+
+def corpus(paths):
+    """Return every entry name and alias in the JSON files under `paths`."""
+    names = OrderedDict()
+    for path in paths:
+        for fname in sorted(glob.glob(os.path.join(path, '*.json'))):
+            with open(fname, 'r') as f:
+                entries = json.load(f)
+            for name, entry in entries.items():
+                names[name] = None
+                for alias in entry.get('alias', []):
+                    names[alias['value']] = None
+    return list(names)
+
+
+def name_clean_former(name):
+    """Clean `name` as `name_clean` did before its rules were dispatched by
+    first character, kept unchanged as the reference for the check.
+    """
+    newname = name.strip(' ;,*.')
+    if newname.startswith('NAME '):
+        newname = newname.replace('NAME ', '', 1)
+    if newname.endswith(' SN'):
+        newname = newname.replace(' SN', '')
+    if newname.endswith(':SN'):
+        newname = newname.replace(':SN', '')
+    if newname.startswith('MASJ'):
+        newname = newname.replace('MASJ', 'MASTER OT J', 1)
+    if (newname.startswith('MASTER') and len(newname) > 7 and
+            is_number(newname[7])):
+        newname = newname.replace('MASTER', 'MASTER OT J', 1)
+    if (newname.startswith('MASTER OT') and len(newname) > 10 and
+            is_number(newname[10])):
+        newname = newname.replace('MASTER OT', 'MASTER OT J', 1)
+    if newname.startswith('MASTER OT J '):
+        newname = newname.replace('MASTER OT J ', 'MASTER OT J', 1)
+    if newname.startswith('OGLE '):
+        newname = newname.replace('OGLE ', 'OGLE-', 1)
+    if newname.startswith('OGLE-') and len(newname) != 16:
+        namesp = newname.split('-')
+        if (len(namesp) == 4 and len(namesp[1]) == 4 and
+                is_number(namesp[1]) and is_number(namesp[3])):
+            newname = 'OGLE-' + namesp[1] + '-SN-' + namesp[3].zfill(3)
+        elif (len(namesp) == 2 and is_number(namesp[1][:2]) and
+              not is_number(namesp[1][2:])):
+            newname = 'OGLE' + namesp[1]
+    if newname.startswith('SN SDSS'):
+        newname = newname.replace('SN SDSS ', 'SDSS', 1)
+    if newname.startswith('SDSS '):
+        newname = newname.replace('SDSS ', 'SDSS', 1)
+    if newname.startswith('SDSS'):
+        namesp = newname.split('-')
+        if (len(namesp) == 3 and is_number(namesp[0][4:]) and
+                is_number(namesp[1]) and is_number(namesp[2])):
+            newname = namesp[0] + '-' + namesp[1] + '-' + namesp[2].zfill(3)
+    if newname.startswith('SDSS-II SN'):
+        namesp = newname.split()
+        if len(namesp) == 3 and is_number(namesp[2]):
+            newname = 'SDSS-II SN ' + namesp[2].lstrip('0')
+    if newname.startswith('SN CL'):
+        newname = newname.replace('SN CL', 'CL', 1)
+    if newname.startswith('SN HiTS'):
+        newname = newname.replace('SN HiTS', 'SNHiTS', 1)
+    if newname.startswith('SNHiTS '):
+        newname = newname.replace('SNHiTS ', 'SNHiTS', 1)
+    if newname.startswith('GAIA'):
+        newname = newname.replace('GAIA', 'Gaia', 1)
+    if newname.startswith('KSN-'):
+        newname = newname.replace('KSN-', 'KSN', 1)
+    if newname.startswith('KSN'):
+        newname = 'KSN' + newname[3:].lower()
+    if newname.startswith('Gaia '):
+        newname = newname.replace('Gaia ', 'Gaia', 1)
+    if newname.startswith('Gaia'):
+        newname = 'Gaia' + newname[4:].lower()
+    if newname.startswith('GRB'):
+        newname = newname.replace('GRB', 'GRB ', 1)
+    if newname.startswith('GRB ') and is_number(newname[4:].strip()):
+        newname = 'GRB ' + newname[4:].strip() + 'A'
+    if newname.startswith('ESSENCE '):
+        newname = newname.replace('ESSENCE ', 'ESSENCE', 1)
+    if newname.startswith('LSQ '):
+        newname = newname.replace('LSQ ', 'LSQ', 1)
+    if newname.startswith('LSQ') and is_number(newname[3]):
+        newname = newname[:3] + newname[3:].lower()
+    if newname.startswith('DES') and is_number(newname[3]):
+        newname = newname[:7] + newname[7:].lower()
+    if newname.startswith('SNSDF '):
+        newname = newname.replace(' ', '')
+    if newname.startswith('SNSDF'):
+        namesp = newname.split('.')
+        if len(namesp[0]) == 9:
+            newname = namesp[0] + '-' + namesp[1].zfill(2)
+    if newname.startswith('HFF '):
+        newname = newname.replace(' ', '')
+    if newname.startswith('SN HST'):
+        newname = newname.replace('SN HST', 'HST', 1)
+    if newname.startswith('HST ') and newname[4] != 'J':
+        newname = newname.replace('HST ', 'HST J', 1)
+    if newname.startswith('SNLS') and newname[4] != '-':
+        newname = newname.replace('SNLS', 'SNLS-', 1)
+    if newname.startswith('SNLS- '):
+        newname = newname.replace('SNLS- ', 'SNLS-', 1)
+    if newname.startswith('CRTS CSS'):
+        newname = newname.replace('CRTS CSS', 'CSS', 1)
+    if newname.startswith('CRTS MLS'):
+        newname = newname.replace('CRTS MLS', 'MLS', 1)
+    if newname.startswith('CRTS SSS'):
+        newname = newname.replace('CRTS SSS', 'SSS', 1)
+    if newname.startswith(('CSS', 'MLS', 'SSS')):
+        newname = newname.replace(' ', ':').replace('J', '')
+    if newname.startswith('SN HFF'):
+        newname = newname.replace('SN HFF', 'HFF', 1)
+    if newname.startswith('SN GND'):
+        newname = newname.replace('SN GND', 'GND', 1)
+    if newname.startswith('SN SCP'):
+        newname = newname.replace('SN SCP', 'SCP', 1)
+    if newname.startswith('SN UDS'):
+        newname = newname.replace('SN UDS', 'UDS', 1)
+    if newname.startswith('SCP') and newname[3] != '-':
+        newname = newname.replace('SCP', 'SCP-', 1)
+    if newname.startswith('SCP- '):
+        newname = newname.replace('SCP- ', 'SCP-', 1)
+    if newname.startswith('SCP-') and is_integer(newname[7:]):
+        newname = 'SCP-' + newname[4:7] + str(int(newname[7:]))
+    if newname.startswith('PS 1'):
+        newname = newname.replace('PS 1', 'PS1', 1)
+    if newname.startswith('PS1 SN PS'):
+        newname = newname.replace('PS1 SN PS', 'PS', 1)
+    if newname.startswith('PS1 SN'):
+        newname = newname.replace('PS1 SN', 'PS1', 1)
+    if newname.startswith('PS1') and is_number(newname[3]):
+        newname = newname[:3] + newname[3:].lower()
+    elif newname.startswith('PS1-') and is_number(newname[4]):
+        newname = newname[:4] + newname[4:].lower()
+    if newname.startswith('PSN K'):
+        newname = newname.replace('PSN K', 'K', 1)
+    if newname.startswith('K') and is_number(newname[1:5]):
+        namesp = newname.split('-')
+        if len(namesp[0]) == 5:
+            newname = namesp[0] + '-' + namesp[1].zfill(3)
+    if newname.startswith('Psn'):
+        newname = newname.replace('Psn', 'PSN', 1)
+    if newname.startswith('PSNJ'):
+        newname = newname.replace('PSNJ', 'PSN J', 1)
+    if newname.startswith('TCPJ'):
+        newname = newname.replace('TCPJ', 'TCP J', 1)
+    if newname.startswith('SMTJ'):
+        newname = newname.replace('SMTJ', 'SMT J', 1)
+    if newname.startswith('PSN20J'):
+        newname = newname.replace('PSN20J', 'PSN J', 1)
+    if newname.startswith('SN ASASSN'):
+        newname = newname.replace('SN ASASSN', 'ASASSN', 1)
+    if newname.startswith('ASASSN-20') and is_number(newname[9]):
+        newname = newname.replace('ASASSN-20', 'ASASSN-', 1)
+    if newname.startswith('ASASSN '):
+        newname = newname.replace('ASASSN ', 'ASASSN-', 1).replace('--', '-')
+    if newname.startswith('ASASSN') and newname[6] != '-':
+        newname = newname.replace('ASASSN', 'ASASSN-', 1)
+    if newname.startswith('ASASSN-') and is_number(newname[7]):
+        newname = newname[:7] + newname[7:].lower()
+    if newname.startswith('ROTSE3J'):
+        newname = newname.replace('ROTSE3J', 'ROTSE3 J', 1)
+    if newname.startswith('MACSJ'):
+        newname = newname.replace('MACSJ', 'MACS J', 1)
+    if newname.startswith('MWSNR'):
+        newname = newname.replace('MWSNR', 'MWSNR ', 1)
+    if newname.startswith('SN HUNT'):
+        newname = newname.replace('SN HUNT', 'SNhunt', 1)
+    if newname.startswith('SN Hunt'):
+        newname = newname.replace(' ', '')
+    if newname.startswith('SNHunt'):
+        newname = newname.replace('SNHunt', 'SNhunt', 1)
+    if newname.startswith('SNhunt '):
+        newname = newname.replace('SNhunt ', 'SNhunt', 1)
+    if newname.startswith('ptf'):
+        newname = newname.replace('ptf', 'PTF', 1)
+    if newname.startswith('SN PTF'):
+        newname = newname.replace('SN PTF', 'PTF', 1)
+    if newname.startswith('PTF '):
+        newname = newname.replace('PTF ', 'PTF', 1)
+    if newname.startswith('PTF') and is_number(newname[3]):
+        newname = newname[:3] + newname[3:].lower()
+    if newname.startswith('IPTF'):
+        newname = newname.replace('IPTF', 'iPTF', 1)
+    if newname.startswith('iPTF '):
+        newname = newname.replace('iPTF ', 'iPTF', 1)
+    if newname.startswith('iPTF') and is_number(newname[4]):
+        newname = newname[:4] + newname[4:].lower()
+    if newname.startswith('PESSTOESO'):
+        newname = newname.replace('PESSTOESO', 'PESSTO ESO ', 1)
+    if newname.startswith('snf'):
+        newname = newname.replace('snf', 'SNF', 1)
+    if newname.startswith('SNF '):
+        newname = newname.replace('SNF ', 'SNF', 1)
+    if (newname.startswith('SNF') and is_number(newname[3:]) and
+            len(newname) >= 12):
+        newname = 'SNF' + newname[3:11] + '-' + newname[11:]
+    if newname.startswith(('MASTER OT J', 'ROTSE3 J')):
+        prefix = newname.split('J')[0]
+        coords = newname.split('J')[-1].strip()
+        decsign = '+' if '+' in coords else '-'
+        coordsplit = coords.replace('+', '-').split('-')
+        if ('.' not in coordsplit[0] and len(coordsplit[0]) > 6 and
+                '.' not in coordsplit[1] and len(coordsplit[1]) > 6):
+            newname = (
+                prefix + 'J' + coordsplit[0][:6] + '.' + coordsplit[0][6:] +
+                decsign + coordsplit[1][:6] + '.' + coordsplit[1][6:])
+    if (newname.startswith('Gaia ') and is_number(newname[3:4]) and
+            len(newname) > 5):
+        newname = newname.replace('Gaia ', 'Gaia', 1)
+    if (newname.startswith('AT ') and is_number(newname[3:7]) and
+            len(newname) > 7):
+        newname = newname.replace('AT ', 'AT', 1)
+    if len(newname) <= 4 and is_number(newname):
+        newname = 'SN' + newname + 'A'
+    if (len(newname) > 4 and is_number(newname[:4]) and
+            not is_number(newname[4:])):
+        newname = 'SN' + newname
+    if (newname.startswith('Sn ') and is_number(newname[3:7]) and
+            len(newname) > 7):
+        newname = newname.replace('Sn ', 'SN', 1)
+    if (newname.startswith('sn') and is_number(newname[2:6]) and
+            len(newname) > 6):
+        newname = newname.replace('sn', 'SN', 1)
+    if (newname.startswith('SN ') and is_number(newname[3:7]) and
+            len(newname) > 7):
+        newname = newname.replace('SN ', 'SN', 1)
+    if (newname.startswith('SN') and is_number(newname[2:6]) and
+            len(newname) == 7 and newname[6].islower()):
+        newname = 'SN' + newname[2:6] + newname[6].upper()
+    elif (newname.startswith('SN') and is_number(newname[2:6]) and
+          (len(newname) == 8 or len(newname) == 9) and newname[6:].isupper()):
+        newname = 'SN' + newname[2:6] + newname[6:].lower()
+    if (newname.startswith('AT') and is_number(newname[2:6]) and
+            len(newname) == 7 and newname[6].islower()):
+        newname = 'AT' + newname[2:6] + newname[6].upper()
+    elif (newname.startswith('AT') and is_number(newname[2:6]) and
+          (len(newname) == 8 or len(newname) == 9) and newname[6:].isupper()):
+        newname = 'AT' + newname[2:6] + newname[6:].lower()
+
+    newname = (' '.join(newname.split())).strip()
+    return newname
+
+
+def apply(func, names):
+    """Return the result of `func` for each name, or the error it raised."""
+    results = []
+    for name in names:
+        try:
+            results.append(func(name))
+        except Exception as err:
+            results.append(type(err).__name__)
+    return results
+
+
+def rate(func, names):
+    """Return the names cleaned per second by `func`."""
+    start = time.perf_counter()
+    apply(func, names)
+    return len(names) / max(time.perf_counter() - start, 1.0e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*',
+                        help='Directories of entry JSON files.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Passes over the corpus when timing.')
+    args = parser.parse_args()
+
+    names = corpus(args.paths or default_paths())
+    if not names:
+        print('No names found.')
+        sys.exit(1)
+    print('Names and aliases: {}'.format(len(names)))
+
+    name_clean = clean.name_clean.__wrapped__
+    expected = apply(name_clean_former, names)
+    mismatches = [
+        (name, x, y)
+        for name, x, y in zip(names, expected, apply(name_clean, names))
+        if x != y
+    ]
+    for name, x, y in mismatches[:20]:
+        print('{!r}: {!r} != {!r}'.format(name, y, x))
+    print('Mismatches: {}'.format(len(mismatches)))
+
+    repeated = names * args.repeat
+    clean.name_clean.cache_clear()
+    print('Names per second:')
+    for label, func in (('former', name_clean_former),
+                        ('dispatched', name_clean),
+                        ('memoized', clean.name_clean)):
+        print('{:>14.0f}  {}'.format(rate(func, repeated), label))
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
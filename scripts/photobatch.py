@@ -0,0 +1,143 @@
+"""Check `add_photometry_batch` against adding points one by one, and time it.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.photobatch [PATH]
+
+The CPCS alert and GAIA light curves cached under PATH (by default, the
+catalog's `sne-external` input repository) are read as the CPCS and GAIA
+tasks read them, and each is added to a fresh entry once with
+`add_photometry_batch` and once point by point with `add_photometry`.
+The catalog runs in debug mode, so the batch also checks each point it
+assembles from its columns against the `Photometry` constructor. Exits with
+status 1 if any light curve is stored differently.
+"""
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import sys
+import time
+
+from astrocats.catalog.utils import is_number, round_sig
+
+from ..supernova import Supernova
+from ..supernovacatalog import SupernovaCatalog
+from ..utils import jds_to_mjds
+from .nameclean import PATH_BASE
+
+
+def cpcs_curves(path):
+    """Return the photometry columns of each cached CPCS alert."""
+    curves = []
+    for fname in sorted(glob.glob(os.path.join(path, 'CPCS', 'alert-*.json'))):
+        with open(fname, 'r') as f:
+            try:
+                alert = json.load(f)
+            except ValueError:
+                continue
+        curves.append((os.path.basename(fname), {
+            'time': [round_sig(x, sig=9) for x in alert['mjd']],
+            'u_time': 'MJD',
+            'magnitude': [round_sig(x, sig=6) for x in alert['mag']],
+            'e_magnitude': [
+                round_sig(x, sig=6) if (is_number(x) and float(x) > 0.0)
+                else '' for x in alert['magerr']],
+            'band': alert['filter'],
+            'observatory': alert['observatory']
+        }))
+    return curves
+
+
+def gaia_curves(path):
+    """Return the photometry columns of each cached GAIA light curve."""
+    curves = []
+    for fname in sorted(glob.glob(os.path.join(path, 'GAIA', '*.csv'))):
+        if os.path.basename(fname) == 'alerts.csv':
+            continue
+        with open(fname, 'r') as f:
+            rows = [row for ri, row in enumerate(csv.reader(f))
+                    if ri > 1 and row and row[2].strip() != 'null']
+        curves.append((os.path.basename(fname), {
+            'time': jds_to_mjds([x[1].strip() for x in rows]),
+            'u_time': 'MJD',
+            'telescope': 'GAIA',
+            'band': 'G',
+            'magnitude': [x[2].strip() for x in rows],
+            'e_magnitude': 0.
+        }))
+    return curves
+
+
+def new_entry(catalog):
+    """Return an empty entry of `catalog` and the alias of its source."""
+    catalog.entries.clear()
+    entry = Supernova(catalog, 'SN2000A')
+    catalog.entries['SN2000A'] = entry
+    source = entry.add_source(name='Light curve', url='http://localhost/')
+    return entry, source
+
+
+def add_batch(catalog, columns):
+    entry, source = new_entry(catalog)
+    entry.add_photometry_batch(source=source, **columns)
+    return entry
+
+
+def add_points(catalog, columns):
+    entry, source = new_entry(catalog)
+    npoints = max([len(x) for x in columns.values()
+                   if isinstance(x, list)] or [1])
+    for ii in range(npoints):
+        photodict = {'source': source}
+        for key, values in columns.items():
+            value = values[ii] if isinstance(values, list) else values
+            if value is not None and value != '':
+                photodict[key] = value
+        entry.add_photometry(**photodict)
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', default=os.path.join(
+        PATH_BASE, 'input', 'sne-external'),
+        help='Directory holding the CPCS/ and GAIA/ caches.')
+    args = parser.parse_args()
+
+    catalog = SupernovaCatalog(
+        argparse.Namespace(base_path='', private=True, travis=False,
+                           update=False, debug=True),
+        logging.getLogger(__name__))
+    curves = cpcs_curves(args.path) + gaia_curves(args.path)
+    if not curves:
+        print('No CPCS or GAIA light curves found under ' + args.path)
+        sys.exit(1)
+
+    differ = 0
+    npoints = 0
+    timings = {add_batch: 0.0, add_points: 0.0}
+    for name, columns in curves:
+        photometry = []
+        for func in (add_batch, add_points):
+            start = time.time()
+            entry = func(catalog, columns)
+            timings[func] += time.time() - start
+            photometry.append(json.dumps(entry.get('photometry', []),
+                                         sort_keys=True))
+        npoints += len(json.loads(photometry[0]))
+        if photometry[0] != photometry[1]:
+            differ += 1
+            print('Differs: ' + name)
+
+    print('Light curves: {}, points stored: {}'.format(len(curves), npoints))
+    for func in (add_batch, add_points):
+        print('{:>12}: {:.3f} s'.format(func.__name__, timings[func]))
+    print('Light curves stored differently: {}'.format(differ))
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == '__main__':
+    main()
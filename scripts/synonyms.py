@@ -0,0 +1,72 @@
+"""Check `invert_synonyms` lookups against a linear scan, and time both.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.synonyms [--repeat N]
+
+Every value listed in the source synonym, URL redirect and type synonym
+tables of the catalog's input directory, every canonical value, and as
+many values listed in none of them, is looked up in the mapping returned
+by `invert_synonyms` and by scanning the table in order, as `Supernova`
+did before the mappings. Each lookup is repeated N times for the timing.
+Exits with status 1 if any lookup differs.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from ..utils import invert_synonyms
+from .nameclean import PATH_BASE
+
+TABLES = ['source-synonyms.json', 'url-redirects.json', 'type-synonyms.json']
+
+
+def scan(synonyms, value):
+    """Return the canonical value of `value` by scanning `synonyms`."""
+    for rep in synonyms:
+        if value in synonyms[rep]:
+            return rep
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=1000,
+                        help='Times each value is looked up for the timing.')
+    args = parser.parse_args()
+
+    differ = 0
+    for table in TABLES:
+        with open(os.path.join(PATH_BASE, 'input', table), 'r') as f:
+            synonyms = json.load(f, object_pairs_hook=OrderedDict)
+        values = [x for rep in synonyms for x in synonyms[rep]]
+        values += list(synonyms)
+        values += ['not a synonym {}'.format(x) for x in range(len(values))]
+
+        start = time.time()
+        mapping = invert_synonyms(synonyms)
+        build = time.time() - start
+        start = time.time()
+        for ii in range(args.repeat):
+            mapped = [mapping.get(x, x) for x in values]
+        lookup = time.time() - start
+        start = time.time()
+        for ii in range(args.repeat):
+            scanned = [scan(synonyms, x) for x in values]
+        linear = time.time() - start
+
+        table_differ = sum(x != y for x, y in zip(mapped, scanned))
+        differ += table_differ
+        print('{}: {} values, built in {:.4f} s'.format(
+            table, len(values), build))
+        print('{:>12}: {:.4f} s'.format('mapping', lookup))
+        print('{:>12}: {:.4f} s'.format('scan', linear))
+        print('{:>12}: {}'.format('differ', table_differ))
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""Check `TNSClient` and `TNSCache` against a mock TNS server.
+
+Run from the astrocats directory:
+
+    python -m astrocats.supernovae.scripts.tnscheck [--objects N]
+
+A local HTTP server stands in for the TNS `get/object` API. Some objects
+fail a few times before they are returned, with server errors, malformed
+JSON or empty replies, and some always fail. The script checks that:
+
+* objects are yielded in the order asked for, each with its own reply;
+* requests are spaced by the client's rate limit across all its threads;
+* failed requests are retried, and objects failing every attempt give None;
+* the photometry and spectra options reach the server;
+* closing `get_objects` early leaves the remaining requests unmade;
+* a `TNSCache` writes the objects it receives, and reads final objects
+  back from disk without requests.
+
+Exits with status 1 if any check fails.
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from ..utils import TNSCache, TNSClient
+
+API_KEY = 'mock-key'
+RATE = 40.0
+RETRIES = 3
+WINDOW = 10
+
+
+class MockTNS(object):
+    """The replies, failures and request log of the mock server."""
+
+    FAILURES = ['status', 'json', 'empty']
+
+    def __init__(self, objnames):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.fails = {}
+        for ii, objname in enumerate(objnames):
+            if ii % 7 == 3:
+                # Fails on every attempt.
+                self.fails[objname] = RETRIES
+            elif ii % 3 == 1:
+                self.fails[objname] = 1 + ii % (RETRIES - 1)
+
+    def attempts(self):
+        return Counter(x[1] for x in self.requests)
+
+    def reply(self, objname, options):
+        """Return the status and body of a request for `objname`."""
+        with self.lock:
+            attempt = sum(1 for x in self.requests if x[1] == objname)
+            self.requests.append((time.monotonic(), objname, options))
+        if attempt < self.fails.get(objname, 0):
+            failure = self.FAILURES[(attempt + len(objname)) % 3]
+            if failure == 'status':
+                return 500, b'{}'
+            if failure == 'json':
+                return 200, b'{"data": {"reply": '
+            return 200, json.dumps({'data': {'reply': {}}}).encode()
+        reply = {
+            'objname': objname,
+            'discoverydate': '2000-01-01 00:00:00',
+            'photometry': ([{'jd': 2451544.5, 'flux': objname}]
+                           if options.get('photometry') == '1' else []),
+            'spectra': ([{'jd': 2451545.5}]
+                        if options.get('spectra') == '1' else [])
+        }
+        return 200, json.dumps({'data': {'reply': reply}}).encode()
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep connections open and unbuffered, so that requests reach the
+        # server when the client sends them.
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            form = parse_qs(self.rfile.read(
+                int(self.headers['Content-Length'])).decode())
+            if (self.path != '/api/get/object' or
+                    form.get('api_key') != [API_KEY]):
+                status, body = 404, b'{}'
+            else:
+                options = json.loads(form['data'][0])
+                status, body = mock.reply(options.pop('objname'), options)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(mock):
+    """Start a mock server for `mock`, returning it and its API URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(mock))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:{}/api/'.format(server.server_port)
+
+
+def check_client(objnames, threads):
+    """Return the failed checks of `TNSClient.get_objects`."""
+    failed = []
+    mock = MockTNS(objnames)
+    server, url = serve(mock)
+    client = TNSClient(url, API_KEY, threads=threads, rate=RATE,
+                       retries=RETRIES, backoff=0.01, timeout=5)
+    try:
+        start = time.time()
+        results = list(client.get_objects(objnames, photometry='1'))
+        print('{} objects, {} requests: {:.3f} s'.format(
+            len(objnames), len(mock.requests), time.time() - start))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if [x[0] for x in results] != objnames:
+        failed.append('order')
+    for objname, reply in results:
+        if mock.fails.get(objname, 0) >= RETRIES:
+            if reply is not None:
+                failed.append('reply of failing ' + objname)
+        elif (reply is None or reply['objname'] != objname or
+              reply['photometry'][0]['flux'] != objname):
+            failed.append('reply of ' + objname)
+    attempts = mock.attempts()
+    for objname in objnames:
+        expected = min(mock.fails.get(objname, 0) + 1, RETRIES)
+        if attempts[objname] != expected:
+            failed.append('{} attempts for {}, expected {}'.format(
+                attempts[objname], objname, expected))
+    if any(x[2] != {'photometry': '1'} for x in mock.requests):
+        failed.append('options')
+    # Requests reach the server with some jitter, so they are counted over
+    # windows of `WINDOW` intervals, allowing two more than the limit.
+    times = sorted(x[0] for x in mock.requests)
+    busiest = max([bisect_left(times, x + WINDOW / RATE) - ii
+                   for ii, x in enumerate(times)] or [0])
+    if busiest > WINDOW + 2:
+        failed.append('rate limit, {} requests within {:.3f} s'.format(
+            busiest, WINDOW / RATE))
+    return failed
+
+
+def check_close(objnames, threads):
+    """Return the failed checks of closing `TNSClient.get_objects` early."""
+    mock = MockTNS([])
+    server, url = serve(mock)
+    client = TNSClient(url, API_KEY, threads=threads, rate=RATE,
+                       retries=RETRIES, backoff=0.01, timeout=5)
+    try:
+        replies = client.get_objects(objnames)
+        for ii in range(2):
+            next(replies)
+        replies.close()
+        made = len(mock.requests)
+        time.sleep(5.0 / RATE)
+    finally:
+        server.shutdown()
+        server.server_close()
+    # At most the window of outstanding requests runs ahead.
+    if made > 2 + 2 * threads + threads or len(mock.requests) != made:
+        return ['close, {} of {} requests made'.format(
+            len(mock.requests), len(objnames))]
+    return []
+
+
+def check_cache(objnames, threads):
+    """Return the failed checks of `TNSCache.get_objects`."""
+    failed = []
+    mock = MockTNS([])
+    server, url = serve(mock)
+    path = tempfile.mkdtemp()
+    try:
+        cache = TNSCache(path, url, API_KEY, threads=threads, rate=RATE)
+        first = list(cache.get_objects(objnames))
+        made = len(mock.requests)
+        # The mock discovery dates make every object final.
+        cache = TNSCache(path, url, API_KEY, threads=threads, rate=RATE)
+        second = list(cache.get_objects(objnames))
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(path)
+    if made != len(objnames) or len(mock.requests) != made:
+        failed.append('cache, {} requests for {} objects'.format(
+            len(mock.requests), len(objnames)))
+    if first != second or [x[0] for x in first] != objnames:
+        failed.append('cache, objects read back differently')
+    if any(x[2] != {'photometry': '1', 'spectra': '1'}
+           for x in mock.requests):
+        failed.append('cache options')
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=60,
+                        help='Number of objects requested.')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='Threads used by the client.')
+    args = parser.parse_args()
+
+    objnames = ['2000{:03d}'.format(x) for x in range(args.objects)]
+    failed = (check_client(objnames, args.threads) +
+              check_close(objnames, args.threads) +
+              check_cache(objnames[:10], args.threads))
+    for check in failed:
+        print('Failed: ' + check)
+    print('Checks failed: {}'.format(len(failed)))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
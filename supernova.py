@@ -1,13 +1,17 @@
 """
 """
-import warnings
+import re
 from collections import OrderedDict
+from datetime import date as calendar_date
 from decimal import Decimal
+from functools import lru_cache
 
 import numpy as np
+from astrocats.catalog.catdict import CatDictError
 from astrocats.catalog.entry import ENTRY, Entry
 from astrocats.catalog.key import KEY_TYPES, Key
-from astrocats.catalog.photometry import PHOTOMETRY
+from astrocats.catalog.photometry import (PHOTOMETRY, Photometry, bandmetaf,
+                                          bandrepf, instrumentrepf)
 from astrocats.catalog.quantity import QUANTITY
 from astrocats.catalog.source import SOURCE
 from astrocats.catalog.utils import (bib_priority, get_sig_digits,
@@ -18,7 +22,62 @@ from astropy.time import Time as astrotime
 from six import string_types
 
 from .constants import MAX_VISUAL_BANDS
-from .utils import frame_priority, host_clean, radec_clean
+from .utils import (clean_bibcode, dates_to_mjds, dupe_fingerprint,
+                    fingerprint_value, frame_priority, host_clean,
+                    jds_to_mjds, radec_clean)
+
+# `Photometry` checks these keys against each other rather than one at a
+# time, so batches holding them are built point by point.
+_CROSS_CHECKED_KEYS = [PHOTOMETRY.FLUX, PHOTOMETRY.FLUX_DENSITY]
+_BAND_META_KEYS = [PHOTOMETRY.INSTRUMENT, PHOTOMETRY.TELESCOPE,
+                   PHOTOMETRY.SYSTEM]
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+# Marks cells, such as lists, that only `Photometry` itself can clean.
+_PER_POINT = object()
+
+
+def _alias_key(alias):
+    """Return a source alias as an integer, or as is if it is not one."""
+    return int(alias) if alias.isdigit() else alias
+
+
+@lru_cache(maxsize=65536)
+def _source_aliases(sources):
+    """Return the aliases in a comma-delimited `sources` string as a
+    frozenset of integers.
+
+    Items share a handful of distinct source strings, so each is parsed once.
+    """
+    return frozenset(_alias_key(x) for x in sources.split(','))
+
+
+def _photometry_date_mjds(dates):
+    """Return a dict of the MJD string `Photometry` stores for each of
+    `dates`, or a `CatDictError` for dates it cannot convert.
+
+    Plain calendar dates are converted together by `dates_to_mjds`, the
+    others one at a time by astropy, as `Photometry` converts them.
+    """
+    mjds = {}
+    plain = []
+    for date in dates:
+        isot = date.replace('/', '-')
+        match = _DATE_RE.match(isot)
+        if match:
+            try:
+                calendar_date(*[int(x) for x in match.groups()])
+            except ValueError:
+                match = None
+        if match:
+            plain.append(date)
+            continue
+        try:
+            mjds[date] = str(astrotime(isot, format='isot').mjd)
+        except Exception:
+            mjds[date] = CatDictError('Unable to convert date to MJD.')
+    for date, mjd in zip(plain, dates_to_mjds(plain)):
+        mjds[date] = str(float(mjd))
+    return mjds
 
 
 class SUPERNOVA(ENTRY):
@@ -51,9 +110,56 @@ class Supernova(Entry):
     _KEYS = SUPERNOVA
 
     def __init__(self, catalog, name, stub=False):
+        self._merge_index = {}
+        self._source_index = {}
+        self._source_index_of = None
+        self._source_index_len = 0
+        self._photometry_columns = None
+        self._photometry_columns_of = None
+        self._photometry_index = {}
+        self._photometry_index_of = None
+        self._photometry_index_len = 0
         super(Supernova, self).__init__(catalog, name, stub=stub)
         return
 
+    def _get_source_index(self, rebuild=False):
+        """Return a dictionary mapping source aliases to the position of
+        their source in the entry's source list.
+
+        The index is rebuilt whenever the entry's source list is replaced or
+        changes length, and is reset by `add_source` and `sanitize`.
+        """
+        sources = self.get(self._KEYS.SOURCES, [])
+        if (rebuild or self._source_index_of is not sources or
+                self._source_index_len != len(sources)):
+            self._source_index = {}
+            for ii, source in enumerate(sources):
+                self._source_index.setdefault(source.get(SOURCE.ALIAS), ii)
+            self._source_index_of = sources
+            self._source_index_len = len(sources)
+        return self._source_index
+
+    def _indexed_source(self, alias, rebuild=False):
+        """Return the indexed source of `alias` if it still has that alias,
+        or None.
+        """
+        ii = self._get_source_index(rebuild=rebuild).get(alias)
+        if ii is None:
+            return None
+        source = self[self._KEYS.SOURCES][ii]
+        return source if source.get(SOURCE.ALIAS) == alias else None
+
+    def get_source_by_alias(self, alias):
+        """Given an alias, find the corresponding source in this entry."""
+        # Sources replaced or edited in place are not seen by the index, so
+        # it is rebuilt when its source no longer has the alias asked for.
+        source = (self._indexed_source(alias) or
+                  self._indexed_source(alias, rebuild=True))
+        if source is None:
+            raise ValueError("Source '{}': alias '{}' not found!".format(
+                self[self._KEYS.NAME], alias))
+        return source
+
     def _append_additional_tags(self, name, sources, quantity):
         """Append additional bits of data to an existing quantity when a newly
         added quantity is found to be a duplicate
@@ -67,9 +173,11 @@ class Supernova(Entry):
             if ct[QUANTITY.VALUE] == svalue and sources:
                 if ct.get(QUANTITY.KIND, '') != skind:
                     return
+                known = set(_source_aliases(self[name][ii][QUANTITY.SOURCE]))
                 for source in sources.split(','):
-                    if (source not in
-                            self[name][ii][QUANTITY.SOURCE].split(',')):
+                    key = _alias_key(source)
+                    if key not in known:
+                        known.add(key)
                         self[name][ii][QUANTITY.SOURCE] += ',' + source
                         if serror and QUANTITY.E_VALUE not in self[name][ii]:
                             self[name][ii][QUANTITY.E_VALUE] = serror
@@ -131,10 +239,7 @@ class Supernova(Entry):
             if '?' in value:
                 isq = True
                 value = value.strip(' ?')
-            for rep in self.catalog.type_syns:
-                if value in self.catalog.type_syns[rep]:
-                    value = rep
-                    break
+            value = self.catalog.type_syn_map.get(value, value)
             if isq:
                 value = value + '?'
             if not value:
@@ -179,6 +284,125 @@ class Supernova(Entry):
 
         return True
 
+    def _merge_record(self, records, quantity, item):
+        """Return the `replace_better` comparison record of `item`.
+
+        Records are kept in `records` on the item's value, error and kind,
+        so each stored quantity only has its kind rank, significant digits
+        and numeric error derived once no matter how many later additions
+        it is compared against.
+        """
+        kind = item.get(QUANTITY.KIND)
+        fields = (item[QUANTITY.VALUE], item.get(QUANTITY.E_VALUE),
+                  tuple(kind) if isinstance(kind, list) else kind)
+        record = records.get(fields)
+        if record is not None:
+            return fields, record
+        rank = None
+        pref = quantity.kind_preference
+        if pref and kind is not None:
+            ranks = [pref.index(x) for x in listify(kind) if x in pref]
+            if ranks:
+                rank = min(ranks)
+        sig = None
+        error = None
+        if quantity.type == KEY_TYPES.NUMERIC:
+            sig = get_sig_digits(item[QUANTITY.VALUE])
+            if QUANTITY.E_VALUE in item:
+                error = float(item[QUANTITY.E_VALUE])
+        record = (rank, sig, error)
+
+        records[fields] = record
+        return fields, record
+
+    def _merge_compare(self, quantity, new, old):
+        """Compare two `replace_better` records of the same key.
+
+        Returns a tuple of booleans: whether the `old` quantity should be kept
+        alongside `new`, and whether `new` is at least as good as `old`.
+        """
+        nrank, nsig, nerror = new
+        orank, osig, oerror = old
+        if quantity.type == KEY_TYPES.STRING:
+            if nrank is None or orank is None:
+                return True, True
+            return nrank >= orank, nrank <= orank
+
+        keep = False
+        notworse = False
+        checke = False
+        if nrank is not None and orank is not None:
+            if nrank > orank:
+                keep = True
+            if nrank == orank:
+                checke = True
+            if nrank <= orank:
+                notworse = True
+        else:
+            checke = True
+        if checke and oerror is not None:
+            if nerror is not None:
+                if nerror >= oerror:
+                    keep = True
+                if nerror <= oerror:
+                    notworse = True
+        elif checke and nerror is not None:
+            notworse = True
+        else:
+            if osig >= nsig:
+                keep = True
+            if nsig >= osig:
+                notworse = True
+        return keep, notworse
+
+    def _replace_better(self, quantity, kept, added):
+        """Merge the quantity `added` into the list `kept` of its key.
+
+        Returns the quantities of `kept` to keep, and whether `added` is
+        worse than every one of them. Quantities of `kept` with the same
+        fields are compared with `added` once. The records held for
+        the key are dropped once they outnumber twice the quantities kept
+        by more than 64, so they never outgrow the list by much.
+        """
+        if quantity in [self._KEYS.DISCOVER_DATE, self._KEYS.MAX_DATE]:
+            # Dates are only ranked by their number of parts, which is
+            # cheaper to count than to look up.
+            parts = added[QUANTITY.VALUE].count('/')
+            newquantities = [
+                x for x in kept if x[QUANTITY.VALUE].count('/') >= parts]
+            return newquantities, len(newquantities) == len(kept)
+        if (quantity.type == KEY_TYPES.STRING and
+                set(listify(added.get(QUANTITY.KIND, []))).isdisjoint(
+                    quantity.kind_preference)):
+            # Without a preferred kind to rank `added` by, every quantity is
+            # kept and `added` is not worse than any.
+            return list(kept), False
+        records = self._merge_index.get(quantity)
+        if records is None or len(records) > 2 * len(kept) + 64:
+            records = self._merge_index[quantity] = {}
+        new = self._merge_record(records, quantity, added)[1]
+        compared = {}
+        newquantities = []
+        isworse = True
+        for ct in kept:
+            # The fields `_merge_record` keys records on, inlined as this
+            # runs for every quantity kept.
+            kind = ct.get(QUANTITY.KIND)
+            fields = (ct[QUANTITY.VALUE], ct.get(QUANTITY.E_VALUE),
+                      tuple(kind) if isinstance(kind, list) else kind)
+            result = compared.get(fields)
+            if result is None:
+                old = records.get(fields)
+                if old is None:
+                    old = self._merge_record(records, quantity, ct)[1]
+                result = compared[fields] = self._merge_compare(
+                    quantity, new, old)
+            if result[1]:
+                isworse = False
+            if result[0]:
+                newquantities.append(ct)
+        return newquantities, isworse
+
     def add_quantity(self,
                      quantities,
                      value,
@@ -202,104 +426,14 @@ class Supernova(Entry):
 
                 newquantities = []
                 isworse = True
-                if quantity in [self._KEYS.DISCOVER_DATE, self._KEYS.MAX_DATE]:
-                    for ct in my_quantity_list:
-                        ctsplit = ct[QUANTITY.VALUE].split('/')
-                        svsplit = added_quantity[QUANTITY.VALUE].split('/')
-                        if len(ctsplit) < len(svsplit):
-                            isworse = False
-                            continue
-                        elif len(ctsplit) < len(svsplit) and len(svsplit) == 3:
-                            val_one = max(
-                                2, get_sig_digits(ctsplit[-1].lstrip('0')))
-                            val_two = max(
-                                2, get_sig_digits(svsplit[-1].lstrip('0')))
-                            if val_one < val_two:
-                                isworse = False
-                                continue
-                        newquantities.append(ct)
-                else:
-                    if type(quantity) != Key:
-                        isworse = False
-                    elif quantity.type == KEY_TYPES.NUMERIC:
-                        newsig = get_sig_digits(added_quantity[QUANTITY.VALUE])
-                        for ct in my_quantity_list:
-                            addct = False
-                            checke = False
-                            if (len(quantity.kind_preference) > 0 and not set(
-                                    listify(ct.get(QUANTITY.KIND, [])))
-                                    .isdisjoint(quantity.kind_preference) and
-                                    not set(
-                                        listify(
-                                            added_quantity.get(QUANTITY.KIND,
-                                                               [])))
-                                    .isdisjoint(quantity.kind_preference)):
-                                aqi = min([
-                                    quantity.kind_preference.index(x)
-                                    for x in listify(added_quantity[
-                                        QUANTITY.KIND])
-                                ])
-                                qqi = min([
-                                    quantity.kind_preference.index(x)
-                                    for x in listify(ct[QUANTITY.KIND])
-                                ])
-                                if aqi > qqi:
-                                    addct = True
-                                if aqi == qqi:
-                                    checke = True
-                                if aqi <= qqi:
-                                    isworse = False
-                            else:
-                                checke = True
-                            if checke and QUANTITY.E_VALUE in ct:
-                                if QUANTITY.E_VALUE in added_quantity:
-                                    if (float(added_quantity[QUANTITY.E_VALUE])
-                                            >= float(ct[QUANTITY.E_VALUE])):
-                                        addct = True
-                                    if (float(added_quantity[QUANTITY.E_VALUE])
-                                            <= float(ct[QUANTITY.E_VALUE])):
-                                        isworse = False
-                            else:
-                                if (checke and
-                                        QUANTITY.E_VALUE in added_quantity):
-                                    isworse = False
-                                else:
-                                    oldsig = get_sig_digits(ct[QUANTITY.VALUE])
-                                    if oldsig >= newsig:
-                                        addct = True
-                                    if newsig >= oldsig:
-                                        isworse = False
-                            if addct:
-                                newquantities.append(ct)
-                    elif quantity.type == KEY_TYPES.STRING:
-                        for ct in my_quantity_list:
-                            addct = False
-                            if (len(quantity.kind_preference) > 0 and not set(
-                                    listify(ct.get(QUANTITY.KIND, [])))
-                                    .isdisjoint(quantity.kind_preference) and
-                                    not set(
-                                        listify(
-                                            added_quantity.get(QUANTITY.KIND,
-                                                               [])))
-                                    .isdisjoint(quantity.kind_preference)):
-                                aqi = min([
-                                    quantity.kind_preference.index(x)
-                                    for x in listify(added_quantity[
-                                        QUANTITY.KIND])
-                                ])
-                                qqi = min([
-                                    quantity.kind_preference.index(x)
-                                    for x in listify(ct[QUANTITY.KIND])
-                                ])
-                                if aqi >= qqi:
-                                    addct = True
-                                if aqi <= qqi:
-                                    isworse = False
-                            else:
-                                addct = True
-                                isworse = False
-                            if addct:
-                                newquantities.append(ct)
+                if (quantity in [self._KEYS.DISCOVER_DATE,
+                                 self._KEYS.MAX_DATE] or
+                        (type(quantity) == Key and quantity.type in [
+                            KEY_TYPES.NUMERIC, KEY_TYPES.STRING])):
+                    newquantities, isworse = self._replace_better(
+                        quantity, my_quantity_list, added_quantity)
+                elif type(quantity) != Key:
+                    isworse = False
 
                 if isworse:
                     self._log.info("Removing quantity '{}' with value '{}' "
@@ -325,6 +459,11 @@ class Supernova(Entry):
                             SUPERNOVA.ALIAS, 'AT' + cleaned_value[2:], source,
                             **kwargs)
 
+        # Keep the catalog's alias index up to date with the new aliases.
+        reindex = getattr(self.catalog.entries, 'reindex', None)
+        if reindex is not None and self._KEYS.ALIAS in listify(quantities):
+            reindex(self[self._KEYS.NAME])
+
         return True
 
     def add_source(self, **kwargs):
@@ -368,18 +507,16 @@ class Supernova(Entry):
                 if is_number(iaucnum) and iaucnum in self.catalog.iaucs_dict:
                     kwargs[SOURCE.BIBCODE] = self.catalog.iaucs_dict[iaucnum]
 
-            for rep in self.catalog.source_syns:
-                if kwargs[SOURCE.NAME] in self.catalog.source_syns[rep]:
-                    kwargs[SOURCE.NAME] = rep
-                    break
+            kwargs[SOURCE.NAME] = self.catalog.source_syn_map.get(
+                kwargs[SOURCE.NAME], kwargs[SOURCE.NAME])
 
         if SOURCE.URL in kwargs:
-            for rep in self.catalog.url_redirs:
-                if kwargs[SOURCE.URL] in self.catalog.url_redirs[rep]:
-                    kwargs[SOURCE.URL] = rep
-                    break
+            kwargs[SOURCE.URL] = self.catalog.url_redir_map.get(
+                kwargs[SOURCE.URL], kwargs[SOURCE.URL])
 
-        return super(Supernova, self).add_source(**kwargs)
+        alias = super(Supernova, self).add_source(**kwargs)
+        self._source_index_of = None
+        return alias
 
     def priority_prefixes(self):
         """Prefixes to given priority to when merging duplicate entries.
@@ -433,8 +570,21 @@ class Supernova(Entry):
 
         return outdir, filename
 
+    def save(self, bury=False, final=False):
+        """Write the entry to its JSON file, which becomes its `filename`,
+        recording its stub in the catalog's `stub_index`.
+        """
+        save_name = super(Supernova, self).save(bury=bury, final=final)
+        self.filename = save_name
+        stub_index = getattr(self.catalog, 'stub_index', None)
+        if stub_index is not None:
+            stub_index.record(self[self._KEYS.NAME], save_name, self)
+        return save_name
+
     def sanitize(self):
         super(Supernova, self).sanitize()
+        # Photometry is sorted in place above.
+        self._photometry_columns = None
 
         # Calculate some columns based on imported data, sanitize some fields
         name = self[self._KEYS.NAME]
@@ -465,40 +615,13 @@ class Supernova(Entry):
         if self._KEYS.SOURCES in self:
             for source in self[self._KEYS.SOURCES]:
                 if SOURCE.BIBCODE in source:
-                    import urllib
-                    from html import unescape
-                    # First sanitize the bibcode
-                    if len(source[SOURCE.BIBCODE]) != 19:
-                        source[SOURCE.BIBCODE] = urllib.parse.unquote(
-                            unescape(source[SOURCE.BIBCODE])).replace('A.A.',
-                                                                      'A&A')
-                    if source[SOURCE.BIBCODE] in self.catalog.biberror_dict:
-                        source[SOURCE.BIBCODE] = \
-                            self.catalog.biberror_dict[source[SOURCE.BIBCODE]]
-
-                    if (source[SOURCE.BIBCODE] not in
-                            self.catalog.bibauthor_dict):
-                        bibcode = source[SOURCE.BIBCODE]
-                        adsquery = (self.catalog.ADS_BIB_URL +
-                                    urllib.parse.quote(bibcode) +
-                                    '&data_type=Custom&format=%253m%20%25(y)')
-                        bibcodeauthor = ''
-                        try:
-                            response = urllib.request.urlopen(adsquery)
-                            html = response.read().decode('utf-8')
-                            hsplit = html.split("\n")
-                            if len(hsplit) > 5:
-                                bibcodeauthor = hsplit[5]
-                        except:
-                            pass
-
-                        if not bibcodeauthor:
-                            warnings.warn(
-                                "Bibcode didn't return authors, not converting"
-                                "this bibcode.")
-
-                        self.catalog.bibauthor_dict[bibcode] = unescape(
-                            bibcodeauthor).strip()
+                    source[SOURCE.BIBCODE] = clean_bibcode(
+                        source[SOURCE.BIBCODE], self.catalog.biberror_dict)
+            # Normally already resolved by the cleanup prefetch.
+            self.catalog.load_bibauthors([
+                x[SOURCE.BIBCODE] for x in self[self._KEYS.SOURCES]
+                if SOURCE.BIBCODE in x
+            ])
 
             for source in self[self._KEYS.SOURCES]:
                 if (SOURCE.BIBCODE in source and
@@ -534,24 +657,29 @@ class Supernova(Entry):
 
             # Assign new aliases to match new order
             source_reps = OrderedDict(
-                [[x[SOURCE.ALIAS], str(i + 1)]
+                [[_alias_key(x[SOURCE.ALIAS]), i + 1]
                  for i, x in enumerate(self[self._KEYS.SOURCES])])
             for i, source in enumerate(self[self._KEYS.SOURCES]):
-                self[self._KEYS.SOURCES][i][SOURCE.ALIAS] = source_reps[source[
-                    SOURCE.ALIAS]]
+                self[self._KEYS.SOURCES][i][SOURCE.ALIAS] = str(source_reps[
+                    _alias_key(source[SOURCE.ALIAS])])
+            self._source_index_of = None
 
-            # Change sources to match new aliases
+            # Change sources to match new aliases, most items share a handful
+            # of distinct source strings so each is only remapped once.
+            remapped = {}
             for key in self.keys():
                 if self._KEYS.get_key_by_name(key).no_source:
                     continue
                 for item in self[key]:
-                    aliases = [
-                        str(y)
-                        for y in sorted(
-                            int(source_reps[x])
-                            for x in item[item._KEYS.SOURCE].split(','))
-                    ]
-                    item[item._KEYS.SOURCE] = ','.join(aliases)
+                    old_aliases = item[item._KEYS.SOURCE]
+                    if old_aliases not in remapped:
+                        remapped[old_aliases] = ','.join([
+                            str(y)
+                            for y in sorted(
+                                source_reps[x]
+                                for x in _source_aliases(old_aliases))
+                        ])
+                    item[item._KEYS.SOURCE] = remapped[old_aliases]
 
     def clean_internal(self, data):
         """Clean input data from the 'Supernovae/input/internal' repository.
@@ -611,12 +739,16 @@ class Supernova(Entry):
             if self._KEYS.get_key_by_name(key).no_source:
                 pass
             elif key == self._KEYS.PHOTOMETRY:
+                # Times in JD are converted as one column.
+                jds = [
+                    x for x in data[self._KEYS.PHOTOMETRY]
+                    if x[PHOTOMETRY.U_TIME] == 'JD'
+                ]
+                mjds = jds_to_mjds([x[PHOTOMETRY.TIME] for x in jds])
+                for photo, mjd in zip(jds, mjds):
+                    photo[PHOTOMETRY.U_TIME] = 'MJD'
+                    photo[PHOTOMETRY.TIME] = mjd
                 for p, photo in enumerate(data[self._KEYS.PHOTOMETRY]):
-                    if photo[PHOTOMETRY.U_TIME] == 'JD':
-                        data[self._KEYS.PHOTOMETRY][p][
-                            PHOTOMETRY.U_TIME] = 'MJD'
-                        data[self._KEYS.PHOTOMETRY][p][PHOTOMETRY.TIME] = str(
-                            jd_to_mjd(Decimal(photo['time'])))
                     if QUANTITY.SOURCE not in photo:
                         if not def_source_dict:
                             raise ValueError("No sources found, can't add "
@@ -637,87 +769,430 @@ class Supernova(Entry):
 
         return data
 
+    def _get_photometry_columns(self):
+        """Return a cached, column-oriented view of this entry's photometry.
+
+        The view is a dictionary of NumPy arrays with one element per
+        photometry point: float64 `time` (the mean for time ranges),
+        `time_min` (the minimum for time ranges) and `mag`, integer `band`
+        codes indexing `band_names`, and boolean flags.  It is rebuilt when
+        photometry is added or the photometry list is replaced or resized.
+        """
+        photometry = self.get(self._KEYS.PHOTOMETRY, [])
+        cols = self._photometry_columns
+        if (cols is not None and self._photometry_columns_of is photometry and
+                cols['size'] == len(photometry)):
+            return cols
+
+        nphot = len(photometry)
+        time = np.full(nphot, np.nan)
+        time_min = np.full(nphot, np.nan)
+        mag = np.full(nphot, np.nan)
+        band = np.zeros(nphot, dtype=int)
+        band_names = []
+        band_index = {}
+        flags = {
+            x: np.zeros(nphot, dtype=bool)
+            for x in [
+                'has_time', 'has_u_time', 'is_mjd', 'has_mag', 'has_band',
+                'upper_limit', 'includes_host'
+            ]
+        }
+        for i, x in enumerate(photometry):
+            if PHOTOMETRY.TIME in x:
+                flags['has_time'][i] = True
+                if isinstance(x[PHOTOMETRY.TIME], list):
+                    times = [float(y) for y in x[PHOTOMETRY.TIME]]
+                    time[i] = np.mean(times)
+                    time_min[i] = min(times)
+                else:
+                    time[i] = time_min[i] = float(x[PHOTOMETRY.TIME])
+            if PHOTOMETRY.U_TIME in x:
+                flags['has_u_time'][i] = True
+                flags['is_mjd'][i] = x[PHOTOMETRY.U_TIME] == 'MJD'
+            if PHOTOMETRY.MAGNITUDE in x:
+                flags['has_mag'][i] = True
+                mag[i] = float(x[PHOTOMETRY.MAGNITUDE])
+            flags['has_band'][i] = PHOTOMETRY.BAND in x
+            flags['upper_limit'][i] = PHOTOMETRY.UPPER_LIMIT in x
+            flags['includes_host'][i] = bool(
+                x.get(PHOTOMETRY.INCLUDES_HOST, False))
+            bandname = x.get(PHOTOMETRY.BAND, '')
+            if bandname not in band_index:
+                band_index[bandname] = len(band_names)
+                band_names.append(bandname)
+            band[i] = band_index[bandname]
+
+        cols = dict(flags)
+        cols.update({
+            'size': nphot,
+            'time': time,
+            'time_min': time_min,
+            'mag': mag,
+            'band': band,
+            'band_names': band_names
+        })
+        self._photometry_columns = cols
+        self._photometry_columns_of = photometry
+        return cols
+
+    def _get_photometry_index(self):
+        """Return a dictionary mapping photometry fingerprints to photometry.
+
+        Like the source index, this is rebuilt whenever the photometry list
+        is replaced or changes length outside of `_add_cat_dict`.
+        """
+        photometry = self.get(self._KEYS.PHOTOMETRY, [])
+        if (self._photometry_index_of is not photometry or
+                self._photometry_index_len != len(photometry)):
+            self._photometry_index = {}
+            for photo in photometry:
+                self._photometry_index.setdefault(
+                    dupe_fingerprint(photo), photo)
+            self._photometry_index_of = photometry
+            self._photometry_index_len = len(photometry)
+        return self._photometry_index
+
+    def _add_cat_dict(self,
+                      cat_dict_class,
+                      key_in_self,
+                      check_for_dupes=True,
+                      compare_to_existing=True,
+                      **kwargs):
+        """Add a `CatDict` to this `Entry`.
+
+        Photometry is checked for duplicates with a fingerprint lookup rather
+        than by comparing against every stored point, everything else is
+        handled by the parent class.
+        """
+        if cat_dict_class != Photometry or not compare_to_existing:
+            return super(Supernova, self)._add_cat_dict(
+                cat_dict_class,
+                key_in_self,
+                check_for_dupes=check_for_dupes,
+                compare_to_existing=compare_to_existing,
+                **kwargs)
+
+        try:
+            source = self._check_cat_dict_source(cat_dict_class, key_in_self,
+                                                 **kwargs)
+        except CatDictError as err:
+            if err.warn:
+                self._log.info("'{}' Not adding '{}': '{}'".format(self[
+                    self._KEYS.NAME], key_in_self, str(err)))
+            return False
+        if source is None:
+            return False
+
+        new_entry = self._init_cat_dict(cat_dict_class, key_in_self, **kwargs)
+        if new_entry is None:
+            return False
+
+        index = self._get_photometry_index()
+        fingerprint = dupe_fingerprint(new_entry)
+        if fingerprint in index:
+            index[fingerprint].append_sources_from(new_entry)
+            return new_entry
+
+        self.setdefault(key_in_self, []).append(new_entry)
+        index[fingerprint] = new_entry
+        self._photometry_index_of = self[key_in_self]
+        self._photometry_index_len += 1
+        self._photometry_columns = None
+        return True
+
+    def add_photometry(self, compare_to_existing=True, **kwargs):
+        self._photometry_columns = None
+        return super(Supernova, self).add_photometry(
+            compare_to_existing=compare_to_existing, **kwargs)
+
+    def add_photometry_batch(self, compare_to_existing=True, **columns):
+        """Add a block of photometry points to this entry in one pass.
+
+        Every keyword is a photometry key (e.g. `time`, `band`, `magnitude`,
+        `e_magnitude`, `upperlimit`, `source`).  Lists, tuples and arrays are
+        columns holding one element per point, any other value applies to
+        every point.  Empty ('' or `None`, or NaN in float arrays) cells are
+        skipped.  Each distinct source is validated once, duplicates are
+        merged through the photometry fingerprint index and the new points are
+        appended together.  Returns the number of points stored.
+
+        Each distinct value of a column is checked and cleaned once, as
+        `Photometry` would check and clean it, and the points are then
+        assembled from the cleaned columns, using the first point built by
+        the `Photometry` constructor as a template.  Points holding lists,
+        and batches with keys that are unknown or checked against each other
+        (`flux`, `flux_density`), are built by the constructor instead.  With
+        `--debug`, every point assembled from the columns is built by the
+        constructor too, and a `RuntimeError` is raised if the two differ.
+        """
+        key = self._KEYS.PHOTOMETRY
+        scalars = {}
+        cols = {}
+        for name, values in columns.items():
+            if isinstance(values, np.ndarray):
+                if values.dtype.kind == 'f':
+                    values = np.where(np.isnan(values), None, values)
+                cols[name] = values.tolist()
+            elif isinstance(values, (list, tuple)):
+                cols[name] = values
+            elif values is not None and values != '':
+                scalars[name] = values
+        lengths = set(len(x) for x in cols.values())
+        if len(lengths) > 1:
+            raise ValueError("Photometry columns for '{}' have unequal "
+                             "lengths.".format(self[self._KEYS.NAME]))
+        nphot = lengths.pop() if lengths else 1
+        for name, value in scalars.items():
+            cols[name] = [value] * nphot
+
+        def raw_point(ii):
+            return dict((name, values[ii]) for name, values in cols.items()
+                        if values[ii] is not None and values[ii] != '')
+
+        vals = PHOTOMETRY.vals()
+        cleaned = []
+        for name, values in cols.items():
+            if name not in vals or name in _CROSS_CHECKED_KEYS:
+                cleaned = None
+                break
+            key_obj = vals[vals.index(name)]
+            cleaned.append(
+                (key_obj, self._clean_photometry_column(key_obj, values)))
+
+        index = self._get_photometry_index()
+        compare = PHOTOMETRY.compare_vals()
+        fingerprints = {}
+        sources = cols.get(PHOTOMETRY.SOURCE, [None] * nphot)
+        checked = {}
+        template = None
+        debug = getattr(self.catalog.args, 'debug', False)
+        new_photos = []
+        for ii in range(nphot):
+            source = sources[ii]
+            if source not in checked:
+                try:
+                    checked[source] = self._check_cat_dict_source(
+                        Photometry, key, **raw_point(ii))
+                except CatDictError as err:
+                    if err.warn:
+                        self._log.info("'{}' Not adding '{}': '{}'".format(
+                            self[self._KEYS.NAME], key, str(err)))
+                    checked[source] = None
+            if checked[source] is None:
+                continue
+
+            items = None
+            if cleaned is not None and template is not None:
+                items = [(x, col[ii]) for x, col in cleaned
+                         if col[ii] is not None]
+                if any(x[1] is _PER_POINT for x in items):
+                    items = None
+            if items is None:
+                new_photo = self._init_cat_dict(Photometry, key,
+                                                **raw_point(ii))
+                if template is None:
+                    template = new_photo
+            else:
+                new_photo = self._photometry_from_items(template, items)
+                if debug:
+                    self._check_photometry_from_items(new_photo,
+                                                      raw_point(ii))
+            if new_photo is None:
+                continue
+
+            fingerprint = self._batch_fingerprint(new_photo, compare,
+                                                  fingerprints)
+            if compare_to_existing and fingerprint in index:
+                index[fingerprint].append_sources_from(new_photo)
+                continue
+            index.setdefault(fingerprint, new_photo)
+            new_photos.append(new_photo)
+
+        if new_photos:
+            self.setdefault(key, []).extend(new_photos)
+            self._photometry_index_of = self[key]
+            self._photometry_index_len = len(self[key])
+            self._photometry_columns = None
+        return len(new_photos)
+
+    def _clean_photometry_column(self, key, values):
+        """Return `values` as `Photometry` would store them under `key`.
+
+        Cells that would not be stored are None, cells that would make
+        `Photometry` reject the point are a `CatDictError`, and cells only
+        the constructor can clean are `_PER_POINT`.  Dates in a time column
+        are converted to MJD.
+        """
+        text_types = [KEY_TYPES.STRING, KEY_TYPES.NUMERIC, KEY_TYPES.TIME]
+        memo = {}
+        column = []
+        for value in values:
+            try:
+                column.append(memo[type(value), value])
+                continue
+            except KeyError:
+                pass
+            except TypeError:
+                column.append(_PER_POINT)
+                continue
+            clean = None
+            if value is None or value == '':
+                pass
+            elif (key.type in [KEY_TYPES.BOOL, KEY_TYPES.STRING] and
+                  not value):
+                pass
+            elif not key.check(value):
+                if key.type == KEY_TYPES.BOOL:
+                    clean = CatDictError(
+                        "`value` '{}' for '{}' should be boolean".format(
+                            value, key.pretty()))
+            else:
+                clean = value
+                if key.type in text_types:
+                    clean = (value.strip() if isinstance(value, str) else
+                             str(value))
+                if key == PHOTOMETRY.BAND:
+                    clean = bandrepf(clean)
+                elif key == PHOTOMETRY.INSTRUMENT:
+                    clean = instrumentrepf(clean)
+                clean = clean or None
+            memo[type(value), value] = clean
+            column.append(clean)
+
+        if key == PHOTOMETRY.TIME:
+            dates = set(x for x in memo.values() if isinstance(x, str) and
+                        ('-' in x or '/' in x) and not x.startswith('-'))
+            if dates:
+                mjds = _photometry_date_mjds(dates)
+                column = [mjds.get(x, x) if isinstance(x, str) else x
+                          for x in column]
+        return column
+
+    def _photometry_from_items(self, template, items):
+        """Return a `Photometry` holding the cleaned `items`, completed as
+        the constructor completed `template`, or None if it is invalid.
+        """
+        photo = Photometry.__new__(Photometry)
+        OrderedDict.__init__(photo, items)
+        photo.__dict__.update(template.__dict__)
+        err_str = None
+        for name, value in items:
+            if isinstance(value, CatDictError):
+                err_str = str(value)
+                break
+        else:
+            for req_any in photo._REQ_KEY_SETS:
+                if not any(x in photo for x in req_any):
+                    err_str = ("'{}' Requires one or more of: ".format(
+                        photo._key) + ",".join(
+                            "'{}'".format(x) for x in req_any))
+                    break
+        if err_str is not None:
+            self._log.info("'{}' Not adding '{}': '{}'".format(
+                self[self._KEYS.NAME], photo._key, err_str))
+            return None
+
+        if PHOTOMETRY.BAND in photo:
+            for bmf in _BAND_META_KEYS:
+                if bmf not in photo:
+                    temp = bandmetaf(photo[PHOTOMETRY.BAND], bmf)
+                    if temp is not None:
+                        photo[bmf] = temp
+        if PHOTOMETRY.U_TIME not in photo and PHOTOMETRY.TIME in photo:
+            photo[PHOTOMETRY.U_TIME] = 'MJD'
+        if (PHOTOMETRY.U_COUNT_RATE not in photo and
+                PHOTOMETRY.COUNT_RATE in photo):
+            photo[PHOTOMETRY.U_COUNT_RATE] = 's^-1'
+        return photo
+
+    def _check_photometry_from_items(self, photo, raw):
+        """Raise if `photo`, built by `_photometry_from_items`, differs from
+        the point the `Photometry` constructor builds from `raw`.
+        """
+        built = self._init_cat_dict(Photometry, self._KEYS.PHOTOMETRY, **raw)
+        if photo is None or built is None:
+            same = photo is built
+        else:
+            same = (list(photo.items()) == list(built.items()) and
+                    photo.__dict__ == built.__dict__)
+        if not same:
+            err_str = ("Photometry of '{}' built from columns differs from "
+                       "the constructor's: {} != {}".format(
+                           self[self._KEYS.NAME], photo, built))
+            self._log.error(err_str)
+            raise RuntimeError(err_str)
+
+    def _batch_fingerprint(self, photo, compare, memo):
+        """Return `dupe_fingerprint(photo)`, reusing the compared values of
+        earlier points of the batch held in `memo`.
+        """
+        fingerprint = []
+        for key in compare:
+            if key in photo:
+                value = photo[key]
+                try:
+                    fvalue = memo[key.name, value]
+                except KeyError:
+                    fvalue = memo[key.name, value] = fingerprint_value(
+                        key, value)
+                except TypeError:
+                    fvalue = fingerprint_value(key, value)
+                fingerprint.append((key.name, fvalue))
+        return tuple(fingerprint)
+
     def _get_max_light(self, visual=False):
         if self._KEYS.PHOTOMETRY not in self:
             return (None, None, None, None)
 
-        eventphoto = [
-            (x[PHOTOMETRY.U_TIME], Decimal(x[PHOTOMETRY.TIME])
-             if not isinstance(x[PHOTOMETRY.TIME], list) else
-             Decimal(np.mean(float(y) for y in x[PHOTOMETRY.TIME])),
-             Decimal(x[PHOTOMETRY.MAGNITUDE]), x.get(PHOTOMETRY.BAND, ''),
-             x[PHOTOMETRY.SOURCE]) for x in self[self._KEYS.PHOTOMETRY]
-            if (PHOTOMETRY.MAGNITUDE in x and PHOTOMETRY.TIME in x and x.get(
-                PHOTOMETRY.U_TIME, '') == 'MJD' and PHOTOMETRY.UPPER_LIMIT
-                not in x and not x.get(PHOTOMETRY.INCLUDES_HOST, False))
-        ]
-        # Use photometry that includes host if no other photometry available.
-        if not eventphoto:
-            eventphoto = [
-                (x[PHOTOMETRY.U_TIME], Decimal(x[PHOTOMETRY.TIME])
-                 if not isinstance(x[PHOTOMETRY.TIME], list) else
-                 Decimal(np.mean(float(y) for y in x[PHOTOMETRY.TIME])),
-                 Decimal(x[PHOTOMETRY.MAGNITUDE]), x.get(PHOTOMETRY.BAND, ''),
-                 x[PHOTOMETRY.SOURCE]) for x in self[self._KEYS.PHOTOMETRY]
-                if (PHOTOMETRY.MAGNITUDE in x and PHOTOMETRY.TIME in x and
-                    x.get(PHOTOMETRY.U_TIME, '') == 'MJD' and not x.get(
-                        PHOTOMETRY.INCLUDES_HOST, False))
-            ]
-        if not eventphoto:
+        cols = self._get_photometry_columns()
+        usable = (cols['has_mag'] & cols['has_time'] & cols['is_mjd'] &
+                  ~cols['includes_host'])
+        mask = usable & ~cols['upper_limit']
+        # Use upper limits if no other photometry available.
+        if not mask.any():
+            mask = usable
+        if not mask.any():
             return None, None, None, None
 
-        mlmag = None
-
         if visual:
             for mb in MAX_VISUAL_BANDS:
-                leventphoto = [x for x in eventphoto if x[3] in mb]
-                if leventphoto:
-                    mlmag = min([x[2] for x in leventphoto])
-                    eventphoto = leventphoto
+                codes = [
+                    i for i, x in enumerate(cols['band_names']) if x in mb
+                ]
+                lmask = mask & np.isin(cols['band'], codes)
+                if lmask.any():
+                    mask = lmask
                     break
 
-        if not mlmag:
-            mlmag = min([x[2] for x in eventphoto])
+        indices = np.flatnonzero(mask)
+        mlindex = indices[np.argmin(cols['mag'][indices])]
+        photo = self[self._KEYS.PHOTOMETRY][mlindex]
+        mlmag = Decimal(photo[PHOTOMETRY.MAGNITUDE])
+        mlband = photo.get(PHOTOMETRY.BAND, '')
+        mlsource = photo[PHOTOMETRY.SOURCE]
 
-        mlindex = [x[2] for x in eventphoto].index(mlmag)
-        mlband = eventphoto[mlindex][3]
-        mlsource = eventphoto[mlindex][4]
-
-        if eventphoto[mlindex][0] == 'MJD':
-            mlmjd = float(eventphoto[mlindex][1])
-            mlmjd = astrotime(mlmjd, format='mjd').datetime
-            return mlmjd, mlmag, mlband, mlsource
-        else:
-            return None, mlmag, mlband, mlsource
+        mlmjd = astrotime(float(cols['time'][mlindex]), format='mjd').datetime
+        return mlmjd, mlmag, mlband, mlsource
 
     def _get_first_light(self):
         if self._KEYS.PHOTOMETRY not in self:
             return None, None
 
-        eventphoto = [(Decimal(x[PHOTOMETRY.TIME])
-                       if not isinstance(x[PHOTOMETRY.TIME], list) else
-                       Decimal(min(float(y) for y in x[PHOTOMETRY.TIME])),
-                       x[PHOTOMETRY.SOURCE])
-                      for x in self[self._KEYS.PHOTOMETRY]
-                      if PHOTOMETRY.UPPER_LIMIT not in x and PHOTOMETRY.TIME in
-                      x and x.get(PHOTOMETRY.U_TIME, '') == 'MJD' and
-                      PHOTOMETRY.INCLUDES_HOST not in x]
+        cols = self._get_photometry_columns()
+        usable = cols['has_time'] & cols['is_mjd'] & ~cols['upper_limit']
+        mask = usable & ~cols['includes_host']
         # Use photometry that includes host if no other photometry available.
-        if not eventphoto:
-            eventphoto = [
-                (Decimal(x[PHOTOMETRY.TIME])
-                 if not isinstance(x[PHOTOMETRY.TIME], list) else
-                 Decimal(min(float(y) for y in x[PHOTOMETRY.TIME])),
-                 x[PHOTOMETRY.SOURCE]) for x in self[self._KEYS.PHOTOMETRY]
-                if PHOTOMETRY.UPPER_LIMIT not in x and PHOTOMETRY.TIME in x and
-                x.get(PHOTOMETRY.U_TIME, '') == 'MJD'
-            ]
-        if not eventphoto:
+        if not mask.any():
+            mask = usable
+        if not mask.any():
             return None, None
-        flmjd = min([x[0] for x in eventphoto])
-        flindex = [x[0] for x in eventphoto].index(flmjd)
-        flmjd = astrotime(float(flmjd), format='mjd').datetime
-        flsource = eventphoto[flindex][1]
+
+        indices = np.flatnonzero(mask)
+        flindex = indices[np.argmin(cols['time_min'][indices])]
+        flmjd = astrotime(
+            float(cols['time_min'][flindex]), format='mjd').datetime
+        flsource = self[self._KEYS.PHOTOMETRY][flindex][PHOTOMETRY.SOURCE]
         return flmjd, flsource
 
     def set_first_max_light(self):
@@ -811,23 +1286,21 @@ class Supernova(Entry):
         """
         if SUPERNOVA.PHOTOMETRY not in self:
             return
-        mjds = [
-            float(x[PHOTOMETRY.TIME]) for x in self[SUPERNOVA.PHOTOMETRY]
-            if (PHOTOMETRY.TIME in x and x.get(PHOTOMETRY.U_TIME, '') == 'MJD'
-                and PHOTOMETRY.MAGNITUDE in x and PHOTOMETRY.BAND in x)
-        ]
-        if not mjds:
+        cols = self._get_photometry_columns()
+        banded = (cols['has_time'] & cols['is_mjd'] & cols['has_mag'] &
+                  cols['has_band'])
+        if not banded.any():
+            return
+        minmjd = cols['time'][banded].min() - 1
+        maxmjd = cols['time'][banded].max() + 1
+        purge = (cols['has_mag'] & ~cols['has_band'] &
+                 (~cols['has_time'] | ~cols['has_u_time'] |
+                  ((cols['time'] >= minmjd) & (cols['time'] <= maxmjd))))
+        if not purge.any():
             return
-        minmjd = min(mjds) - 1
-        maxmjd = max(mjds) + 1
         newphotos = []
-        for photo in self[SUPERNOVA.PHOTOMETRY]:
-            if (PHOTOMETRY.MAGNITUDE in photo and
-                    PHOTOMETRY.BAND not in photo and
-                (PHOTOMETRY.TIME not in photo or
-                 PHOTOMETRY.U_TIME not in photo or
-                 (float(photo[PHOTOMETRY.TIME]) >= minmjd and
-                  float(photo[PHOTOMETRY.TIME]) <= maxmjd))):
+        for photo, purged in zip(self[SUPERNOVA.PHOTOMETRY], purge):
+            if purged:
                 self._log.info("Purging photometry without band information, "
                                "MJD: {}, Mag: {}".format(
                                    photo.get(PHOTOMETRY.TIME, "Not specified"),
@@ -858,7 +1331,7 @@ class Supernova(Entry):
 
         return bestz, bestkind, bestsig, bestsrc
 
-    def set_preferred_name(self):
+    def _get_preferred_name(self):
         """Highest preference goes to names of the form 'SN####AA'.
         Otherwise base the name on whichever survey is the 'discoverer'.
 
@@ -923,13 +1396,23 @@ class Supernova(Entry):
         # Always prefer another alias over PSN
         if not newname and name.startswith('PSN'):
             newname = aliases[0]
-        if newname and name != newname:
+        return newname or name
+
+    def set_preferred_name(self):
+        """Rename the entry to its preferred name, merging it into any
+        existing entry of that name.
+        """
+        name = self[self._KEYS.NAME]
+        newname = self._get_preferred_name()
+        if name != newname:
             file_entry = None
             # Make sure new name doesn't already exist
             if newname in self.catalog.entries:
                 if self.catalog.entries[newname]._stub:
-                    file_entry = self.init_from_file(
-                        self.catalog, name=newname)
+                    # Only a stub the index has a file for is loaded.
+                    if self.catalog.stub_index.path(newname) is not None:
+                        file_entry = self.init_from_file(
+                            self.catalog, name=newname)
                 else:
                     file_entry = self.catalog.entries[newname]
 
@@ -942,8 +1425,9 @@ class Supernova(Entry):
             else:
                 self._log.info("Changing entry from name '{}' to preferred"
                                " name '{}'".format(name, newname))
+                # Renamed first, so the entry is indexed under its new name.
+                self.catalog.entries[name][self._KEYS.NAME] = newname
                 self.catalog.entries[newname] = self.catalog.entries[name]
-                self.catalog.entries[newname][self._KEYS.NAME] = newname
             del self.catalog.entries[name]
             return newname
 
@@ -1,17 +1,19 @@
 """Supernovae specific catalog class."""
-import codecs
-import json
 import os
+import warnings
 from collections import OrderedDict
 from datetime import datetime
 from subprocess import check_output
 
 from astrocats.catalog.catalog import Catalog
+from astrocats.catalog.entry import ENTRY
 from astrocats.catalog.quantity import QUANTITY
-from astrocats.catalog.utils import read_json_arr, read_json_dict
+from astrocats.catalog.utils import pbar, read_json_arr, read_json_dict
 
 from .supernova import SUPERNOVA, Supernova
-from .utils import name_clean
+from .utils import (CosmologyTable, EntryDict, JournaledDict, SFDMap,
+                    StubIndex, TNSCache, VizierCache, invert_synonyms,
+                    lazyproperty, name_clean, query_bibauthors)
 
 
 class SupernovaCatalog(Catalog):
@@ -45,6 +47,19 @@ class SupernovaCatalog(Catalog):
                 self.PATH_OUTPUT, 'cache', 'bibauthors.json')
             self.EXTINCT = os.path.join(
                 self.PATH_OUTPUT, 'cache', 'extinctions.json')
+            self.STUBS = os.path.join(
+                self.PATH_OUTPUT, 'cache', 'entry-stubs.json')
+            self.COSMOLOGY = os.path.join(
+                self.PATH_OUTPUT, 'cache', 'cosmology.npz')
+            self.VIZIER = os.path.join(self.PATH_OUTPUT, 'cache', 'vizier')
+            self.TNS = os.path.join(self.PATH_OUTPUT, 'cache', 'tns')
+            # per-payload TNS caches kept before, used to seed `TNS`
+            self.TNS_PHOTOMETRY = os.path.join(
+                self.PATH_INPUT, 'sne-external', 'TNS')
+            self.TNS_SPECTRA = os.path.join(
+                self.PATH_INPUT, 'sne-external-spectra', 'TNS', 'meta')
+            # optional local copies of the SFD dust maps
+            self.SFD_MAPS = os.path.join(self.PATH_INPUT, 'sfd')
 
         def get_repo_years(self):
             """Return an array of years based upon output repositories."""
@@ -54,20 +69,58 @@ class SupernovaCatalog(Catalog):
             repo_years[0] -= 1
             return repo_years
 
-    class SCHEMA(object):
-        """Define the HASH/URL associated with the present schema."""
+    class _Schema(object):
+        """Define the HASH/URL associated with the present schema.
 
-        HASH = (check_output(['git', '-C', 'astrocats/supernovae',
-                              'log', '-n', '1', '--format="%h"',
-                              '--', 'SCHEMA.md'])
-                .decode('ascii').strip().strip('"').strip())
-        URL = ('https://github.com/astrocatalogs/supernovae/blob/' + HASH +
-               '/SCHEMA.md')
+        The hash is looked up from git on first use rather than at import.
+        """
+
+        @lazyproperty
+        def HASH(self):
+            return (check_output(['git', '-C', 'astrocats/supernovae',
+                                  'log', '-n', '1', '--format="%h"',
+                                  '--', 'SCHEMA.md'])
+                    .decode('ascii').strip().strip('"').strip())
+
+        @lazyproperty
+        def URL(self):
+            return ('https://github.com/astrocatalogs/supernovae/blob/' +
+                    self.HASH + '/SCHEMA.md')
+
+    SCHEMA = _Schema()
+
+    # Concurrent requests used to resolve bibcode authors through ADS
+    ADS_THREADS = 8
+    # VizieR mirror queried for tables missing from the on-disk cache, the
+    # number of queries made concurrently, and the timeout of each (s). Set
+    # `ASTROCATS_VIZIER_REFRESH` to retrieve every cached table again.
+    VIZIER_SERVER = 'vizier.cfa.harvard.edu'
+    VIZIER_THREADS = 8
+    VIZIER_TIMEOUT = 60
+    # TNS API queried for object photometry and spectra, the number of
+    # queries made concurrently, and the requests per second allowed to all
+    # of them together, kept within the TNS quota
+    TNS_API_URL = 'https://wis-tns.weizmann.ac.il/api/'
+    TNS_THREADS = 4
+    TNS_RATE = 1.0
+    # Processes cleaning entries in parallel, overridden by
+    # `ASTROCATS_CLEANUP_PROCESSES`; the output is the same as a serial run.
+    CLEANUP_PROCESSES = 1
+    # Look up E(B-V) in local copies of the SFD maps, under `input/sfd`,
+    # instead of querying IRSA. Off until `scripts/dustcheck.py` has
+    # compared the maps with IRSA; set `ASTROCATS_LOCAL_DUST` to turn it on.
+    LOCAL_DUST = False
+
+    # Keys kept in entry stubs, as by `Entry.get_stub`
+    STUB_KEYS = [SUPERNOVA.ALIAS, SUPERNOVA.DISTINCT_FROM, SUPERNOVA.RA,
+                 SUPERNOVA.DEC, SUPERNOVA.DISCOVER_DATE, SUPERNOVA.SOURCES]
 
     def __init__(self, args, log):
         """Initialize catalog."""
         # Initialize super `astrocats.catalog.catalog.Catalog` object
         super(SupernovaCatalog, self).__init__(args, log)
+        # Entries are indexed by alias so that names resolve without a scan
+        self.entries = EntryDict()
         self.proto = Supernova
         self._load_aux_data()
         return
@@ -129,35 +182,234 @@ class SupernovaCatalog(Catalog):
         return (bury_entry, save_entry)
 
     def _load_aux_data(self):
-        """Load auxiliary dictionaries for use in this catalog."""
+        """Load auxiliary dictionaries for use in this catalog.
+
+        Only the containers filled in by tasks are created here; the data
+        files below are read the first time each attribute is used.
+        """
         # Create/Load auxiliary dictionaries
         self.nedd_dict = OrderedDict()
-        self.bibauthor_dict = read_json_dict(self.PATHS.BIBAUTHORS)
-        self.biberror_dict = read_json_dict(self.PATHS.BIBERRORS)
-        self.extinctions_dict = read_json_dict(self.PATHS.EXTINCT)
-        self.iaucs_dict = read_json_dict(self.PATHS.IAUCS)
-        self.cbets_dict = read_json_dict(self.PATHS.CBETS)
-        self.atels_dict = read_json_dict(self.PATHS.ATELS)
-        self.source_syns = read_json_dict(self.PATHS.SOURCE_SYNONYMS)
-        self.url_redirs = read_json_dict(self.PATHS.URL_REDIRECTS)
-        self.type_syns = read_json_dict(self.PATHS.TYPE_SYNONYMS)
-        # Create/Load auxiliary arrays
-        self.nonsneprefixes_dict = read_json_arr(
-            self.PATHS.NON_SNE_PREFIXES)
-        self.nonsnetypes = read_json_arr(self.PATHS.NON_SNE_TYPES)
+        self.bibauthor_dict = JournaledDict(self.PATHS.BIBAUTHORS)
+        self.extinctions_dict = JournaledDict(self.PATHS.EXTINCT)
+        self.dust_map = SFDMap(self.PATHS.SFD_MAPS)
+        self.stub_index = StubIndex(
+            self.PATHS.STUBS, self.PATHS.PATH_OUTPUT, self.STUB_KEYS)
         return
 
+    @lazyproperty
+    def biberror_dict(self):
+        return read_json_dict(self.PATHS.BIBERRORS)
+
+    @lazyproperty
+    def cosmology(self):
+        return CosmologyTable(self.PATHS.COSMOLOGY)
+
+    @lazyproperty
+    def vizier(self):
+        return VizierCache(
+            self.PATHS.VIZIER, server=self.VIZIER_SERVER,
+            threads=self.VIZIER_THREADS, timeout=self.VIZIER_TIMEOUT,
+            refresh=bool(os.environ.get('ASTROCATS_VIZIER_REFRESH')))
+
+    @lazyproperty
+    def tns(self):
+        try:
+            with open('tns.key', 'r') as f:
+                tnskey = f.read().splitlines()[0]
+        except Exception:
+            self.log.warning('TNS API key not found, make sure a file named '
+                             '`tns.key` containing the key is placed the '
+                             'astrocats directory.')
+            tnskey = ''
+        tns = TNSCache(
+            self.PATHS.TNS, self.TNS_API_URL, tnskey,
+            threads=self.TNS_THREADS, rate=self.TNS_RATE)
+        tns.seed(self.PATHS.TNS_PHOTOMETRY, self.PATHS.TNS_SPECTRA)
+        return tns
+
+    @lazyproperty
+    def iaucs_dict(self):
+        return read_json_dict(self.PATHS.IAUCS)
+
+    @lazyproperty
+    def cbets_dict(self):
+        return read_json_dict(self.PATHS.CBETS)
+
+    @lazyproperty
+    def atels_dict(self):
+        return read_json_dict(self.PATHS.ATELS)
+
+    @lazyproperty
+    def source_syns(self):
+        return read_json_dict(self.PATHS.SOURCE_SYNONYMS)
+
+    @lazyproperty
+    def url_redirs(self):
+        return read_json_dict(self.PATHS.URL_REDIRECTS)
+
+    @lazyproperty
+    def type_syns(self):
+        return read_json_dict(self.PATHS.TYPE_SYNONYMS)
+
+    # Inverse (synonym -> canonical) tables for constant-time lookups
+    @lazyproperty
+    def source_syn_map(self):
+        return invert_synonyms(self.source_syns)
+
+    @lazyproperty
+    def url_redir_map(self):
+        return invert_synonyms(self.url_redirs)
+
+    @lazyproperty
+    def type_syn_map(self):
+        return invert_synonyms(self.type_syns)
+
+    # Auxiliary arrays
+    @lazyproperty
+    def nonsneprefixes_dict(self):
+        return read_json_arr(self.PATHS.NON_SNE_PREFIXES)
+
+    @lazyproperty
+    def nonsnetypes(self):
+        return read_json_arr(self.PATHS.NON_SNE_TYPES)
+
+    def load_bibauthors(self, bibcodes):
+        """Resolve the authors of any `bibcodes` not yet in `bibauthor_dict`.
+
+        Unknown bibcodes are queried from ADS concurrently and all results
+        are added to the cache in the order given.
+        """
+        missing = OrderedDict.fromkeys(
+            x for x in bibcodes if x not in self.bibauthor_dict)
+        if not missing:
+            return
+        authors = query_bibauthors(
+            self.ADS_BIB_URL, missing, threads=self.ADS_THREADS)
+        for bibcode, author in authors.items():
+            if not author:
+                warnings.warn("Bibcode didn't return authors, not converting"
+                              "this bibcode.")
+            self.bibauthor_dict[bibcode] = author
+
     def save_caches(self):
-        """Save caches to JSON files."""
-        jsonstring = json.dumps(self.bibauthor_dict, indent='\t',
-                                separators=(',', ':'), ensure_ascii=False)
-        with codecs.open(self.PATHS.BIBAUTHORS, 'w', encoding='utf8') as f:
-            f.write(jsonstring)
-        jsonstring = json.dumps(self.extinctions_dict, indent='\t',
-                                separators=(',', ':'), ensure_ascii=False)
-        with codecs.open(self.PATHS.EXTINCT, 'w', encoding='utf8') as f:
-            f.write(jsonstring)
+        """Compact cache journals into their JSON files."""
+        self.bibauthor_dict.compact()
+        self.extinctions_dict.compact()
+        self.stub_index.compact()
+
+    def load_stubs(self, log_mem=False):
+        """Load all entries in their stub form.
+
+        The stubs are taken from `stub_index`, which reads only the entry
+        files changed since they were recorded.
+        """
+        if log_mem:
+            return super(SupernovaCatalog, self).load_stubs(log_mem=log_mem)
+        files = self.PATHS.get_repo_output_file_list()
+        for name, data in self.stub_index.stubs(
+                pbar(files, 'Loading entry stubs')):
+            if name in self.entries and not self.entries[name]._stub:
+                err_str = (
+                    "ERROR: non-stub entry already exists with name '{}'"
+                    .format(name))
+                self.log.error(err_str)
+                raise RuntimeError(err_str)
+            stub = self.proto(catalog=self, name=name, stub=True)
+            for key in self.STUB_KEYS:
+                if key in data:
+                    stub[key] = data[key]
+            self.entries[name] = stub
+            self.log.debug("Added stub for '{}'".format(name))
+        return self.entries
+
+    def delete_old_entry_files(self):
+        """Delete all entry files, and their records in `stub_index`."""
+        super(SupernovaCatalog, self).delete_old_entry_files()
+        self.stub_index.clear()
+
+    def use_dust_map(self):
+        """Return whether E(B-V) is looked up in the local SFD maps."""
+        return ((self.LOCAL_DUST or
+                 bool(os.environ.get('ASTROCATS_LOCAL_DUST'))) and
+                self.dust_map.available())
 
     def clean_entry_name(self, name):
         """Clean entry's name."""
         return name_clean(name)
+
+    def entry_exists(self, name):
+        """Return whether `name` is the name or an alias of an entry."""
+        if name in self.entries:
+            return True
+        return any(name in self.entries[x].get_aliases(includename=False)
+                   for x in self.entries.holders(name))
+
+    def get_preferred_name(self, name):
+        """Return the name of the first entry with `name` among several
+        aliases, or `name` itself.
+        """
+        if name in self.entries:
+            return name
+        for entry in self.entries.holders(name):
+            aliases = self.entries[entry].get_aliases(includename=False)
+            if len(aliases) > 1 and name in aliases:
+                return entry
+        return name
+
+    def find_entry_name_of_alias(self, alias):
+        """Return the first entry name with the given `alias` included in its
+        list of aliases, or None if no entries match.
+        """
+        if alias in self.aliases:
+            name = self.aliases[alias]
+            if name in self.entries:
+                return name
+            # Name wasn't found, possibly merged or deleted.
+            for name in self.entries.holders(alias):
+                entry = self.entries[name]
+                if (alias in entry.get_aliases(includename=False) and
+                        (ENTRY.DISTINCT_FROM not in entry or
+                         alias not in entry[ENTRY.DISTINCT_FROM])):
+                    return name
+        return None
+
+    def merge_duplicates(self):
+        """Merge and remove duplicate entries.
+
+        `Catalog.merge_duplicates` compares every pair of entries, so it is
+        run only on the entries that share a name or alias with another,
+        found through the name index of `entries`. The other entries are set
+        aside meanwhile, as no merge can involve them.
+        """
+        if len(self.entries) == 0:
+            self.log.error("WARNING: `entries` is empty, loading stubs")
+            if self.args.update:
+                self.log.warning(
+                    "No sources changed, entry files unchanged in update."
+                    "  Skipping merge.")
+                return
+            self.load_stubs()
+
+        entries = self.entries
+        shared = EntryDict()
+        for name in sorted(entries.keys()):
+            holders = set()
+            for alias in (entries[name].get_aliases() +
+                          entries[name].extra_aliases()):
+                holders.update(entries.holders(alias))
+            if len(holders) > 1:
+                shared[name] = entries[name]
+        if not shared:
+            return
+
+        names = list(shared.keys())
+        self.entries = shared
+        try:
+            super(SupernovaCatalog, self).merge_duplicates()
+        finally:
+            self.entries = entries
+            for name in names:
+                if name not in shared:
+                    del entries[name]
+            for name, entry in shared.items():
+                entries[name] = entry
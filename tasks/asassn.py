@@ -3,12 +3,12 @@
 import os
 
 from astrocats.catalog.utils import pbar
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
 
 
 def do_asassn(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     asn_url = 'http://www.astronomy.ohio-state.edu/~assassin/sn_list.html'
     html = catalog.load_url(asn_url, os.path.join(
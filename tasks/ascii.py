@@ -10,6 +10,7 @@ import re
 from datetime import datetime
 from glob import glob
 
+import numpy as np
 from astrocats.catalog.photometry import PHOTOMETRY, set_pd_mag_from_counts
 from astrocats.catalog.utils import (is_number, jd_to_mjd, make_date_string,
                                      pbar, pbar_strings)
@@ -19,6 +20,7 @@ from astropy.time import Time as astrotime
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import AsciiTable, add_table_photometry
 
 
 def do_ascii(catalog):
@@ -28,27 +30,24 @@ def do_ascii(catalog):
     # 2000MNRAS.319..223H
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2000MNRAS.319..223H.csv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter=',', skipinitialspace=True))
+    table = AsciiTable(datafile, delimiter=',', skip=1)
     name, source = catalog.new_entry(
         'SN1998bu', bibcode='2000MNRAS.319..223H')
-    for ri, row in enumerate(pbar(tsvin, task_str)):
-        if ri == 0:
-            continue
-        mjd = jd_to_mjd(Decimal('2450000') + Decimal(row[0]))
-        for bi, band in enumerate(['J', 'H', 'K']):
-            photodict = {
-                PHOTOMETRY.TIME: mjd,
-                PHOTOMETRY.U_TIME: 'MJD',
-                PHOTOMETRY.MAGNITUDE: row[2 * bi + 1],
-                PHOTOMETRY.E_MAGNITUDE: row[2 * bi + 2],
-                PHOTOMETRY.BAND: band,
-                PHOTOMETRY.TELESCOPE: row[-2],
-                PHOTOMETRY.OBSERVER: row[-1],
-                PHOTOMETRY.SOURCE: source
-            }
-            catalog.entries[name].add_photometry(**photodict)
+    bands = ['J', 'H', 'K']
+    # One point per band in each row, ordered by row.
+    nb = len(bands)
+    catalog.entries[name].add_photometry_batch(**{
+        PHOTOMETRY.TIME: np.repeat(table.mjd(0, offset='2450000'), nb),
+        PHOTOMETRY.U_TIME: 'MJD',
+        PHOTOMETRY.MAGNITUDE: np.column_stack(
+            [table.column(2 * bi + 1) for bi in range(nb)]).ravel(),
+        PHOTOMETRY.E_MAGNITUDE: np.column_stack(
+            [table.column(2 * bi + 2) for bi in range(nb)]).ravel(),
+        PHOTOMETRY.BAND: np.tile(bands, len(table)).tolist(),
+        PHOTOMETRY.TELESCOPE: np.repeat(table.column(-2), nb),
+        PHOTOMETRY.OBSERVER: np.repeat(table.column(-1), nb),
+        PHOTOMETRY.SOURCE: source
+    })
     catalog.journal_entries()
 
     # 2017arXiv170405061Y
@@ -59,60 +58,47 @@ def do_ascii(catalog):
     for ev in events:
         datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                                 events[ev])
-        tsvin = list(
-            csv.reader(
-                open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+        table = AsciiTable(datafile)
         name, source = catalog.new_entry(
             ev, bibcode='2017arXiv170405061Y')
-        for row in pbar(tsvin, task_str):
-            photodict = {
-                PHOTOMETRY.TIME: row[1],
-                PHOTOMETRY.U_TIME: 'MJD',
-                PHOTOMETRY.MAGNITUDE: row[2],
-                PHOTOMETRY.E_MAGNITUDE: row[3],
-                PHOTOMETRY.BAND: row[0],
-                PHOTOMETRY.SYSTEM: 'AB',
-                PHOTOMETRY.SOURCE: source
-            }
-            catalog.entries[name].add_photometry(**photodict)
+        catalog.entries[name].add_photometry_batch(**{
+            PHOTOMETRY.TIME: table.column(1),
+            PHOTOMETRY.U_TIME: 'MJD',
+            PHOTOMETRY.MAGNITUDE: table.column(2),
+            PHOTOMETRY.E_MAGNITUDE: table.column(3),
+            PHOTOMETRY.BAND: table.column(0),
+            PHOTOMETRY.SYSTEM: 'AB',
+            PHOTOMETRY.SOURCE: source
+        })
     catalog.journal_entries()
 
     # 2016ApJ...823..147C
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2016ApJ...823..147C.csv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter=',', skipinitialspace=True))
+    table = AsciiTable(datafile, delimiter=',', comment='#')
     name, src1 = catalog.new_entry(
         'iPTF13asv', bibcode='2016ApJ...823..147C')
     src2 = catalog.entries[name].add_source(bibcode='2012PASP..124..668Y')
     source = ','.join([src1, src2])
-    for row in pbar(tsvin, task_str):
-        if row[0].startswith('#'):
-            continue
-        mag = row[1]
-        err = row[2]
-        photodict = {
-            PHOTOMETRY.TIME: row[0],
-            PHOTOMETRY.U_TIME: 'MJD',
-            PHOTOMETRY.MAGNITUDE: mag,
-            PHOTOMETRY.BAND: row[-2],
-            PHOTOMETRY.TELESCOPE: row[-1],
-            PHOTOMETRY.SOURCE: source
-        }
-        if err == '99':
-            photodict[PHOTOMETRY.UPPER_LIMIT] = True
-        else:
-            photodict[PHOTOMETRY.E_MAGNITUDE] = err
-        catalog.entries[name].add_photometry(**photodict)
+    err = table.column(2)
+    # An error of 99 marks an upper limit.
+    upper = err == '99'
+    catalog.entries[name].add_photometry_batch(**{
+        PHOTOMETRY.TIME: table.column(0),
+        PHOTOMETRY.U_TIME: 'MJD',
+        PHOTOMETRY.MAGNITUDE: table.column(1),
+        PHOTOMETRY.E_MAGNITUDE: np.where(upper, None, err),
+        PHOTOMETRY.UPPER_LIMIT: np.where(upper, True, None),
+        PHOTOMETRY.BAND: table.column(-2),
+        PHOTOMETRY.TELESCOPE: table.column(-1),
+        PHOTOMETRY.SOURCE: source
+    })
     catalog.journal_entries()
 
     # 2014MNRAS.443.1663C
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2014MNRAS.443.1663C.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'SN2012dn', bibcode='2014MNRAS.443.1663C')
     for row in pbar(tsvin, task_str):
@@ -137,9 +123,7 @@ def do_ascii(catalog):
     # 2015ApJ...811...52A
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2015ApJ...811...52A.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'PTF12csy', bibcode='2015ApJ...811...52A')
     for row in pbar(tsvin, task_str):
@@ -163,9 +147,7 @@ def do_ascii(catalog):
     # 2015MNRAS.450.2373B
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2015MNRAS.450.2373B.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'SN2013ab', bibcode='2015MNRAS.450.2373B')
     telkey = {
@@ -207,9 +189,7 @@ def do_ascii(catalog):
     # 2014ApJ...797....5Z
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2014ApJ...797....5Z.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'SN2013am', bibcode='2014ApJ...797....5Z')
     for row in pbar(tsvin, task_str):
@@ -237,9 +217,7 @@ def do_ascii(catalog):
     # 2015MNRAS.452..838L
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2015MNRAS.452..838L.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'SN2013en', bibcode='2015MNRAS.452..838L')
     for row in pbar(tsvin, task_str):
@@ -270,9 +248,7 @@ def do_ascii(catalog):
     # 2015MNRAS.452.4307P
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2015MNRAS.452.4307P.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry(
         'SN2013dy', bibcode='2015MNRAS.452.4307P')
     for row in pbar(tsvin, task_str):
@@ -299,9 +275,7 @@ def do_ascii(catalog):
     # 2016MNRAS.461.2003Y
     path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                         '2016MNRAS.461.2003Y-tab2.txt')
-    tsvin = list(
-        csv.reader(
-            open(path, 'r'), delimiter=',', skipinitialspace=True))
+    tsvin = AsciiTable(path, delimiter=',').rows
     name, source = catalog.new_entry('SN2013ej',
                                      bibcode='2016MNRAS.461.2003Y')
     telstring = ','.join(tsvin[-1]).strip('#')
@@ -333,9 +307,7 @@ def do_ascii(catalog):
     file_names = glob(
         os.path.join(catalog.get_current_task_repo(), 'SweetSpot', '*.dat'))
     for path in pbar(file_names, desc=task_str + ', SweetSpot'):
-        tsvin = list(
-            csv.reader(
-                open(path, 'r'), delimiter=' ', skipinitialspace=True))
+        tsvin = AsciiTable(path, delimiter=' ').rows
         oname = path.split('/')[-1].split('_')[0]
         name, source = catalog.new_entry(oname, bibcode='2017arXiv170302402W')
         for row in tsvin:
@@ -363,9 +335,7 @@ def do_ascii(catalog):
     # 2014ApJ...789..104O
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2014ApJ...789..104O-tab1.txt')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     for row in pbar(tsvin[2:], task_str):
         name, source = catalog.new_entry(row[0], bibcode='2014ApJ...789..104O')
         catalog.entries[name].add_quantity(SUPERNOVA.CLAIMED_TYPE, row[1],
@@ -475,34 +445,21 @@ def do_ascii(catalog):
     catalog.journal_entries()
 
     # 2006AJ....132.2024L
-    datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
-                            '2006AJ....132.2024L-tab1.txt')
-    data = read(datafile, format='cds')
-    for row in pbar(data, task_str):
-        name, source = catalog.new_entry(
-            row['Name'], bibcode='2006AJ....132.2024L')
-        for band in [
-                x for x in row.columns
-                if x.endswith('mag') and not x.startswith('e_')
-        ]:
-            if not is_number(row[band]):
-                continue
-            photodict = {
-                PHOTOMETRY.TIME: jd_to_mjd(Decimal(str(row['JD']))),
-                PHOTOMETRY.U_TIME: 'MJD',
-                PHOTOMETRY.MAGNITUDE: str(row[band]),
-                PHOTOMETRY.BAND: band.replace('mag', ''),
-                PHOTOMETRY.SOURCE: source
-            }
-            catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, {
+        'file': os.path.join('ASCII', '2006AJ....132.2024L-tab1.txt'),
+        'format': 'cds',
+        'bibcode': '2006AJ....132.2024L',
+        'name_column': 'Name',
+        'time': 'JD',
+        'time_format': 'jd',
+        'e_magnitude': False
+    }, task_str)
     catalog.journal_entries()
 
     # 2006AJ....132.1126N
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2006AJ....132.1126N-tab2.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     for row in pbar(tsvin, task_str):
         name, source = catalog.new_entry(row[0], bibcode='2006AJ....132.1126N')
         catalog.entries[name].add_quantity(SUPERNOVA.RA, row[1], source)
@@ -518,9 +475,7 @@ def do_ascii(catalog):
 
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2006AJ....132.1126N-tab3.tsv')
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     for row in pbar(tsvin, task_str):
         name, source = catalog.new_entry(row[0], bibcode='2006AJ....132.1126N')
         catalog.entries[name].add_quantity(SUPERNOVA.RA, row[1], source)
@@ -539,28 +494,22 @@ def do_ascii(catalog):
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2007ApJ...669L..17H.tsv')
 
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    table = AsciiTable(datafile, skip=1)
     name, source = catalog.new_entry('SN2006gz', bibcode='2007ApJ...669L..17H')
-    for row in pbar(tsvin[1:], task_str):
-        photodict = {
-            PHOTOMETRY.MAGNITUDE: row[2],
-            PHOTOMETRY.E_MAGNITUDE: row[3],
-            PHOTOMETRY.TIME: jd_to_mjd(Decimal(row[1])),
-            PHOTOMETRY.U_TIME: 'MJD',
-            PHOTOMETRY.BAND: row[0],
-            PHOTOMETRY.SOURCE: source
-        }
-        catalog.entries[name].add_photometry(**photodict)
+    catalog.entries[name].add_photometry_batch(**{
+        PHOTOMETRY.MAGNITUDE: table.column(2),
+        PHOTOMETRY.E_MAGNITUDE: table.column(3),
+        PHOTOMETRY.TIME: table.mjd(1),
+        PHOTOMETRY.U_TIME: 'MJD',
+        PHOTOMETRY.BAND: table.column(0),
+        PHOTOMETRY.SOURCE: source
+    })
     catalog.journal_entries()
 
     # 2011ApJ...729...88R
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              '2011ApJ...729...88R-tab1.tsv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(file_path).rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         (name, source) = catalog.new_entry(
             'SN2003ma', bibcode='2011ApJ...729...88R')
@@ -590,9 +539,7 @@ def do_ascii(catalog):
     # 1998A&A...337..207S
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              '1998A&A...337..207S-tab3.tsv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(file_path).rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         (name, source) = catalog.new_entry(
             'SN1996N', bibcode='1998A&A...337..207S')
@@ -617,9 +564,7 @@ def do_ascii(catalog):
     # 1997ApJ...483..675C
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              '1997ApJ...483..675C-tab1.tsv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(file_path).rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         (name, source) = catalog.new_entry(
             'SN1983V', bibcode='1997ApJ...483..675C')
@@ -669,9 +614,7 @@ def do_ascii(catalog):
     sns = ['SN2006V', 'SN2006au']
     for ti, tab in enumerate(tables):
         file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII', tab)
-        tsvin = list(
-            csv.reader(
-                open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+        tsvin = AsciiTable(file_path).rows
         for ri, row in enumerate(pbar(tsvin, task_str)):
             (name, source) = catalog.new_entry(
                 sns[ti], bibcode='2012A&A...537A.140T')
@@ -696,9 +639,7 @@ def do_ascii(catalog):
     # 2015MNRAS.449.1215P
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              '2015MNRAS.449.1215P.tsv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(file_path).rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         if row[0][0] == '#':
             continue
@@ -728,9 +669,7 @@ def do_ascii(catalog):
     # 2016MNRAS.459.3939V
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              'Valenti2016_data.txt')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter=' ', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter=' ').rows
     bandsub = {
         'BS': 'B',
         'VS': 'V',
@@ -867,9 +806,7 @@ def do_ascii(catalog):
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2011PhDT........35K-tab2.2.txt')
 
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry('SN2007ax', bibcode='2011PhDT........35K')
     for row in pbar(tsvin[1:], task_str):
         if len(row) == 1:
@@ -889,9 +826,7 @@ def do_ascii(catalog):
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2011ApJ...730..134K-tab2.txt')
 
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     name, source = catalog.new_entry('PTF10fqs', bibcode='2011ApJ...730..134K')
     for row in pbar(tsvin[1:], task_str):
         if len(row) == 1:
@@ -918,9 +853,7 @@ def do_ascii(catalog):
     datafile = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                             '2012ApJ...755..161K-tab3.txt')
 
-    tsvin = list(
-        csv.reader(
-            open(datafile, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(datafile).rows
     for row in pbar(tsvin[1:], task_str):
         if len(row) == 1:
             name, source = catalog.new_entry(
@@ -968,9 +901,7 @@ def do_ascii(catalog):
     # 2007ApJ...666.1116S
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2007ApJ...666.1116S-tab1.csv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter=' ', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter=' ').rows
     (name, source) = catalog.new_entry(
         'SN2006gy', bibcode='2007ApJ...666.1116S')
     for ri, row in enumerate(pbar(tsvin, task_str)):
@@ -994,9 +925,7 @@ def do_ascii(catalog):
     # 2015ApJ...799...51M
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2015ApJ...799...51M-tab1.tsv')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='\t', skipinitialspace=True))
+    tsvin = AsciiTable(file_path).rows
     (name, source) = catalog.new_entry(
         'SN2012ap', bibcode='2015ApJ...799...51M')
     for ri, row in enumerate(pbar(tsvin, task_str)):
@@ -1021,9 +950,7 @@ def do_ascii(catalog):
     # 2013ApJ...767...57F
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2013ApJ...767...57F.txt')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter=' ', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter=' ').rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         (name, source) = catalog.new_entry(
             row[0], bibcode='2013ApJ...767...57F')
@@ -1033,9 +960,7 @@ def do_ascii(catalog):
     # 2015MNRAS.446.3895F
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2015MNRAS.446.3895F.txt')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter=' ', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter=' ').rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         if row[0][0] == '#':
             continue
@@ -1064,9 +989,7 @@ def do_ascii(catalog):
     # 2016ApJ...832..108M
     file_path = os.path.join(catalog.get_current_task_repo(), 'ASCII',
                              '2016ApJ...832..108M.txt')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter='/', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter='/').rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         if row[0][0] == '#':
             ct = row[0].lstrip('#')
@@ -1099,9 +1022,7 @@ def do_ascii(catalog):
     # 2004ApJ...606..381L
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2004ApJ...606..381L-table3.txt')
-    tsvin = list(
-        csv.reader(
-            open(file_path, 'r'), delimiter=' ', skipinitialspace=True))
+    tsvin = AsciiTable(file_path, delimiter=' ').rows
     name = 'SN2003dh'
     (name, source) = catalog.new_entry(name, bibcode='2004ApJ...606..381L')
     instdict = {}
@@ -1151,7 +1072,8 @@ def do_ascii(catalog):
     # 2006ApJ...645..841N
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2006ApJ...645..841N-table3.csv')
-    tsvin = list(csv.reader(open(file_path, 'r'), delimiter=','))
+    tsvin = AsciiTable(
+        file_path, delimiter=',', skipinitialspace=False).rows
     for ri, row in enumerate(pbar(tsvin, task_str)):
         name = 'SNLS-' + row[0]
         name = catalog.add_entry(name)
@@ -1213,7 +1135,8 @@ def do_ascii(catalog):
     stromlobands = ['B', 'V', 'R', 'I', 'VM', 'RM']
     file_path = os.path.join(catalog.get_current_task_repo(),
                              'J_A+A_415_863-1/photometry.csv')
-    tsvin = list(csv.reader(open(file_path, 'r'), delimiter=','))
+    tsvin = AsciiTable(
+        file_path, delimiter=',', skipinitialspace=False).rows
     for row in pbar(tsvin, task_str):
         name = row[0]
         name = catalog.add_entry(name)
@@ -1248,12 +1171,7 @@ def do_ascii(catalog):
     # 2015MNRAS.449..451W
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2015MNRAS.449..451W.dat')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     for rr, row in enumerate(pbar(data, task_str)):
         if rr == 0:
             continue
@@ -1281,12 +1199,7 @@ def do_ascii(catalog):
     # 2016MNRAS.459.1039T
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2016MNRAS.459.1039T.tsv')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     name = catalog.add_entry('LSQ13zm')
     source = catalog.entries[name].add_source(bibcode='2016MNRAS.459.1039T')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
@@ -1319,12 +1232,7 @@ def do_ascii(catalog):
     # 2015ApJ...804...28G
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2015ApJ...804...28G.tsv')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     name = catalog.add_entry('PS1-13arp')
     source = catalog.entries[name].add_source(bibcode='2015ApJ...804...28G')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
@@ -1351,12 +1259,7 @@ def do_ascii(catalog):
     # 2016ApJ...819...35A
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2016ApJ...819...35A.tsv')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     for rr, row in enumerate(pbar(data, task_str)):
         if row[0][0] == '#':
             continue
@@ -1376,12 +1279,7 @@ def do_ascii(catalog):
     # 2014ApJ...784..105W
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2014ApJ...784..105W.tsv')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     for rr, row in enumerate(pbar(data, task_str)):
         if row[0][0] == '#':
             continue
@@ -1410,12 +1308,7 @@ def do_ascii(catalog):
     # 2012MNRAS.425.1007B
     file_path = os.path.join(catalog.get_current_task_repo(),
                              '2012MNRAS.425.1007B.tsv')
-    data = list(
-        csv.reader(
-            open(file_path, 'r'),
-            delimiter='\t',
-            quotechar='"',
-            skipinitialspace=True))
+    data = AsciiTable(file_path).rows
     for rr, row in enumerate(pbar(data, task_str)):
         if row[0][0] == '#':
             bands = row[2:]
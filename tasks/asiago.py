@@ -8,13 +8,13 @@ import urllib
 
 from astrocats.catalog.utils import is_number, pbar, uniq_cdl, utf8
 # from astropy.time import Time as astrotime
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
 from ..utils import clean_snname
 
 
 def do_asiago_photo(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     # response = (urllib.request
     # .urlopen('http://graspa.oapd.inaf.it/cgi-bin/sncat.php'))
@@ -134,6 +134,7 @@ def do_asiago_photo(catalog):
 
 
 def do_asiago_spectra(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     html = catalog.load_url(('http://sngroup.oapd.inaf.it./'
                              'cgi-bin/output_class.cgi?sn=1990'),
@@ -4,8 +4,6 @@ import csv
 import os
 from glob import glob
 
-from bs4 import BeautifulSoup
-
 from astrocats.catalog.utils import pbar, pbar_strings
 from decimal import Decimal
 
@@ -13,6 +11,7 @@ from ..supernova import SUPERNOVA
 
 
 def do_cccp(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     cccpbands = ['B', 'V', 'R', 'I']
     file_names = list(
@@ -3,17 +3,15 @@
 import csv
 import os
 from glob import glob
-from math import floor
 
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.utils import (is_number, jd_to_mjd, pbar, pbar_strings,
                                      uniq_cdl)
-from astropy.time import Time as astrotime
 
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
-from ..utils import clean_snname
+from ..utils import clean_snname, date_to_mjd
 
 ACKN_CFA = ("This research has made use of the CfA Supernova Archive, "
             "which is funded in part by the National Science Foundation "
@@ -216,9 +214,7 @@ def do_cfa_spectra(catalog):
                 month = fileparts[2][4:6]
                 day = fileparts[2][6:]
                 instrument = fileparts[3].split('.')[0]
-            time = str(
-                astrotime(year + '-' + month + '-' + str(floor(float(day)))
-                          .zfill(2)).mjd + float(day) - floor(float(day)))
+            time = str(date_to_mjd(year + '-' + month + '-' + day))
             f = open(fname, 'r')
             data = csv.reader(f, delimiter=' ', skipinitialspace=True)
             data = [list(i) for i in zip(*data)]
@@ -282,9 +278,7 @@ def do_cfa_spectra(catalog):
             day = fileparts[1][6:].split('.')[0]
             if len(fileparts) > 2:
                 instrument = fileparts[-1].split('.')[0]
-            time = str(
-                astrotime(year + '-' + month + '-' + str(floor(float(day)))
-                          .zfill(2)).mjd + float(day) - floor(float(day)))
+            time = str(date_to_mjd(year + '-' + month + '-' + day))
             f = open(fname, 'r')
             data = csv.reader(f, delimiter=' ', skipinitialspace=True)
             data = [list(i) for i in zip(*data)]
@@ -353,10 +347,7 @@ def do_cfa_spectra(catalog):
                 if is_number(year) and is_number(month) and is_number(day):
                     if len(fileparts) > 2:
                         instrument = fileparts[-1]
-                    time = str(
-                        astrotime(year + '-' + month + '-' + str(
-                            floor(float(day))).zfill(2)).mjd + float(day) -
-                        floor(float(day)))
+                    time = str(date_to_mjd(year + '-' + month + '-' + day))
             f = open(fname, 'r')
             data = csv.reader(f, delimiter=' ', skipinitialspace=True)
             data = [list(i) for i in zip(*data)]
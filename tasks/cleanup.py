@@ -1,574 +1,763 @@
 """Cleanup catalog before final write to disk."""
+import gzip
+import json
+import os
 import re
 import statistics
+import subprocess
 import warnings
+from itertools import islice
 from math import log10, pi, sqrt
+from multiprocessing import get_context
 
+import numpy as np
 from astrocats.catalog.quantity import QUANTITY
-from astrocats.catalog.utils import (get_sig_digits, is_number, pbar,
-                                     pretty_num, tprint, uniq_cdl)
-from astropy import units as un
-from astropy.coordinates import SkyCoord as coord
-from astropy.cosmology import Planck15 as cosmo
-from astropy.cosmology import z_at_value
+from astrocats.catalog.source import SOURCE
+from astrocats.catalog.utils import (compress_gz, get_sig_digits, is_number,
+                                     pbar, pretty_num, tprint, uniq_cdl)
 
 from decimal import Decimal
 
 from ..constants import CLIGHT, KM
 from ..supernova import SUPERNOVA
+from ..utils import angular_separations, clean_bibcode
+
+# Catalog inherited by forked cleanup workers.
+_WORKER_CATALOG = None
+
+_SOURCES_RE = re.compile(r'"sources":\s*')
+
+_DIGITS_RE = re.compile(r'\d+')
+
+# Rules deriving a quantity from an alias, in the order they are tried. Each
+# is registered with the quantity it derives ('radec' for both coordinates)
+# and the prefixes of the aliases it reads, in order. It is called with the
+# alias and the first prefix the alias starts with, then with each later one
+# the alias starts with, until it returns a value rather than None.
+_ALIAS_RULES = []
+
+
+def _alias_rule(key, *prefixes):
+    regex = re.compile('|'.join(re.escape(x) for x in prefixes))
+
+    def register(func):
+        _ALIAS_RULES.append((key, prefixes, regex, func))
+        return func
+    return register
+
+
+@_alias_rule(SUPERNOVA.DISCOVER_DATE, 'MLS', 'SSS', 'CSS', 'GRB ')
+def _yymmdd_date(alias, prefix):
+    rest = alias.replace(prefix, '')
+    if is_number(rest[:2]):
+        return '/'.join(['20' + rest[:2], rest[2:4], rest[4:6]])
+
+
+@_alias_rule(SUPERNOVA.DISCOVER_DATE,
+             'ASASSN-', 'PS1-', 'PS1', 'PS', 'iPTF', 'PTF', 'SCP-', 'SNLS-',
+             'SPIRITS', 'LSQ', 'DES', 'SNHiTS', 'Gaia', 'GND', 'GNW', 'GSD',
+             'GSW', 'EGS', 'COS', 'OGLE', 'HST')
+def _yy_date(alias, prefix):
+    rest = alias.replace(prefix, '')
+    if is_number(rest[:2]) and is_number(rest[:1]):
+        return '20' + rest[:2]
+
+
+@_alias_rule(SUPERNOVA.DISCOVER_DATE, 'SNF')
+def _yyyymmdd_date(alias, prefix):
+    rest = alias.replace(prefix, '')
+    if is_number(rest[:4]):
+        return '/'.join([rest[:4], rest[4:6], rest[6:8]])
+
+
+@_alias_rule(SUPERNOVA.DISCOVER_DATE, 'PTFS', 'SNSDF')
+def _yymm_date(alias, prefix):
+    rest = alias.replace(prefix, '')
+    if is_number(rest[:2]):
+        return '/'.join(['20' + rest[:2], rest[2:4]])
+
+
+@_alias_rule(SUPERNOVA.DISCOVER_DATE, 'AT', 'SN', 'OGLE-', 'SM ', 'KSN')
+def _year_date(alias, prefix):
+    year = _DIGITS_RE.findall(alias)
+    if len(year) != 1:
+        return None
+    year = year[0]
+    if alias.replace(prefix, '').index(year) != 0:
+        return None
+    if year and is_number(year) and '.' not in year and len(year) <= 4:
+        return year
+
+
+@_alias_rule('radec', 'PSN J', 'MASJ', 'CSS', 'SSS', 'MASTER OT J', 'HST J',
+             'TCP J', 'MACS J', '2MASS J', 'EQ J', 'CRTS J', 'SMT J')
+def _name_radec(alias, prefix):
+    if not is_number(alias.replace(prefix, '')[:6]):
+        return None
+    noprefix = alias.split(':')[-1].replace(prefix, '').replace('.', '')
+    decsign = '+' if '+' in noprefix else '-'
+    noprefix = noprefix.replace('+', '|').replace('-', '|')
+    nops = noprefix.split('|')
+    if len(nops) < 2:
+        return None
+    rastr = nops[0]
+    decstr = nops[1]
+    ra = ':'.join([rastr[:2], rastr[2:4], rastr[4:6]]) + \
+        ('.' + rastr[6:] if len(rastr) > 6 else '')
+    dec = (
+        decsign + ':'.join([decstr[:2], decstr[2:4], decstr[4:6]]) +
+        ('.' + decstr[6:] if len(decstr) > 6 else ''))
+    return ra, dec
+
+
+def _alias_values(rule, aliases):
+    """Yield the value derived by `rule`, one of `_ALIAS_RULES`, from each of
+    `aliases` in turn, or None.
+
+    The anchored pattern of the rule finds the first of its prefixes that
+    the alias starts with, so aliases with none are passed over at once.
+    """
+    key, prefixes, regex, func = rule
+    for alias in aliases:
+        value = None
+        match = regex.match(alias)
+        if match is not None:
+            for prefix in prefixes[prefixes.index(match.group()):]:
+                if alias.startswith(prefix):
+                    value = func(alias, prefix)
+                    if value is not None:
+                        break
+        yield value
 
 
 def do_cleanup(catalog):
-    """Cleanup catalog after importing all data."""
+    """Cleanup catalog after importing all data.
+
+    Entries are cleaned across `CLEANUP_PROCESSES` processes of the catalog,
+    or `ASTROCATS_CLEANUP_PROCESSES` if set.
+    """
     task_str = catalog.get_current_task_str()
 
     # Set preferred names, calculate some columns based on imported data,
     # sanitize some fields
     keys = list(catalog.entries.keys())
 
+    _sample_dust_map(catalog, keys)
+    _prefetch_bibauthors(catalog)
+
+    processes = int(os.environ.get('ASTROCATS_CLEANUP_PROCESSES',
+                                   catalog.CLEANUP_PROCESSES))
+    if processes > 1 and not catalog.args.travis:
+        _parallel_cleanup(catalog, keys, processes, task_str)
+        catalog.save_caches()
+        return
+
     cleanupcnt = 0
     for oname in pbar(keys, task_str):
-        # Some events may be merged in cleanup process, skip them if
-        # non-existent.
+        name = _cleanup_entry(catalog, oname)
+        if name is None:
+            continue
+        for save_name in _journal_entries(catalog):
+            _compress_entry_file(catalog, save_name)
+        cleanupcnt = cleanupcnt + 1
+        if catalog.args.travis and cleanupcnt % 1000 == 0:
+            break
+
+    catalog.save_caches()
+
+    return
+
+
+def _sample_dust_map(catalog, keys):
+    """Fill `extinctions_dict` from the local dust maps, if they are used,
+    for every entry whose stub already has coordinates, in a single
+    vectorized lookup.
+    """
+    if not catalog.use_dust_map():
+        return
+    names = [
+        x for x in keys
+        if x not in catalog.extinctions_dict and
+        SUPERNOVA.RA in catalog.entries[x] and
+        SUPERNOVA.DEC in catalog.entries[x]
+    ]
+    results = catalog.dust_map.query(
+        [catalog.entries[x][SUPERNOVA.RA][0][QUANTITY.VALUE] for x in names],
+        [catalog.entries[x][SUPERNOVA.DEC][0][QUANTITY.VALUE] for x in names])
+    for name, result in zip(names, results):
+        if result is not None:
+            catalog.extinctions_dict[name] = result
+
+
+def _prefetch_bibauthors(catalog):
+    """Resolve the authors of every bibcode cited by an entry on disk in one
+    concurrent pass, so that `sanitize` only needs to look them up.
+
+    Only the source list of each file is decoded. As no JSON string holds an
+    unescaped quote, the first `"sources":` in a file is the list's key.
+    """
+    decoder = json.JSONDecoder()
+    bibcodes = []
+    for fname in catalog.PATHS.get_repo_output_file_list():
+        opener = gzip.open if fname.endswith('.gz') else open
+        with opener(fname, 'rt', encoding='utf8') as f:
+            text = f.read()
+        match = _SOURCES_RE.search(text)
+        if match is None:
+            continue
         try:
-            name = catalog.add_entry(oname)
-        except Exception:
-            catalog.log.warning(
-                '"{}" was not found, suggests merge occurred in cleanup '
-                'process.'.format(oname))
+            sources = decoder.raw_decode(text, match.end())[0]
+        except ValueError:
             continue
+        bibcodes.extend(
+            clean_bibcode(x[SOURCE.BIBCODE], catalog.biberror_dict)
+            for x in sources
+            if isinstance(x, dict) and SOURCE.BIBCODE in x)
+    catalog.load_bibauthors(bibcodes)
 
-        # Set the preferred name, switching to that name if name changed.
-        name = catalog.entries[name].set_preferred_name()
-
-        aliases = catalog.entries[name].get_aliases()
-        catalog.entries[name].purge_bandless_photometry()
-        catalog.entries[name].set_first_max_light()
-
-        if SUPERNOVA.DISCOVER_DATE not in catalog.entries[name]:
-            prefixes = ['MLS', 'SSS', 'CSS', 'GRB ']
-            for alias in aliases:
-                for prefix in prefixes:
-                    if (alias.startswith(prefix) and
-                            is_number(alias.replace(prefix, '')[:2])):
-                        discoverdate = ('/'.join([
-                            '20' + alias.replace(prefix, '')[:2],
-                            alias.replace(prefix, '')[2:4],
-                            alias.replace(prefix, '')[4:6]
-                        ]))
-                        if catalog.args.verbose:
-                            tprint('Added discoverdate from name [' + alias +
-                                   ']: ' + discoverdate)
-                        source = catalog.entries[name].add_self_source()
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.DISCOVER_DATE,
-                            discoverdate,
-                            source,
-                            derived=True)
-                        break
-                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
-                    break
-        if SUPERNOVA.DISCOVER_DATE not in catalog.entries[name]:
-            prefixes = [
-                'ASASSN-', 'PS1-', 'PS1', 'PS', 'iPTF', 'PTF', 'SCP-', 'SNLS-',
-                'SPIRITS', 'LSQ', 'DES', 'SNHiTS', 'Gaia', 'GND', 'GNW', 'GSD',
-                'GSW', 'EGS', 'COS', 'OGLE', 'HST'
-            ]
-            for alias in aliases:
-                for prefix in prefixes:
-                    if (alias.startswith(prefix) and
-                            is_number(alias.replace(prefix, '')[:2]) and
-                            is_number(alias.replace(prefix, '')[:1])):
-                        discoverdate = '20' + alias.replace(prefix, '')[:2]
-                        if catalog.args.verbose:
-                            tprint('Added discoverdate from name [' + alias +
-                                   ']: ' + discoverdate)
-                        source = catalog.entries[name].add_self_source()
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.DISCOVER_DATE,
-                            discoverdate,
-                            source,
-                            derived=True)
-                        break
-                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
-                    break
-        if SUPERNOVA.DISCOVER_DATE not in catalog.entries[name]:
-            prefixes = ['SNF']
-            for alias in aliases:
-                for prefix in prefixes:
-                    if (alias.startswith(prefix) and
-                            is_number(alias.replace(prefix, '')[:4])):
-                        discoverdate = ('/'.join([
-                            alias.replace(prefix, '')[:4],
-                            alias.replace(prefix, '')[4:6],
-                            alias.replace(prefix, '')[6:8]
-                        ]))
-                        if catalog.args.verbose:
-                            tprint('Added discoverdate from name [' + alias +
-                                   ']: ' + discoverdate)
-                        source = catalog.entries[name].add_self_source()
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.DISCOVER_DATE,
-                            discoverdate,
-                            source,
-                            derived=True)
-                        break
-                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
-                    break
-        if SUPERNOVA.DISCOVER_DATE not in catalog.entries[name]:
-            prefixes = ['PTFS', 'SNSDF']
-            for alias in aliases:
-                for prefix in prefixes:
-                    if (alias.startswith(prefix) and
-                            is_number(alias.replace(prefix, '')[:2])):
-                        discoverdate = ('/'.join([
-                            '20' + alias.replace(prefix, '')[:2],
-                            alias.replace(prefix, '')[2:4]
-                        ]))
-                        if catalog.args.verbose:
-                            tprint('Added discoverdate from name [' + alias +
-                                   ']: ' + discoverdate)
-                        source = catalog.entries[name].add_self_source()
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.DISCOVER_DATE,
-                            discoverdate,
-                            source,
-                            derived=True)
-                        break
-                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
-                    break
-        if SUPERNOVA.DISCOVER_DATE not in catalog.entries[name]:
-            prefixes = ['AT', 'SN', 'OGLE-', 'SM ', 'KSN']
-            for alias in aliases:
-                for prefix in prefixes:
-                    if alias.startswith(prefix):
-                        year = re.findall(r'\d+', alias)
-                        if len(year) == 1:
-                            year = year[0]
-                        else:
-                            continue
-                        if alias.replace(prefix, '').index(year) != 0:
-                            continue
-                        if (year and is_number(year) and '.' not in year and
-                                len(year) <= 4):
-                            discoverdate = year
-                            if catalog.args.verbose:
-                                tprint('Added discoverdate from name [' +
-                                       alias + ']: ' + discoverdate)
-                            source = catalog.entries[name].add_self_source()
-                            catalog.entries[name].add_quantity(
-                                SUPERNOVA.DISCOVER_DATE,
-                                discoverdate,
-                                source,
-                                derived=True)
-                            break
-                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
-                    break
 
-        if (SUPERNOVA.RA not in catalog.entries[name] or
-                SUPERNOVA.DEC not in catalog.entries[name]):
-            prefixes = [
-                'PSN J', 'MASJ', 'CSS', 'SSS', 'MASTER OT J', 'HST J', 'TCP J',
-                'MACS J', '2MASS J', 'EQ J', 'CRTS J', 'SMT J'
-            ]
-            for alias in aliases:
-                for prefix in prefixes:
-                    if (alias.startswith(prefix) and
-                            is_number(alias.replace(prefix, '')[:6])):
-                        noprefix = alias.split(':')[-1].replace(
-                            prefix, '').replace('.', '')
-                        decsign = '+' if '+' in noprefix else '-'
-                        noprefix = noprefix.replace('+', '|').replace('-', '|')
-                        nops = noprefix.split('|')
-                        if len(nops) < 2:
-                            continue
-                        rastr = nops[0]
-                        decstr = nops[1]
-                        ra = ':'.join([rastr[:2], rastr[2:4], rastr[4:6]]) + \
-                            ('.' + rastr[6:] if len(rastr) > 6 else '')
-                        dec = (
-                            decsign + ':'.join(
-                                [decstr[:2], decstr[2:4], decstr[4:6]]) +
-                            ('.' + decstr[6:] if len(decstr) > 6 else ''))
-                        if catalog.args.verbose:
-                            tprint('Added ra/dec from name: ' + ra + ' ' + dec)
-                        source = catalog.entries[name].add_self_source()
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.RA, ra, source, derived=True)
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.DEC, dec, source, derived=True)
-                        break
-                if SUPERNOVA.RA in catalog.entries[name]:
-                    break
+def _parallel_cleanup(catalog, keys, processes, task_str):
+    """Cleanup entries in forked worker processes.
 
-        no_host = (SUPERNOVA.HOST not in catalog.entries[name] or not any([
-            x[QUANTITY.VALUE] == 'Milky Way'
-            for x in catalog.entries[name][SUPERNOVA.HOST]
-        ]))
-        if (SUPERNOVA.RA in catalog.entries[name] and
-                SUPERNOVA.DEC in catalog.entries[name] and no_host):
-            from astroquery.irsa_dust import IrsaDust
-            if name not in catalog.extinctions_dict:
-                try:
-                    ra_dec = catalog.entries[name][
-                        SUPERNOVA.RA][0][QUANTITY.VALUE] + \
-                        " " + \
-                        catalog.entries[name][SUPERNOVA.DEC][0][QUANTITY.VALUE]
-                    result = IrsaDust.get_query_table(ra_dec, section='ebv')
-                except (KeyboardInterrupt, SystemExit):
-                    raise
-                except Exception:
-                    warnings.warn("Coordinate lookup for " + name +
-                                  " failed in IRSA.")
-                else:
-                    ebv = result['ext SandF mean'][0]
-                    ebverr = result['ext SandF std'][0]
-                    catalog.extinctions_dict[name] = [ebv, ebverr]
-            if name in catalog.extinctions_dict:
-                sources = uniq_cdl([
-                    catalog.entries[name].add_self_source(),
-                    catalog.entries[name]
-                    .add_source(bibcode='2011ApJ...737..103S')
-                ])
-                (catalog.entries[name].add_quantity(
-                    SUPERNOVA.EBV,
-                    str(catalog.extinctions_dict[name][0]),
-                    sources,
-                    e_value=str(catalog.extinctions_dict[name][1]),
-                    derived=True))
-        if ((SUPERNOVA.HOST in catalog.entries[name] and
-             (SUPERNOVA.HOST_RA not in catalog.entries[name] or
-              SUPERNOVA.HOST_DEC not in catalog.entries[name]))):
-            for host in catalog.entries[name][SUPERNOVA.HOST]:
-                alias = host[QUANTITY.VALUE]
-                if ' J' in alias and is_number(alias.split(' J')[-1][:6]):
-                    noprefix = alias.split(' J')[-1].split(':')[-1].replace(
-                        '.', '')
-                    decsign = '+' if '+' in noprefix else '-'
-                    noprefix = noprefix.replace('+', '|').replace('-', '|')
-                    nops = noprefix.split('|')
-                    if len(nops) < 2:
-                        continue
-                    rastr = nops[0]
-                    decstr = nops[1]
-                    hostra = (':'.join([rastr[:2], rastr[2:4], rastr[4:6]]) +
-                              ('.' + rastr[6:] if len(rastr) > 6 else ''))
-                    hostdec = decsign + ':'.join([
-                        decstr[:2], decstr[2:4], decstr[4:6]
-                    ]) + ('.' + decstr[6:] if len(decstr) > 6 else '')
+    Entries renamed by `set_preferred_name`, and the entries they are merged
+    into, depend on one another and are cleaned in this process in the same
+    order as a serial run. All other entries are independent and are
+    cleaned by the workers, which keep their additions to the shared caches
+    in memory. Those are replayed here in key order, so that the cache
+    files match a serial run too. `scripts/cleanupcheck.py` compares
+    the two modes.
+    """
+    global _WORKER_CATALOG
+    _WORKER_CATALOG = catalog
+    caches = (catalog.bibauthor_dict, catalog.extinctions_dict)
+    # Read the caches before forking, so that no worker reads (and repairs)
+    # a journal this process is writing.
+    for cache in caches + (catalog.stub_index,):
+        cache.load()
+    additions = {}
+    compress = []
+    chunksize = max(1, min(50, len(keys) // (4 * processes)))
+
+    with get_context('fork').Pool(processes, _init_worker) as pool:
+        preferred = dict(pool.imap(_preferred_name_worker, keys, chunksize))
+        coupled = set(x for x in keys if preferred[x] != x)
+        coupled.update(set(preferred[x] for x in coupled).intersection(keys))
+        independent = [x for x in keys if x not in coupled]
+        for oname, added, save_names in pbar(
+                pool.imap(_cleanup_worker, independent, chunksize),
+                task_str, total=len(independent)):
+            additions[oname] = added
+            compress.extend(save_names)
+    _WORKER_CATALOG = None
+
+    # Compress oversized files here so that only one process touches the
+    # git index.
+    for save_name in compress:
+        _compress_entry_file(catalog, save_name)
+
+    for oname in [x for x in keys if x in coupled]:
+        lens = [len(x) for x in caches]
+        name = _cleanup_entry(catalog, oname)
+        additions[oname] = _cache_additions(caches, lens)
+        if name is not None:
+            for save_name in _journal_entries(catalog):
+                _compress_entry_file(catalog, save_name)
+
+    # Replay the cache additions in key order, as a serial run makes them.
+    for ci, cache in enumerate(caches):
+        replayed = set()
+        for oname in keys:
+            for key, val in additions.get(oname, ((), ()))[ci]:
+                if key in replayed:
+                    continue
+                replayed.add(key)
+                if key in cache:
+                    cache.move_to_end(key)
+                cache[key] = val
+
+
+def _cache_additions(caches, lens):
+    """Return the items added to each cache since it had length `lens`."""
+    return [list(islice(c.items(), n, None)) for c, n in zip(caches, lens)]
+
+
+def _init_worker():
+    """Keep the cache changes of a worker process out of the journals.
+
+    The files saved by workers are left unrecorded in `stub_index`, which
+    reads them again the next time stubs are loaded.
+    """
+    catalog = _WORKER_CATALOG
+    for cache in (catalog.bibauthor_dict, catalog.extinctions_dict,
+                  catalog.stub_index):
+        cache.journaled = False
+
+
+def _preferred_name_worker(oname):
+    """Return `oname` with the preferred name of the entry it would load,
+    or `None` if `add_entry` would not simply load `oname` from disk.
+    """
+    catalog = _WORKER_CATALOG
+    if (catalog.clean_entry_name(oname) != oname or
+            catalog.find_entry_name_of_alias(oname) not in (None, oname)):
+        return oname, None
+    entry = catalog.proto.init_from_file(catalog, name=oname)
+    if entry is None:
+        return oname, None
+    return oname, entry._get_preferred_name()
+
+
+def _cleanup_worker(oname):
+    """Cleanup and save one independent entry inside a worker process.
+
+    Returns the cache additions made and the paths of the saved files that
+    need compressing.
+    """
+    catalog = _WORKER_CATALOG
+    caches = (catalog.bibauthor_dict, catalog.extinctions_dict)
+    lens = [len(x) for x in caches]
+    name = _cleanup_entry(catalog, oname)
+    save_names = []
+    if name is not None:
+        save_names = _journal_entries(catalog)
+    return oname, _cache_additions(caches, lens), save_names
+
+
+def _journal_entries(catalog):
+    """Save and stub the loaded entries with `journal_entries(bury=True,
+    final=True)`, returning the paths of the saved files that need
+    compressing.
+    """
+    # `Supernova.save` sets `filename` to the file each entry is saved to.
+    entries = [x for x in catalog.entries.values() if not x._stub]
+    for entry in entries:
+        entry.filename = None
+    catalog.journal_entries(bury=True, final=True)
+    return [x.filename for x in entries if x.filename is not None and
+            os.path.getsize(x.filename) > catalog.COMPRESS_ABOVE_FILESIZE]
+
+
+def _compress_entry_file(catalog, save_name):
+    """Compress the saved entry file `save_name`, replacing it by the
+    compressed file in the index of its git repository, as
+    `journal_entries(gz=True)` does.
+    """
+    save_name = compress_gz(save_name)
+    catalog.log.debug("Compressed '{}'".format(save_name))
+    outdir, filename = os.path.split(save_name)
+    filename = filename.split('.')[0]
+    subprocess.call(['git', 'rm', '--cached', filename + '.json'],
+                    cwd=outdir)
+    subprocess.call(['git', 'add', '-f', filename + '.json.gz'], cwd=outdir)
+
+
+def _cleanup_entry(catalog, oname):
+    """Cleanup a single entry, returning its (possibly new) name."""
+    # Some events may be merged in cleanup process, skip them if
+    # non-existent.
+    try:
+        name = catalog.add_entry(oname)
+    except Exception:
+        catalog.log.warning(
+            '"{}" was not found, suggests merge occurred in cleanup '
+            'process.'.format(oname))
+        return None
+
+    # Set the preferred name, switching to that name if name changed.
+    name = catalog.entries[name].set_preferred_name()
+
+    aliases = catalog.entries[name].get_aliases()
+    catalog.entries[name].purge_bandless_photometry()
+    catalog.entries[name].set_first_max_light()
+
+    # Derive a discovery date, then coordinates, from the aliases, trying
+    # each rule in turn until the entry has them.
+    for rule in _ALIAS_RULES:
+        if rule[0] == SUPERNOVA.DISCOVER_DATE:
+            if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
+                continue
+            for alias, discoverdate in zip(
+                    aliases, _alias_values(rule, aliases)):
+                if discoverdate is None:
+                    continue
+                if catalog.args.verbose:
+                    tprint('Added discoverdate from name [' + alias +
+                           ']: ' + discoverdate)
+                source = catalog.entries[name].add_self_source()
+                catalog.entries[name].add_quantity(
+                    SUPERNOVA.DISCOVER_DATE,
+                    discoverdate,
+                    source,
+                    derived=True)
+                if SUPERNOVA.DISCOVER_DATE in catalog.entries[name]:
+                    break
+        elif (SUPERNOVA.RA not in catalog.entries[name] or
+              SUPERNOVA.DEC not in catalog.entries[name]):
+            for alias, radec in zip(aliases, _alias_values(rule, aliases)):
+                if radec is not None:
+                    ra, dec = radec
                     if catalog.args.verbose:
-                        tprint('Added hostra/hostdec from name: ' + hostra +
-                               ' ' + hostdec)
+                        tprint('Added ra/dec from name: ' + ra + ' ' + dec)
                     source = catalog.entries[name].add_self_source()
                     catalog.entries[name].add_quantity(
-                        SUPERNOVA.HOST_RA, hostra, source, derived=True)
+                        SUPERNOVA.RA, ra, source, derived=True)
                     catalog.entries[name].add_quantity(
-                        SUPERNOVA.HOST_DEC, hostdec, source, derived=True)
-                    break
-                if SUPERNOVA.HOST_RA in catalog.entries[name]:
+                        SUPERNOVA.DEC, dec, source, derived=True)
+                if SUPERNOVA.RA in catalog.entries[name]:
                     break
 
-        if (SUPERNOVA.REDSHIFT not in catalog.entries[name] and
-                SUPERNOVA.VELOCITY in catalog.entries[name]):
-            # Find the "best" velocity to use for this
-            bestsig = 0
-            for hv in catalog.entries[name][SUPERNOVA.VELOCITY]:
-                sig = get_sig_digits(hv[QUANTITY.VALUE])
-                if sig > bestsig:
-                    besthv = hv[QUANTITY.VALUE]
-                    bestsrc = hv['source']
-                    bestsig = sig
-            if bestsig > 0 and is_number(besthv):
-                voc = float(besthv) * 1.e5 / CLIGHT
-                source = catalog.entries[name].add_self_source()
-                sources = uniq_cdl([source] + bestsrc.split(','))
-                (catalog.entries[name].add_quantity(
-                    SUPERNOVA.REDSHIFT,
-                    pretty_num(
-                        sqrt((1. + voc) / (1. - voc)) - 1., sig=bestsig),
-                    sources,
-                    kind='heliocentric',
-                    derived=True))
-        if (SUPERNOVA.REDSHIFT not in catalog.entries[name] and
-                len(catalog.nedd_dict) > 0 and
-                SUPERNOVA.HOST in catalog.entries[name]):
-            reference = "NED-D"
-            refurl = "http://ned.ipac.caltech.edu/Library/Distances/"
-            refbib = "1991ASSL..171...89H"
-            for host in catalog.entries[name][SUPERNOVA.HOST]:
-                if host[QUANTITY.VALUE] in catalog.nedd_dict:
-                    source = catalog.entries[name].add_source(
-                        bibcode='2016A&A...594A..13P')
-                    secondarysource = catalog.entries[name].add_source(
-                        name=reference, url=refurl, bibcode=refbib,
-                        secondary=True)
-                    meddist = statistics.median(catalog.nedd_dict[host[
-                        QUANTITY.VALUE]])
-                    redz = z_at_value(cosmo.comoving_distance,
-                                      float(meddist) * un.Mpc)
-                    redshift = pretty_num(
-                        redz, sig=get_sig_digits(str(meddist)))
-                    catalog.entries[name].add_quantity(
-                        [SUPERNOVA.REDSHIFT, SUPERNOVA.HOST_REDSHIFT],
-                        redshift,
-                        uniq_cdl([source, secondarysource]),
-                        kind='host',
-                        derived=True)
-        if (SUPERNOVA.MAX_ABS_MAG not in catalog.entries[name] and
-                SUPERNOVA.MAX_APP_MAG in catalog.entries[name] and
-                SUPERNOVA.LUM_DIST in catalog.entries[name]):
-            # Find the "best" distance to use for this
-            bestsig = 0
-            for ld in catalog.entries[name][SUPERNOVA.LUM_DIST]:
-                sig = get_sig_digits(ld[QUANTITY.VALUE])
-                if sig > bestsig:
-                    bestld = ld[QUANTITY.VALUE]
-                    bestsrc = ld[QUANTITY.SOURCE]
-                    bestsig = sig
-            if bestsig > 0 and is_number(bestld) and float(bestld) > 0.:
+    no_host = (SUPERNOVA.HOST not in catalog.entries[name] or not any([
+        x[QUANTITY.VALUE] == 'Milky Way'
+        for x in catalog.entries[name][SUPERNOVA.HOST]
+    ]))
+    if (SUPERNOVA.RA in catalog.entries[name] and
+            SUPERNOVA.DEC in catalog.entries[name] and no_host):
+        if (name not in catalog.extinctions_dict and
+                catalog.use_dust_map()):
+            result = catalog.dust_map.query(
+                [catalog.entries[name][SUPERNOVA.RA][0][QUANTITY.VALUE]],
+                [catalog.entries[name][SUPERNOVA.DEC][0][QUANTITY.VALUE]])[0]
+            if result is not None:
+                catalog.extinctions_dict[name] = result
+        if name not in catalog.extinctions_dict:
+            from astroquery.irsa_dust import IrsaDust
+            try:
+                ra_dec = catalog.entries[name][
+                    SUPERNOVA.RA][0][QUANTITY.VALUE] + \
+                    " " + \
+                    catalog.entries[name][SUPERNOVA.DEC][0][QUANTITY.VALUE]
+                result = IrsaDust.get_query_table(ra_dec, section='ebv')
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                warnings.warn("Coordinate lookup for " + name +
+                              " failed in IRSA.")
+            else:
+                ebv = result['ext SandF mean'][0]
+                ebverr = result['ext SandF std'][0]
+                catalog.extinctions_dict[name] = [ebv, ebverr]
+        if name in catalog.extinctions_dict:
+            sources = uniq_cdl([
+                catalog.entries[name].add_self_source(),
+                catalog.entries[name]
+                .add_source(bibcode='2011ApJ...737..103S')
+            ])
+            (catalog.entries[name].add_quantity(
+                SUPERNOVA.EBV,
+                str(catalog.extinctions_dict[name][0]),
+                sources,
+                e_value=str(catalog.extinctions_dict[name][1]),
+                derived=True))
+    if ((SUPERNOVA.HOST in catalog.entries[name] and
+         (SUPERNOVA.HOST_RA not in catalog.entries[name] or
+          SUPERNOVA.HOST_DEC not in catalog.entries[name]))):
+        for host in catalog.entries[name][SUPERNOVA.HOST]:
+            alias = host[QUANTITY.VALUE]
+            if ' J' in alias and is_number(alias.split(' J')[-1][:6]):
+                noprefix = alias.split(' J')[-1].split(':')[-1].replace(
+                    '.', '')
+                decsign = '+' if '+' in noprefix else '-'
+                noprefix = noprefix.replace('+', '|').replace('-', '|')
+                nops = noprefix.split('|')
+                if len(nops) < 2:
+                    continue
+                rastr = nops[0]
+                decstr = nops[1]
+                hostra = (':'.join([rastr[:2], rastr[2:4], rastr[4:6]]) +
+                          ('.' + rastr[6:] if len(rastr) > 6 else ''))
+                hostdec = decsign + ':'.join([
+                    decstr[:2], decstr[2:4], decstr[4:6]
+                ]) + ('.' + decstr[6:] if len(decstr) > 6 else '')
+                if catalog.args.verbose:
+                    tprint('Added hostra/hostdec from name: ' + hostra +
+                           ' ' + hostdec)
                 source = catalog.entries[name].add_self_source()
-                sources = uniq_cdl([source] + bestsrc.split(','))
-                bestldz = z_at_value(cosmo.luminosity_distance,
-                                     float(bestld) * un.Mpc)
-                pnum = (
-                    float(catalog.entries[name][SUPERNOVA.MAX_APP_MAG][0][
-                        QUANTITY.VALUE]) - 5.0 *
-                    (log10(float(bestld) * 1.0e6) - 1.0
-                     ) + 2.5 * log10(1.0 + bestldz))
-                pnum = pretty_num(pnum, sig=bestsig + 1)
                 catalog.entries[name].add_quantity(
-                    SUPERNOVA.MAX_ABS_MAG, pnum, sources, derived=True)
-        if (SUPERNOVA.MAX_VISUAL_ABS_MAG not in catalog.entries[name] and
-                SUPERNOVA.MAX_VISUAL_APP_MAG in catalog.entries[name] and
-                SUPERNOVA.LUM_DIST in catalog.entries[name]):
-            # Find the "best" distance to use for this
-            bestsig = 0
-            for ld in catalog.entries[name][SUPERNOVA.LUM_DIST]:
-                sig = get_sig_digits(ld[QUANTITY.VALUE])
-                if sig > bestsig:
-                    bestld = ld[QUANTITY.VALUE]
-                    bestsrc = ld[QUANTITY.SOURCE]
-                    bestsig = sig
-            if bestsig > 0 and is_number(bestld) and float(bestld) > 0.:
+                    SUPERNOVA.HOST_RA, hostra, source, derived=True)
+                catalog.entries[name].add_quantity(
+                    SUPERNOVA.HOST_DEC, hostdec, source, derived=True)
+                break
+            if SUPERNOVA.HOST_RA in catalog.entries[name]:
+                break
+
+    if (SUPERNOVA.REDSHIFT not in catalog.entries[name] and
+            SUPERNOVA.VELOCITY in catalog.entries[name]):
+        # Find the "best" velocity to use for this
+        bestsig = 0
+        for hv in catalog.entries[name][SUPERNOVA.VELOCITY]:
+            sig = get_sig_digits(hv[QUANTITY.VALUE])
+            if sig > bestsig:
+                besthv = hv[QUANTITY.VALUE]
+                bestsrc = hv['source']
+                bestsig = sig
+        if bestsig > 0 and is_number(besthv):
+            voc = float(besthv) * 1.e5 / CLIGHT
+            source = catalog.entries[name].add_self_source()
+            sources = uniq_cdl([source] + bestsrc.split(','))
+            (catalog.entries[name].add_quantity(
+                SUPERNOVA.REDSHIFT,
+                pretty_num(
+                    sqrt((1. + voc) / (1. - voc)) - 1., sig=bestsig),
+                sources,
+                kind='heliocentric',
+                derived=True))
+    if (SUPERNOVA.REDSHIFT not in catalog.entries[name] and
+            len(catalog.nedd_dict) > 0 and
+            SUPERNOVA.HOST in catalog.entries[name]):
+        reference = "NED-D"
+        refurl = "http://ned.ipac.caltech.edu/Library/Distances/"
+        refbib = "1991ASSL..171...89H"
+        for host in catalog.entries[name][SUPERNOVA.HOST]:
+            if host[QUANTITY.VALUE] in catalog.nedd_dict:
+                source = catalog.entries[name].add_source(
+                    bibcode='2016A&A...594A..13P')
+                secondarysource = catalog.entries[name].add_source(
+                    name=reference, url=refurl, bibcode=refbib,
+                    secondary=True)
+                meddist = statistics.median(catalog.nedd_dict[host[
+                    QUANTITY.VALUE]])
+                redz = catalog.cosmology.z_at_comoving_distance(
+                    float(meddist))
+                redshift = pretty_num(
+                    redz, sig=get_sig_digits(str(meddist)))
+                catalog.entries[name].add_quantity(
+                    [SUPERNOVA.REDSHIFT, SUPERNOVA.HOST_REDSHIFT],
+                    redshift,
+                    uniq_cdl([source, secondarysource]),
+                    kind='host',
+                    derived=True)
+    if (SUPERNOVA.MAX_ABS_MAG not in catalog.entries[name] and
+            SUPERNOVA.MAX_APP_MAG in catalog.entries[name] and
+            SUPERNOVA.LUM_DIST in catalog.entries[name]):
+        # Find the "best" distance to use for this
+        bestsig = 0
+        for ld in catalog.entries[name][SUPERNOVA.LUM_DIST]:
+            sig = get_sig_digits(ld[QUANTITY.VALUE])
+            if sig > bestsig:
+                bestld = ld[QUANTITY.VALUE]
+                bestsrc = ld[QUANTITY.SOURCE]
+                bestsig = sig
+        if bestsig > 0 and is_number(bestld) and float(bestld) > 0.:
+            source = catalog.entries[name].add_self_source()
+            sources = uniq_cdl([source] + bestsrc.split(','))
+            bestldz = catalog.cosmology.z_at_luminosity_distance(
+                float(bestld))
+            pnum = (
+                float(catalog.entries[name][SUPERNOVA.MAX_APP_MAG][0][
+                    QUANTITY.VALUE]) - 5.0 *
+                (log10(float(bestld) * 1.0e6) - 1.0
+                 ) + 2.5 * log10(1.0 + bestldz))
+            pnum = pretty_num(pnum, sig=bestsig + 1)
+            catalog.entries[name].add_quantity(
+                SUPERNOVA.MAX_ABS_MAG, pnum, sources, derived=True)
+    if (SUPERNOVA.MAX_VISUAL_ABS_MAG not in catalog.entries[name] and
+            SUPERNOVA.MAX_VISUAL_APP_MAG in catalog.entries[name] and
+            SUPERNOVA.LUM_DIST in catalog.entries[name]):
+        # Find the "best" distance to use for this
+        bestsig = 0
+        for ld in catalog.entries[name][SUPERNOVA.LUM_DIST]:
+            sig = get_sig_digits(ld[QUANTITY.VALUE])
+            if sig > bestsig:
+                bestld = ld[QUANTITY.VALUE]
+                bestsrc = ld[QUANTITY.SOURCE]
+                bestsig = sig
+        if bestsig > 0 and is_number(bestld) and float(bestld) > 0.:
+            source = catalog.entries[name].add_self_source()
+            sources = uniq_cdl([source] + bestsrc.split(','))
+            # FIX: what's happening here?!
+            pnum = (
+                float(catalog.entries[name][
+                    SUPERNOVA.MAX_VISUAL_APP_MAG][0][QUANTITY.VALUE]) -
+                5.0 * (log10(float(bestld) * 1.0e6) - 1.0))
+            pnum = pretty_num(pnum, sig=bestsig + 1)
+            catalog.entries[name].add_quantity(
+                SUPERNOVA.MAX_VISUAL_ABS_MAG, pnum, sources, derived=True)
+    if SUPERNOVA.REDSHIFT in catalog.entries[name]:
+        # Find the "best" redshift to use for this
+        bestz, bestkind, bestsig, bestsrc = catalog.entries[
+            name].get_best_redshift()
+        if bestsig > 0:
+            try:
+                bestz = float(bestz)
+            except Exception:
+                print(catalog.entries[name])
+                raise
+            if SUPERNOVA.VELOCITY not in catalog.entries[name]:
                 source = catalog.entries[name].add_self_source()
-                sources = uniq_cdl([source] + bestsrc.split(','))
                 # FIX: what's happening here?!
-                pnum = (
-                    float(catalog.entries[name][
-                        SUPERNOVA.MAX_VISUAL_APP_MAG][0][QUANTITY.VALUE]) -
-                    5.0 * (log10(float(bestld) * 1.0e6) - 1.0))
-                pnum = pretty_num(pnum, sig=bestsig + 1)
+                pnum = CLIGHT / KM * \
+                    ((bestz + 1.)**2. - 1.) / ((bestz + 1.)**2. + 1.)
+                pnum = pretty_num(pnum, sig=bestsig)
                 catalog.entries[name].add_quantity(
-                    SUPERNOVA.MAX_VISUAL_ABS_MAG, pnum, sources, derived=True)
-        if SUPERNOVA.REDSHIFT in catalog.entries[name]:
-            # Find the "best" redshift to use for this
-            bestz, bestkind, bestsig, bestsrc = catalog.entries[
-                name].get_best_redshift()
-            if bestsig > 0:
-                try:
-                    bestz = float(bestz)
-                except Exception:
-                    print(catalog.entries[name])
-                    raise
-                if SUPERNOVA.VELOCITY not in catalog.entries[name]:
-                    source = catalog.entries[name].add_self_source()
-                    # FIX: what's happening here?!
-                    pnum = CLIGHT / KM * \
-                        ((bestz + 1.)**2. - 1.) / ((bestz + 1.)**2. + 1.)
-                    pnum = pretty_num(pnum, sig=bestsig)
+                    SUPERNOVA.VELOCITY,
+                    pnum,
+                    source,
+                    kind=(SUPERNOVA.VELOCITY.kind_preference[bestkind]
+                          if bestkind else ''))
+            if bestz > 0.:
+                if SUPERNOVA.LUM_DIST not in catalog.entries[name]:
+                    dl = catalog.cosmology.luminosity_distance(bestz)
+                    sources = [
+                        catalog.entries[name].add_self_source(),
+                        catalog.entries[name]
+                        .add_source(bibcode='2016A&A...594A..13P')
+                    ]
+                    sources = uniq_cdl(sources + bestsrc.split(','))
                     catalog.entries[name].add_quantity(
-                        SUPERNOVA.VELOCITY,
-                        pnum,
-                        source,
-                        kind=(SUPERNOVA.VELOCITY.kind_preference[bestkind]
-                              if bestkind else ''))
-                if bestz > 0.:
-                    if SUPERNOVA.LUM_DIST not in catalog.entries[name]:
-                        dl = cosmo.luminosity_distance(bestz)
-                        sources = [
-                            catalog.entries[name].add_self_source(),
-                            catalog.entries[name]
-                            .add_source(bibcode='2016A&A...594A..13P')
-                        ]
-                        sources = uniq_cdl(sources + bestsrc.split(','))
+                        SUPERNOVA.LUM_DIST,
+                        pretty_num(dl, sig=bestsig + 1),
+                        sources,
+                        kind=(SUPERNOVA.LUM_DIST.kind_preference[bestkind]
+                              if bestkind else ''),
+                        derived=True)
+                    if (SUPERNOVA.MAX_ABS_MAG not in
+                        catalog.entries[name] and SUPERNOVA.MAX_APP_MAG in
+                            catalog.entries[name]):
+                        source = catalog.entries[name].add_self_source()
+                        pnum = pretty_num(
+                            float(catalog.entries[name][
+                                SUPERNOVA.MAX_APP_MAG][0][QUANTITY.VALUE])
+                            - 5.0 * (log10(dl * 1.0e6) - 1.0
+                                     ) + 2.5 * log10(1.0 + bestz),
+                            sig=bestsig + 1)
                         catalog.entries[name].add_quantity(
-                            SUPERNOVA.LUM_DIST,
-                            pretty_num(
-                                dl.value, sig=bestsig + 1),
+                            SUPERNOVA.MAX_ABS_MAG,
+                            pnum,
                             sources,
-                            kind=(SUPERNOVA.LUM_DIST.kind_preference[bestkind]
-                                  if bestkind else ''),
                             derived=True)
-                        if (SUPERNOVA.MAX_ABS_MAG not in
-                            catalog.entries[name] and SUPERNOVA.MAX_APP_MAG in
-                                catalog.entries[name]):
-                            source = catalog.entries[name].add_self_source()
-                            pnum = pretty_num(
-                                float(catalog.entries[name][
-                                    SUPERNOVA.MAX_APP_MAG][0][QUANTITY.VALUE])
-                                - 5.0 * (log10(dl.to('pc').value) - 1.0
-                                         ) + 2.5 * log10(1.0 + bestz),
-                                sig=bestsig + 1)
-                            catalog.entries[name].add_quantity(
-                                SUPERNOVA.MAX_ABS_MAG,
-                                pnum,
-                                sources,
-                                derived=True)
-                        if (SUPERNOVA.MAX_VISUAL_ABS_MAG not in
-                                catalog.entries[name] and
-                                SUPERNOVA.MAX_VISUAL_APP_MAG in
-                                catalog.entries[name]):
-                            source = catalog.entries[name].add_self_source()
-                            pnum = pretty_num(
-                                float(catalog.entries[name][
-                                    SUPERNOVA.MAX_VISUAL_APP_MAG][0][
-                                        QUANTITY.VALUE]) - 5.0 *
-                                (log10(dl.to('pc').value) - 1.0),
-                                sig=bestsig + 1)
-                            catalog.entries[name].add_quantity(
-                                SUPERNOVA.MAX_VISUAL_ABS_MAG,
-                                pnum,
-                                sources,
-                                derived=True)
-                    if SUPERNOVA.COMOVING_DIST not in catalog.entries[name]:
-                        cd = cosmo.comoving_distance(bestz)
-                        sources = [
-                            catalog.entries[name].add_self_source(),
-                            catalog.entries[name]
-                            .add_source(bibcode='2016A&A...594A..13P')
-                        ]
-                        sources = uniq_cdl(sources + bestsrc.split(','))
+                    if (SUPERNOVA.MAX_VISUAL_ABS_MAG not in
+                            catalog.entries[name] and
+                            SUPERNOVA.MAX_VISUAL_APP_MAG in
+                            catalog.entries[name]):
+                        source = catalog.entries[name].add_self_source()
+                        pnum = pretty_num(
+                            float(catalog.entries[name][
+                                SUPERNOVA.MAX_VISUAL_APP_MAG][0][
+                                    QUANTITY.VALUE]) - 5.0 *
+                            (log10(dl * 1.0e6) - 1.0),
+                            sig=bestsig + 1)
                         catalog.entries[name].add_quantity(
-                            SUPERNOVA.COMOVING_DIST,
-                            pretty_num(
-                                cd.value, sig=bestsig),
+                            SUPERNOVA.MAX_VISUAL_ABS_MAG,
+                            pnum,
                             sources,
                             derived=True)
-        if SUPERNOVA.HOST_REDSHIFT in catalog.entries[name]:
-            # Find the "best" redshift to use for this
-            bestz, bestkind, bestsig, bestsrc = catalog.entries[
-                name].get_best_redshift(SUPERNOVA.HOST_REDSHIFT)
-            if bestsig > 0:
-                try:
-                    bestz = float(bestz)
-                except Exception:
-                    print(catalog.entries[name])
-                    raise
-                if SUPERNOVA.HOST_VELOCITY not in catalog.entries[name]:
-                    source = catalog.entries[name].add_self_source()
-                    # FIX: what's happening here?!
-                    pnum = CLIGHT / KM * \
-                        ((bestz + 1.)**2. - 1.) / ((bestz + 1.)**2. + 1.)
-                    pnum = pretty_num(pnum, sig=bestsig)
+                if SUPERNOVA.COMOVING_DIST not in catalog.entries[name]:
+                    cd = catalog.cosmology.comoving_distance(bestz)
+                    sources = [
+                        catalog.entries[name].add_self_source(),
+                        catalog.entries[name]
+                        .add_source(bibcode='2016A&A...594A..13P')
+                    ]
+                    sources = uniq_cdl(sources + bestsrc.split(','))
                     catalog.entries[name].add_quantity(
-                        SUPERNOVA.HOST_VELOCITY,
-                        pnum,
-                        source,
-                        kind=(SUPERNOVA.HOST_VELOCITY.kind_preference[bestkind]
-                              if bestkind else ''))
-                if bestz > 0.:
-                    if SUPERNOVA.HOST_LUM_DIST not in catalog.entries[name]:
-                        dl = cosmo.luminosity_distance(bestz)
-                        sources = [
-                            catalog.entries[name].add_self_source(),
-                            catalog.entries[name]
-                            .add_source(bibcode='2016A&A...594A..13P')
-                        ]
-                        sources = uniq_cdl(sources + bestsrc.split(','))
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.HOST_LUM_DIST,
-                            pretty_num(
-                                dl.value, sig=bestsig + 1),
-                            sources,
-                            kind=(SUPERNOVA.HOST_LUM_DIST.kind_preference[
-                                bestkind] if bestkind else ''),
-                            derived=True)
-                    if SUPERNOVA.HOST_COMOVING_DIST not in catalog.entries[
-                            name]:
-                        cd = cosmo.comoving_distance(bestz)
-                        sources = [
-                            catalog.entries[name].add_self_source(),
-                            catalog.entries[name]
-                            .add_source(bibcode='2016A&A...594A..13P')
-                        ]
-                        sources = uniq_cdl(sources + bestsrc.split(','))
-                        catalog.entries[name].add_quantity(
-                            SUPERNOVA.HOST_COMOVING_DIST,
-                            pretty_num(
-                                cd.value, sig=bestsig),
-                            sources,
-                            derived=True)
-        if all([
-                x in catalog.entries[name]
-                for x in [
-                    SUPERNOVA.RA, SUPERNOVA.DEC, SUPERNOVA.HOST_RA,
-                    SUPERNOVA.HOST_DEC
-                ]
-        ]):
-            # For now just using first coordinates that appear in entry
+                        SUPERNOVA.COMOVING_DIST,
+                        pretty_num(cd, sig=bestsig),
+                        sources,
+                        derived=True)
+    if SUPERNOVA.HOST_REDSHIFT in catalog.entries[name]:
+        # Find the "best" redshift to use for this
+        bestz, bestkind, bestsig, bestsrc = catalog.entries[
+            name].get_best_redshift(SUPERNOVA.HOST_REDSHIFT)
+        if bestsig > 0:
             try:
-                c1 = coord(
-                    ra=catalog.entries[name][SUPERNOVA.RA][0][QUANTITY.VALUE],
-                    dec=catalog.entries[name][SUPERNOVA.DEC][0][
-                        QUANTITY.VALUE],
-                    unit=(un.hourangle, un.deg))
-                c2 = coord(
-                    ra=catalog.entries[name][SUPERNOVA.HOST_RA][0][
-                        QUANTITY.VALUE],
-                    dec=catalog.entries[name][SUPERNOVA.HOST_DEC][0][
-                        QUANTITY.VALUE],
-                    unit=(un.hourangle, un.deg))
-            except (KeyboardInterrupt, SystemExit):
-                raise
+                bestz = float(bestz)
             except Exception:
-                pass
-            else:
-                sources = uniq_cdl(
-                    [catalog.entries[name].add_self_source()] + catalog.
-                    entries[name][SUPERNOVA.RA][0][QUANTITY.SOURCE].split(',')
-                    + catalog.entries[name][SUPERNOVA.DEC][0][QUANTITY.SOURCE]
-                    .split(',') + catalog.entries[name][SUPERNOVA.HOST_RA][0][
-                        QUANTITY.SOURCE].split(',') + catalog.entries[name][
-                            SUPERNOVA.HOST_DEC][0][QUANTITY.SOURCE].split(','))
-                if SUPERNOVA.HOST_OFFSET_ANG not in catalog.entries[name]:
-                    hosa = Decimal(c1.separation(c2).arcsecond)
-                    hosa = pretty_num(hosa)
+                print(catalog.entries[name])
+                raise
+            if SUPERNOVA.HOST_VELOCITY not in catalog.entries[name]:
+                source = catalog.entries[name].add_self_source()
+                # FIX: what's happening here?!
+                pnum = CLIGHT / KM * \
+                    ((bestz + 1.)**2. - 1.) / ((bestz + 1.)**2. + 1.)
+                pnum = pretty_num(pnum, sig=bestsig)
+                catalog.entries[name].add_quantity(
+                    SUPERNOVA.HOST_VELOCITY,
+                    pnum,
+                    source,
+                    kind=(SUPERNOVA.HOST_VELOCITY.kind_preference[bestkind]
+                          if bestkind else ''))
+            if bestz > 0.:
+                if SUPERNOVA.HOST_LUM_DIST not in catalog.entries[name]:
+                    dl = catalog.cosmology.luminosity_distance(bestz)
+                    sources = [
+                        catalog.entries[name].add_self_source(),
+                        catalog.entries[name]
+                        .add_source(bibcode='2016A&A...594A..13P')
+                    ]
+                    sources = uniq_cdl(sources + bestsrc.split(','))
                     catalog.entries[name].add_quantity(
-                        SUPERNOVA.HOST_OFFSET_ANG,
-                        hosa,
+                        SUPERNOVA.HOST_LUM_DIST,
+                        pretty_num(dl, sig=bestsig + 1),
                         sources,
-                        derived=True,
-                        u_value='arcseconds')
-                if (SUPERNOVA.COMOVING_DIST in catalog.entries[name] and
-                        SUPERNOVA.REDSHIFT in catalog.entries[name] and
-                        SUPERNOVA.HOST_OFFSET_DIST not in
-                        catalog.entries[name]):
-                    offsetsig = get_sig_digits(catalog.entries[name][
-                        SUPERNOVA.HOST_OFFSET_ANG][0][QUANTITY.VALUE])
-                    sources = uniq_cdl(
-                        sources.split(',') + (catalog.entries[name][
-                            SUPERNOVA.COMOVING_DIST][0][QUANTITY.SOURCE]).
-                        split(',') + (catalog.entries[name][SUPERNOVA.REDSHIFT]
-                                      [0][QUANTITY.SOURCE]).split(','))
-                    (catalog.entries[name].add_quantity(
-                        SUPERNOVA.HOST_OFFSET_DIST,
-                        pretty_num(
-                            float(catalog.entries[name][
-                                SUPERNOVA.HOST_OFFSET_ANG][0][QUANTITY.VALUE])
-                            / 3600. * (pi / 180.) *
-                            float(catalog.entries[name][
-                                SUPERNOVA.COMOVING_DIST][0][QUANTITY.VALUE]) *
-                            1000. / (1.0 + float(catalog.entries[name][
-                                SUPERNOVA.REDSHIFT][0][QUANTITY.VALUE])),
-                            sig=offsetsig),
-                        sources))
-
-        catalog.entries[name].sanitize()
-        catalog.journal_entries(bury=True, final=True, gz=True)
-        cleanupcnt = cleanupcnt + 1
-        if catalog.args.travis and cleanupcnt % 1000 == 0:
-            break
-
-    catalog.save_caches()
+                        kind=(SUPERNOVA.HOST_LUM_DIST.kind_preference[
+                            bestkind] if bestkind else ''),
+                        derived=True)
+                if SUPERNOVA.HOST_COMOVING_DIST not in catalog.entries[
+                        name]:
+                    cd = catalog.cosmology.comoving_distance(bestz)
+                    sources = [
+                        catalog.entries[name].add_self_source(),
+                        catalog.entries[name]
+                        .add_source(bibcode='2016A&A...594A..13P')
+                    ]
+                    sources = uniq_cdl(sources + bestsrc.split(','))
+                    catalog.entries[name].add_quantity(
+                        SUPERNOVA.HOST_COMOVING_DIST,
+                        pretty_num(cd, sig=bestsig),
+                        sources,
+                        derived=True)
+    if all([
+            x in catalog.entries[name]
+            for x in [
+                SUPERNOVA.RA, SUPERNOVA.DEC, SUPERNOVA.HOST_RA,
+                SUPERNOVA.HOST_DEC
+            ]
+    ]):
+        # For now just using first coordinates that appear in entry
+        hosa = angular_separations(
+            *[[catalog.entries[name][x][0][QUANTITY.VALUE]] for x in [
+                SUPERNOVA.RA, SUPERNOVA.DEC, SUPERNOVA.HOST_RA,
+                SUPERNOVA.HOST_DEC
+            ]])[0]
+        if np.isfinite(hosa):
+            sources = uniq_cdl(
+                [catalog.entries[name].add_self_source()] + catalog.
+                entries[name][SUPERNOVA.RA][0][QUANTITY.SOURCE].split(',')
+                + catalog.entries[name][SUPERNOVA.DEC][0][QUANTITY.SOURCE]
+                .split(',') + catalog.entries[name][SUPERNOVA.HOST_RA][0][
+                    QUANTITY.SOURCE].split(',') + catalog.entries[name][
+                        SUPERNOVA.HOST_DEC][0][QUANTITY.SOURCE].split(','))
+            if SUPERNOVA.HOST_OFFSET_ANG not in catalog.entries[name]:
+                hosa = pretty_num(Decimal(hosa))
+                catalog.entries[name].add_quantity(
+                    SUPERNOVA.HOST_OFFSET_ANG,
+                    hosa,
+                    sources,
+                    derived=True,
+                    u_value='arcseconds')
+            if (SUPERNOVA.COMOVING_DIST in catalog.entries[name] and
+                    SUPERNOVA.REDSHIFT in catalog.entries[name] and
+                    SUPERNOVA.HOST_OFFSET_DIST not in
+                    catalog.entries[name]):
+                offsetsig = get_sig_digits(catalog.entries[name][
+                    SUPERNOVA.HOST_OFFSET_ANG][0][QUANTITY.VALUE])
+                sources = uniq_cdl(
+                    sources.split(',') + (catalog.entries[name][
+                        SUPERNOVA.COMOVING_DIST][0][QUANTITY.SOURCE]).
+                    split(',') + (catalog.entries[name][SUPERNOVA.REDSHIFT]
+                                  [0][QUANTITY.SOURCE]).split(','))
+                (catalog.entries[name].add_quantity(
+                    SUPERNOVA.HOST_OFFSET_DIST,
+                    pretty_num(
+                        float(catalog.entries[name][
+                            SUPERNOVA.HOST_OFFSET_ANG][0][QUANTITY.VALUE])
+                        / 3600. * (pi / 180.) *
+                        float(catalog.entries[name][
+                            SUPERNOVA.COMOVING_DIST][0][QUANTITY.VALUE]) *
+                        1000. / (1.0 + float(catalog.entries[name][
+                            SUPERNOVA.REDSHIFT][0][QUANTITY.VALUE])),
+                        sig=offsetsig),
+                    sources))
 
-    return
+    catalog.entries[name].sanitize()
+    return name
@@ -6,6 +6,7 @@ from collections import OrderedDict
 from astrocats.catalog.utils import is_number, pbar, round_sig, uniq_cdl
 
 from ..supernova import SUPERNOVA
+from ..utils import radec_clean_array
 
 
 def do_cpcs(catalog):
@@ -21,6 +22,12 @@ def do_cpcs(catalog):
         return
     alertindex = json.loads(jsontxt, object_pairs_hook=OrderedDict)
     ids = [xx['id'] for xx in alertindex]
+    ras, ra_units = radec_clean_array(
+        [str(xx.get(SUPERNOVA.RA, '')) for xx in alertindex], SUPERNOVA.RA,
+        unit='floatdegrees')
+    decs, dec_units = radec_clean_array(
+        [str(xx.get(SUPERNOVA.DEC, '')) for xx in alertindex], SUPERNOVA.DEC,
+        unit='floatdegrees')
     for ii, ai in enumerate(pbar(ids, task_str)):
         name = alertindex[ii]['ivorn'].split('/')[-1].strip()
         # Skip aa few weird entries
@@ -55,17 +62,10 @@ def do_cpcs(catalog):
             secondary=True)
         catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, oldname,
                                            sec_source)
-        unit_deg = 'floatdegrees'
         catalog.entries[name].add_quantity(
-            SUPERNOVA.RA,
-            str(alertindex[ii][SUPERNOVA.RA]),
-            sec_source,
-            u_value=unit_deg)
+            SUPERNOVA.RA, ras[ii], sec_source, u_value=ra_units[ii])
         catalog.entries[name].add_quantity(
-            SUPERNOVA.DEC,
-            str(alertindex[ii][SUPERNOVA.DEC]),
-            sec_source,
-            u_value=unit_deg)
+            SUPERNOVA.DEC, decs[ii], sec_source, u_value=dec_units[ii])
 
         alerturl = ('http://gsaweb.ast.cam.ac.uk/'
                     'followup/get_alert_lc_data?alert_id=' + str(ai))
@@ -90,15 +90,14 @@ def do_cpcs(catalog):
             for xx in cpcsalert['magerr']]
         bnds = cpcsalert['filter']
         obs = cpcsalert['observatory']
-        for mi, mjd in enumerate(mjds):
-            catalog.entries[name].add_photometry(
-                time=mjd,
-                u_time='MJD',
-                magnitude=mags[mi],
-                e_magnitude=errs[mi],
-                band=bnds[mi],
-                observatory=obs[mi],
-                source=uniq_cdl([source, sec_source]))
+        catalog.entries[name].add_photometry_batch(
+            time=mjds,
+            u_time='MJD',
+            magnitude=mags,
+            e_magnitude=errs,
+            band=bnds,
+            observatory=obs,
+            source=uniq_cdl([source, sec_source]))
         if catalog.args.update:
             catalog.journal_entries()
         if catalog.args.travis and ii >= catalog.TRAVIS_QUERY_LIMIT:
@@ -4,7 +4,6 @@ import re
 
 from astrocats.catalog.utils import is_number, pbar
 from astrocats.catalog.photometry import PHOTOMETRY
-from bs4 import BeautifulSoup
 
 from decimal import Decimal
 
@@ -13,6 +12,7 @@ from ..supernova import SUPERNOVA
 
 def do_crts(catalog):
     """Import data from the Catalina Real-Time Transient Survey."""
+    from bs4 import BeautifulSoup
     crtsnameerrors = ['2011ax']
     task_str = catalog.get_current_task_str()
     folders = ['catalina', 'MLS', 'MLS', 'SSS']
@@ -3,8 +3,6 @@
 import json
 import os
 
-from bs4 import BeautifulSoup
-
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.utils import pbar
 
@@ -12,6 +10,7 @@ from ..supernova import SUPERNOVA
 
 
 def do_des(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     des_url = 'https://portal.nersc.gov/des-sn/'
     des_trans_url = des_url + 'transients/'
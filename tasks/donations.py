@@ -4,7 +4,7 @@ import csv
 import json
 import os
 from glob import glob
-from math import floor, isnan
+from math import isnan
 
 import numpy as np
 from astrocats.catalog.photometry import PHOTOMETRY, set_pd_mag_from_counts
@@ -12,11 +12,11 @@ from astrocats.catalog.spectrum import SPECTRUM
 from astrocats.catalog.utils import (get_sig_digits, is_number, jd_to_mjd,
                                      pbar, pbar_strings, pretty_num, rep_chars)
 from astropy.io.ascii import read
-from astropy.time import Time as astrotime
 
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import date_to_mjd
 
 
 def do_donated_photo(catalog):
@@ -167,7 +167,7 @@ def do_donated_photo(catalog):
             (name, source) = catalog.new_entry(inpname, bibcode=bc)
             mag = row[4]
             err = row[5]
-            mjd = str(astrotime('-'.join(row[:3]), format='iso').mjd)
+            mjd = str(date_to_mjd('-'.join(row[:3])))
             photodict = {
                 PHOTOMETRY.BAND: row[3],
                 PHOTOMETRY.TIME: mjd,
@@ -600,10 +600,7 @@ def do_donated_spectra(catalog):
         date = metadict[fname].get('date', '')
         year, month, day = date.split('/')
         sig = get_sig_digits(day) + 5
-        day_fmt = str(floor(float(day))).zfill(2)
-        time = astrotime(year + '-' + month + '-' + day_fmt).mjd
-        time = time + float(day) - floor(float(day))
-        time = pretty_num(time, sig=sig)
+        time = pretty_num(date_to_mjd(date), sig=sig)
 
         with open(os.path.join(fpath, fname), 'r') as f:
             specdata = list(
@@ -4,11 +4,10 @@ import csv
 import os
 import re
 
-from astrocats.catalog.utils import jd_to_mjd, pbar
-
-from decimal import Decimal
+from astrocats.catalog.utils import pbar
 
 from ..supernova import SUPERNOVA
+from ..utils import jds_to_mjds, radec_clean_array
 
 
 def do_gaia(catalog):
@@ -21,12 +20,15 @@ def do_gaia(catalog):
     tsvin = list(
         csv.reader(
             csvtxt.splitlines(), delimiter=',', skipinitialspace=True))
+    tsvin = [x for x in tsvin[1:] if x]
+    ras, ra_units = radec_clean_array(
+        [x[2] for x in tsvin], SUPERNOVA.RA, unit='floatdegrees')
+    decs, dec_units = radec_clean_array(
+        [x[3] for x in tsvin], SUPERNOVA.DEC, unit='floatdegrees')
     reference = 'Gaia Photometric Science Alerts'
     refurl = 'http://gsaweb.ast.cam.ac.uk/alerts/alertsindex'
     loopcnt = 0
     for ri, row in enumerate(pbar(tsvin, task_str)):
-        if ri == 0 or not row:
-            continue
         name = catalog.add_entry(row[0])
         source = catalog.entries[name].add_source(name=reference, url=refurl)
         catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
@@ -34,9 +36,9 @@ def do_gaia(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.DISCOVER_DATE, year,
                                            source)
         catalog.entries[name].add_quantity(
-            SUPERNOVA.RA, row[2], source, u_value='floatdegrees')
+            SUPERNOVA.RA, ras[ri], source, u_value=ra_units[ri])
         catalog.entries[name].add_quantity(
-            SUPERNOVA.DEC, row[3], source, u_value='floatdegrees')
+            SUPERNOVA.DEC, decs[ri], source, u_value=dec_units[ri])
         if row[7] and row[7] != 'unknown':
             type = row[7].replace('SNe', '').replace('SN', '').strip()
             catalog.entries[name].add_quantity(SUPERNOVA.CLAIMED_TYPE, type,
@@ -71,25 +73,18 @@ def do_gaia(catalog):
         csvtxt = catalog.load_url('http://gsaweb.ast.cam.ac.uk/alerts/alert/' +
                                   row[0] + '/lightcurve.csv', fname)
 
-        tsvin2 = csv.reader(csvtxt.splitlines())
-        for ri2, row2 in enumerate(tsvin2):
-            if ri2 <= 1 or not row2:
-                continue
-            mjd = str(jd_to_mjd(Decimal(row2[1].strip())))
-            magnitude = row2[2].strip()
-            if magnitude == 'null':
-                continue
-            e_mag = 0.
-            telescope = 'GAIA'
-            band = 'G'
-            catalog.entries[name].add_photometry(
-                time=mjd,
-                u_time='MJD',
-                telescope=telescope,
-                band=band,
-                magnitude=magnitude,
-                e_magnitude=e_mag,
-                source=source)
+        tsvin2 = [
+            row2 for ri2, row2 in enumerate(csv.reader(csvtxt.splitlines()))
+            if ri2 > 1 and row2 and row2[2].strip() != 'null'
+        ]
+        catalog.entries[name].add_photometry_batch(
+            time=jds_to_mjds([x[1].strip() for x in tsvin2]),
+            u_time='MJD',
+            telescope='GAIA',
+            band='G',
+            magnitude=[x[2].strip() for x in tsvin2],
+            e_magnitude=0.,
+            source=source)
         if catalog.args.update:
             catalog.journal_entries()
         loopcnt = loopcnt + 1
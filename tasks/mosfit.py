@@ -3,13 +3,12 @@
 import os
 from glob import glob
 
-import dropbox
-
 from astrocats.catalog.utils import pbar
 from astrocats.supernovae.supernova import Supernova
 
 
 def do_mosfit(catalog):
+    import dropbox
     task_str = catalog.get_current_task_str()
     try:
         with open('mosfit.key', 'r') as f:
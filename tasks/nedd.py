@@ -7,9 +7,6 @@ from html import unescape
 
 from astrocats.catalog.utils import (get_sig_digits, is_number, pbar,
                                      pretty_num, uniq_cdl)
-from astropy import units as un
-from astropy.cosmology import Planck15 as cosmo
-from astropy.cosmology import z_at_value
 
 from decimal import Decimal
 
@@ -70,8 +67,8 @@ def do_nedd(catalog):
                         SUPERNOVA.COMOVING_DIST, dist, sources)
                     if not redshift:
                         try:
-                            zatval = z_at_value(cosmo.comoving_distance,
-                                                float(dist) * un.Mpc, zmax=5.0)
+                            zatval = catalog.cosmology.z_at_comoving_distance(
+                                float(dist), zmax=5.0)
                             sigd = get_sig_digits(str(dist))
                             redshift = pretty_num(zatval, sig=sigd)
                         except (KeyboardInterrupt, SystemExit):
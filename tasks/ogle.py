@@ -4,7 +4,6 @@ import os
 import re
 
 from astrocats.catalog.utils import is_number, jd_to_mjd, pbar, uniq_cdl
-from bs4 import BeautifulSoup, NavigableString, Tag
 
 from decimal import Decimal
 
@@ -12,6 +11,7 @@ from ..supernova import SUPERNOVA
 
 
 def do_ogle(catalog):
+    from bs4 import BeautifulSoup, NavigableString, Tag
     task_str = catalog.get_current_task_str()
     basenames = [
         'transients', 'transients/2015', 'transients/2014b', 'transients/2014',
@@ -10,10 +10,9 @@ from glob import glob
 import requests
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.utils import is_number, make_date_string, pbar, uniq_cdl
-from astropy.time import Time as astrotime
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
+from ..utils import mjds_to_datetimes
 
 
 def do_ps_mds(catalog):
@@ -21,17 +20,16 @@ def do_ps_mds(catalog):
     with open(
             os.path.join(catalog.get_current_task_repo(),
                          'MDS/apj506838t1_mrt.txt')) as f:
-        for ri, row in enumerate(pbar(f.read().splitlines(), task_str)):
-            if ri < 35:
-                continue
-            cols = [x.strip() for x in row.split(',')]
+        rows = [[x.strip() for x in row.split(',')]
+                for row in f.read().splitlines()[35:]]
+        astrots = mjds_to_datetimes([float(cols[4]) for cols in rows])
+        for cols, astrot in pbar(list(zip(rows, astrots)), task_str):
             name = catalog.add_entry(cols[0])
             source = catalog.entries[name].add_source(
                 bibcode='2015ApJ...799..208S')
             catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
             catalog.entries[name].add_quantity(SUPERNOVA.RA, cols[2], source)
             catalog.entries[name].add_quantity(SUPERNOVA.DEC, cols[3], source)
-            astrot = astrotime(float(cols[4]), format='mjd').datetime
             ddate = make_date_string(astrot.year, astrot.month, astrot.day)
             catalog.entries[name].add_quantity(SUPERNOVA.DISCOVER_DATE, ddate,
                                                source)
@@ -163,6 +161,7 @@ def do_ps_alerts(catalog):
 
 
 def do_ps_threepi(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     teles = 'Pan-STARRS1'
     fname = os.path.join(catalog.get_current_task_repo(), '3pi/page00.html')
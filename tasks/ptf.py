@@ -3,7 +3,6 @@
 import os
 
 from astrocats.catalog.utils import is_number, pbar
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
 
@@ -20,6 +19,7 @@ def do_ptf(catalog):
     #    if ((name.startswith('PTF') and is_number(name[3:5])) or
     #        name.startswith('PTFS') or name.startswith('iPTF')):
     # name = catalog.add_entry(name)
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
 
     html = catalog.load_url('http://wiserep.weizmann.ac.il/spectra/update',
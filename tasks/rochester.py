@@ -8,12 +8,12 @@ from string import ascii_letters
 
 from astrocats.catalog.utils import is_number, make_date_string, pbar, uniq_cdl
 from astropy.time import Time as astrotime
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
 
 
 def do_rochester(catalog):
+    from bs4 import BeautifulSoup
     rochestermirrors = [
         'http://www.rochesterastronomy.org/',
         'http://www.supernova.thistlethwaites.com/'
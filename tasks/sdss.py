@@ -13,6 +13,7 @@ from astrocats.catalog.utils import make_date_string, pbar, pbar_strings
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import radec_clean_array
 
 
 def do_sdss_photo(catalog):
@@ -53,6 +54,20 @@ def do_sdss_photo(catalog):
 
         rows = [[x.replace('\\N', '') for x in y] for y in rows]
 
+        # Clean each coordinate column at once, wrapping negative RAs.
+        radecs = {}
+        for key in [
+                SUPERNOVA.RA, SUPERNOVA.DEC, SUPERNOVA.HOST_RA,
+                SUPERNOVA.HOST_DEC
+        ]:
+            vals = [x[columns[key]] for x in rows]
+            if key in [SUPERNOVA.RA, SUPERNOVA.HOST_RA]:
+                vals = [
+                    str(Decimal(360) + Decimal(float(x)))
+                    if x and float(x) < 0.0 else x for x in vals
+                ]
+            radecs[key] = radec_clean_array(vals, key, unit='floatdegrees')
+
         co = [[x[0], x[99], x[100]] for x in rows if x[99] and x[100]]
         coo = coord([x[1] for x in co], [x[2] for x in co], unit="deg")
         coo = [
@@ -102,11 +117,8 @@ def do_sdss_photo(catalog):
                         SUPERNOVA.RA, SUPERNOVA.DEC, SUPERNOVA.HOST_RA,
                         SUPERNOVA.HOST_DEC
                 ]:
-                    kwargs = {QUANTITY.U_VALUE: 'floatdegrees'}
-                    if key in [SUPERNOVA.RA, SUPERNOVA.HOST_RA]:
-                        fval = float(val)
-                        if fval < 0.0:
-                            val = str(Decimal(360) + Decimal(fval))
+                    val = radecs[key][0][ri]
+                    kwargs = {QUANTITY.U_VALUE: radecs[key][1][ri]}
                 elif key == SUPERNOVA.CLAIMED_TYPE:
                     val = val.lstrip('pz').replace('SN', '')
                 elif key == SUPERNOVA.REDSHIFT:
@@ -2,8 +2,6 @@
 """
 import re
 
-from astroquery.simbad import Simbad
-
 from astrocats.catalog.utils import is_number, pbar, single_spaces, uniq_cdl
 from ..supernova import SUPERNOVA
 from ..utils import name_clean
@@ -13,6 +11,7 @@ def do_simbad(catalog):
     # Simbad.list_votable_fields()
     # Some coordinates that SIMBAD claims belong to the SNe actually belong to
     # the host.
+    from astroquery.simbad import Simbad
     task_str = catalog.get_current_task_str()
     simbadmirrors = ['http://simbad.harvard.edu/simbad/sim-script',
                      'http://simbad.u-strasbg.fr/simbad/sim-script']
@@ -3,12 +3,12 @@
 import os
 
 from astrocats.catalog.utils import pbar
-from bs4 import BeautifulSoup
 
 from ..supernova import SUPERNOVA
 
 
 def do_smt(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     smt_url = 'http://www.mso.anu.edu.au/skymapper/smt/transients/tns/'
     html = catalog.load_url(smt_url,
@@ -1,16 +1,16 @@
 """Import tasks for the Sloan Digital Sky Survey.
 """
 import numpy as np
-import sncosmo
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.quantity import QUANTITY
 from astrocats.catalog.utils import pbar
-from astropy.table import Table
 
 from ..supernova import SUPERNOVA
 
 
 def do_sncosmo(catalog):
+    import sncosmo
+    from astropy.table import Table
     import warnings
     warnings.filterwarnings("ignore", message="fcn returns Nan")
     warnings.filterwarnings("ignore", message="overflow encountered in power")
@@ -3,14 +3,13 @@
 import os
 import re
 
-from bs4 import BeautifulSoup
-
 from astrocats.catalog.utils import pbar
 
 from ..supernova import SUPERNOVA
 
 
 def do_snhunt(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     snh_url = 'http://nesssi.cacr.caltech.edu/catalina/current.html'
     html = catalog.load_url(snh_url, os.path.join(
@@ -2,10 +2,10 @@
 '''
 import csv
 import os
+from collections import OrderedDict
 from glob import glob
 
 from astropy.time import Time as astrotime
-from astroquery.vizier import Vizier
 
 from astrocats.catalog.photometry import PHOTOMETRY, set_pd_mag_from_counts
 from astrocats.catalog.spectrum import SPECTRUM
@@ -13,6 +13,7 @@ from astrocats.catalog.utils import (get_sig_digits, pbar, pbar_strings,
                                      pretty_num)
 
 from ..supernova import SUPERNOVA
+from ..utils import photometry_columns
 
 
 def do_snls_photo(catalog):
@@ -24,6 +25,7 @@ def do_snls_photo(catalog):
             delimiter=' ',
             quotechar='"',
             skipinitialspace=True))
+    photodicts = OrderedDict()
     for row in pbar(data, task_str):
         counts = row[3]
         err = row[4]
@@ -51,8 +53,11 @@ def do_snls_photo(catalog):
             PHOTOMETRY.SYSTEM: 'BD17'
         }
         set_pd_mag_from_counts(photodict, counts, ec=err, zp=zp)
-        catalog.entries[name].add_photometry(**photodict)
+        photodicts.setdefault(name, []).append(photodict)
 
+    for name, photos in photodicts.items():
+        catalog.entries[name].add_photometry_batch(
+            **photometry_columns(photos))
     catalog.journal_entries()
     return
 
@@ -62,7 +67,7 @@ def do_snls_spectra(catalog):
     """
 
     task_str = catalog.get_current_task_str()
-    result = Vizier.get_catalogs('J/A+A/507/85/table1')
+    result = catalog.vizier.get_catalogs('J/A+A/507/85/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     datedict = {}
@@ -4,13 +4,12 @@ import os
 from glob import glob
 from html import unescape
 
-from bs4 import BeautifulSoup
-
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.utils import pbar
 
 
 def do_sousa(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
 
     html = catalog.load_url(
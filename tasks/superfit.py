@@ -5,11 +5,11 @@ import re
 from glob import glob
 
 from astrocats.catalog.utils import pbar
-from astropy.time import Time as astrotime
 
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import date_to_mjd
 
 
 def do_superfit_spectra(catalog):
@@ -74,9 +74,8 @@ def do_superfit_spectra(catalog):
             fluxes = specdata[1]
 
             if epoff != '':
-                mlmjd = astrotime(
-                    '-'.join([str(mldt.year), str(mldt.month),
-                              str(mldt.day)])).mjd
+                mlmjd = date_to_mjd('-'.join([str(mldt.year), str(mldt.month),
+                                              str(mldt.day)]))
                 mlmjd = str(Decimal(mlmjd) + epoff)
             else:
                 mlmjd = ''
@@ -7,19 +7,17 @@ import re
 import urllib
 from glob import glob
 from html import unescape
-from math import floor
-
-from astropy.time import Time as astrotime
-from bs4 import BeautifulSoup
 
 from astrocats.catalog.utils import (get_sig_digits, is_number, jd_to_mjd,
                                      pbar, pbar_strings, pretty_num, uniq_cdl)
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import date_to_mjd
 
 
 def do_suspect_photo(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     with open(
             os.path.join(catalog.get_current_task_repo(),
@@ -185,10 +183,8 @@ def do_suspect_spectra(catalog):
                 month = date[4:6]
                 day = date[6:]
                 sig = get_sig_digits(day) + 5
-                day_fmt = str(floor(float(day))).zfill(2)
-                time = astrotime(year + '-' + month + '-' + day_fmt).mjd
-                time = time + float(day) - floor(float(day))
-                time = pretty_num(time, sig=sig)
+                time = pretty_num(
+                    date_to_mjd(year + '-' + month + '-' + day), sig=sig)
 
                 fpath = os.path.join(catalog.get_current_task_repo(),
                                      'Suspect', folder, eventfolder, spectrum)
@@ -4,7 +4,6 @@ import datetime
 import os
 
 # from astropy.time import Time as astrotime
-from bs4 import BeautifulSoup
 
 from astrocats.catalog.utils import pbar, utf8
 from astrocats.catalog.entry import ENTRY
@@ -12,6 +11,7 @@ from astrocats.supernovae.utils import name_clean
 
 
 def do_swift(catalog):
+    from bs4 import BeautifulSoup
     task_str = catalog.get_current_task_str()
     now = datetime.datetime.now()
     url = 'https://www.swift.psu.edu/secure/toop/summary.php'
@@ -1,11 +1,9 @@
 """Import tasks for the Transient Name Server."""
 import csv
-import json
 import os
-import time
 import urllib
 import warnings
-from datetime import datetime, timedelta
+from datetime import timedelta
 from math import ceil
 
 import requests
@@ -13,10 +11,11 @@ import requests
 from astrocats.catalog.photometry import PHOTOMETRY
 from astrocats.catalog.spectrum import SPECTRUM
 from astrocats.catalog.utils import (is_integer, is_number, jd_to_mjd, pbar,
-                                     pretty_num, sortOD)
+                                     pretty_num)
 from decimal import Decimal
 
 from ..supernova import SUPERNOVA
+from ..utils import photometry_columns
 
 
 def do_tns(catalog):
@@ -142,24 +141,12 @@ def do_tns(catalog):
     catalog.journal_entries()
 
 
-def do_tns_photo(catalog):
-    """Load TNS photometry."""
-    task_str = catalog.get_current_task_str()
-    tns_url = 'https://wis-tns.weizmann.ac.il/'
-    try:
-        with open('tns.key', 'r') as f:
-            tnskey = f.read().splitlines()[0]
-    except Exception:
-        catalog.log.warning('TNS API key not found, make sure a file named '
-                            '`tns.key` containing the key is placed the '
-                            'astrocats directory.')
-        tnskey = ''
-
-    bandreps = {'Clear': 'C'}
-    fails = 0
-    for name in pbar(list(catalog.entries.keys()), task_str):
-        if name not in catalog.entries:
-            continue
+def _tns_objects(catalog, task_str):
+    """Yield `(name, oname, objdict)` for each entry named in the TNS, in
+    catalog order, with the object from the shared TNS cache.
+    """
+    objects = []
+    for name in list(catalog.entries.keys()):
         aliases = catalog.entries[name].get_aliases()
         oname = ''
         for alias in aliases:
@@ -167,62 +154,39 @@ def do_tns_photo(catalog):
                     int(alias[2:6]) >= 2016) and alias[6:].isalpha():
                 oname = alias
                 break
-        if not oname:
-            continue
-        reqname = oname[2:]
-        jsonpath = os.path.join(catalog.get_current_task_repo(), 'TNS',
-                                reqname + '.json')
-        download_json = True
-        if os.path.isfile(jsonpath):
-            with open(jsonpath, 'r') as f:
-                objdict = json.load(f)
-            if ('discoverydate' in objdict and
-                (datetime.now() - datetime.strptime(objdict['discoverydate'],
-                                                    '%Y-%m-%d %H:%M:%S')
-                 ).days > 90):
-                download_json = False
-        if download_json:
-            data = urllib.parse.urlencode({
-                'api_key': tnskey,
-                'data': json.dumps({
-                    'objname': reqname,
-                    'photometry': '1'
-                })
-            }).encode('ascii')
-            req = urllib.request.Request(
-                'https://wis-tns.weizmann.ac.il/api/get/object', data=data)
-            trys = 0
-            objdict = None
-            while trys < 3 and not objdict:
-                try:
-                    objdict = json.loads(
-                        urllib.request.urlopen(req).read().decode('ascii'))[
-                            'data']['reply']
-                except KeyboardInterrupt:
-                    raise
-                except Exception:
-                    catalog.log.warning('API request failed for `{}`.'.format(
-                        name))
-                    time.sleep(5)
-                trys = trys + 1
-            if (not objdict or 'objname' not in objdict or
-                    not isinstance(objdict['objname'], str)):
+        if oname:
+            objects.append((name, oname))
+
+    replies = catalog.tns.get_objects(x[1][2:] for x in objects)
+    fails = 0
+    try:
+        for name, oname in pbar(objects, task_str):
+            objdict = next(replies)[1]
+            if objdict is None:
                 fails = fails + 1
                 catalog.log.warning('Object `{}` not found!'.format(name))
                 if fails >= 5:
                     break
                 continue
-            # Cache object here
-            with open(jsonpath, 'w') as f:
-                json.dump(sortOD(objdict), f, indent='\t',
-                          separators=(',', ':'), ensure_ascii=False,
-                          sort_keys=True)
+            if name not in catalog.entries:
+                continue
+            yield name, oname, objdict
+    finally:
+        replies.close()
 
+
+def do_tns_photo(catalog):
+    """Load TNS photometry."""
+    task_str = catalog.get_current_task_str()
+    tns_url = 'https://wis-tns.weizmann.ac.il/'
+    bandreps = {'Clear': 'C'}
+    for name, oname, objdict in _tns_objects(catalog, task_str):
         if 'photometry' not in objdict:
             continue
         photoarr = objdict['photometry']
         name, source = catalog.new_entry(
             oname, srcname='Transient Name Server', url=tns_url)
+        photodicts = []
         for photo in photoarr:
             if 'mag' not in photo['flux_unit']['name'].lower():
                 catalog.log.warning('Unknown flux unit `{}`.'.format(photo[
@@ -269,7 +233,9 @@ def do_tns_photo(catalog):
                 system = 'AB'
             if system:
                 photodict[PHOTOMETRY.SYSTEM] = system
-            catalog.entries[name].add_photometry(**photodict)
+            photodicts.append(photodict)
+        catalog.entries[name].add_photometry_batch(
+            **photometry_columns(photodicts))
         catalog.journal_entries()
     return
 
@@ -279,77 +245,7 @@ def do_tns_spectra(catalog):
     requests.packages.urllib3.disable_warnings()
     task_str = catalog.get_current_task_str()
     tns_url = 'https://wis-tns.weizmann.ac.il/'
-    try:
-        with open('tns.key', 'r') as f:
-            tnskey = f.read().splitlines()[0]
-    except Exception:
-        catalog.log.warning('TNS API key not found, make sure a file named '
-                            '`tns.key` containing the key is placed the '
-                            'astrocats directory.')
-        tnskey = ''
-
-    fails = 0
-    for name in pbar(list(catalog.entries.keys()), task_str):
-        if name not in catalog.entries:
-            continue
-        aliases = catalog.entries[name].get_aliases()
-        oname = ''
-        for alias in aliases:
-            if (alias.startswith(('SN', 'AT')) and is_integer(alias[2:6]) and
-                    int(alias[2:6]) >= 2016) and alias[6:].isalpha():
-                oname = alias
-                break
-        if not oname:
-            continue
-        reqname = oname[2:]
-        jsonpath = os.path.join(catalog.get_current_task_repo(), 'TNS', 'meta',
-                                reqname + '.json')
-        download_json = True
-        if os.path.isfile(jsonpath):
-            with open(jsonpath, 'r') as f:
-                objdict = json.load(f)
-            if ('discoverydate' in objdict and
-                (datetime.now() - datetime.strptime(objdict['discoverydate'],
-                                                    '%Y-%m-%d %H:%M:%S')
-                 ).days > 90):
-                download_json = False
-        if download_json:
-            data = urllib.parse.urlencode({
-                'api_key': tnskey,
-                'data': json.dumps({
-                    'objname': reqname,
-                    'spectra': '1'
-                })
-            }).encode('ascii')
-            req = urllib.request.Request(
-                'https://wis-tns.weizmann.ac.il/api/get/object', data=data)
-            trys = 0
-            objdict = None
-            while trys < 3 and not objdict:
-                try:
-                    objdict = json.loads(
-                        urllib.request.urlopen(req).read().decode('ascii'))[
-                            'data']['reply']
-                except KeyboardInterrupt:
-                    raise
-                except Exception:
-                    catalog.log.warning('API request failed for `{}`.'.format(
-                        name))
-                    time.sleep(5)
-                trys = trys + 1
-            if (not objdict or 'objname' not in objdict or
-                    not isinstance(objdict['objname'], str)):
-                fails = fails + 1
-                catalog.log.warning('Object `{}` not found!'.format(name))
-                if fails >= 5:
-                    break
-                continue
-            # Cache object here
-            with open(jsonpath, 'w') as f:
-                json.dump(sortOD(objdict), f, indent='\t',
-                          separators=(',', ':'), ensure_ascii=False,
-                          sort_keys=True)
-
+    for name, oname, objdict in _tns_objects(catalog, task_str):
         if 'spectra' not in objdict:
             continue
         specarr = objdict['spectra']
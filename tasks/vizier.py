@@ -2,6 +2,7 @@
 """
 import csv
 import os
+from collections import OrderedDict
 from math import isnan
 
 from astrocats.catalog.photometry import PHOTOMETRY, set_pd_mag_from_counts
@@ -10,123 +11,328 @@ from astrocats.catalog.utils import (convert_aq_output, get_sig_digits,
                                      is_number, jd_to_mjd, make_date_string,
                                      pbar, rep_chars, round_sig, uniq_cdl)
 from astropy.time import Time as astrotime
-from astroquery.vizier import Vizier
 from decimal import Decimal
 
 from ..constants import CLIGHT, KM
 from ..supernova import SUPERNOVA
-from ..utils import radec_clean
+from ..utils import add_table_photometry, radec_clean
+
+# Photometry tables read by `add_table_photometry` in `do_vizier`, by the
+# bibcode of each, followed by the table where a paper has several. Specs
+# without a `name` or `name_column` are added to an entry given by the task.
+VIZIER_TABLES = OrderedDict([
+    ('2008MNRAS.384..107E', {
+        'catalog': [
+            'J/MNRAS/384/107/table3', 'J/MNRAS/384/107/table5',
+            'J/MNRAS/384/107/table4'
+        ],
+        'tables': [{}, {}, {
+            'values': {
+                PHOTOMETRY.SCORRECTED: True
+            }
+        }],
+        'bibcode': '2008MNRAS.384..107E',
+        'name': 'SN2002cv',
+        'time': 'JD',
+        'time_format': 'jd',
+        'upper_limit': ['>', '>='],
+        'columns': {
+            PHOTOMETRY.INSTRUMENT: 'Inst'
+        }
+    }),
+    ('2016ApJ...824....6O', {
+        'catalog': 'J/ApJ/824/6/table1',
+        'bibcode': '2016ApJ...824....6O',
+        'name': 'SN2015bh',
+        'time': 'MJD',
+        'upper_limit': ['>'],
+        'columns': {
+            PHOTOMETRY.COUNT_RATE: 'Cts',
+            PHOTOMETRY.E_COUNT_RATE: 'e_Cts'
+        }
+    }),
+    ('2016AJ....151..125Z', {
+        'catalog': 'J/AJ/151/125/table2',
+        'bibcode': '2016AJ....151..125Z',
+        'name': 'SN2013dy',
+        'time': 'MJD',
+        'upper_limit': ['>'],
+        'e_scale': '0.01',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2016ApJ...825L..22F', {
+        'catalog': 'J/ApJ/825/L22/table3',
+        'bibcode': '2016ApJ...825L..22F',
+        'name': 'iPTF13bvn',
+        'time': 'MJD',
+        'upper_limit': ['>'],
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2008ApJ...686..749K', {
+        'catalog': 'J/ApJ/686/749/table10',
+        'bibcode': '2008ApJ...686..749K',
+        'name_column': 'SN',
+        'time': 'JD',
+        'time_format': 'jd',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2013A&A...555A..10T', {
+        'catalog': ['J/A+A/555/A10/table4', 'J/A+A/555/A10/table5'],
+        'tables': [{
+            'band_suffix': "'",
+            'values': {
+                PHOTOMETRY.BAND_SET: 'SDSS',
+                PHOTOMETRY.SYSTEM: 'SDSS'
+            }
+        }, {}],
+        'bibcode': '2013A&A...555A..10T',
+        'name_column': 'SN',
+        'name_prefix': 'SN',
+        'time': 'Epoch',
+        'time_format': 'jd',
+        'time_offset': '2453000',
+        'e_valid': True,
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2009MNRAS.394.2266P', {
+        'catalog': 'J/MNRAS/394/2266/table4',
+        'bands': ['J', 'H', 'K'],
+        'time': 'JD',
+        'time_format': 'jd'
+    }),
+    ('2011ApJ...729..143C', {
+        'catalog': 'J/ApJ/729/143/table2',
+        'bands': ['J', 'H', 'Ks'],
+        'time': 'MJD',
+        'values': {
+            PHOTOMETRY.TELESCOPE: 'PAIRITEL',
+            PHOTOMETRY.SYSTEM: 'Vega'
+        }
+    }),
+    ('2011ApJ...728...14P table1', {
+        'catalog': 'J/ApJ/728/14/table1',
+        'bands': ['B', 'V', 'R', 'I'],
+        'time': 'JD',
+        'time_format': 'jd',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2011ApJ...728...14P table2', {
+        'catalog': 'J/ApJ/728/14/table2',
+        'bands': ['u', 'g', 'r', 'i', 'z'],
+        'band_suffix': "'",
+        'time': 'JD',
+        'time_format': 'jd',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2011ApJ...728...14P table3', {
+        'catalog': 'J/ApJ/728/14/table3',
+        'bands': ['Y', 'J', 'H'],
+        'time': 'JD',
+        'time_format': 'jd',
+        'columns': {
+            PHOTOMETRY.INSTRUMENT: 'Inst'
+        }
+    }),
+    ('2011PAZh...37..837T', {
+        'catalog': 'J/PAZh/37/837/table2',
+        'bands': ['U', 'B', 'V', 'R', 'I'],
+        'time': 'JD',
+        'time_format': 'jd',
+        'time_offset': '2455000',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2013MNRAS.433.1871B table3a', {
+        'catalog': 'J/MNRAS/433/1871/table3a',
+        'bands': ['U', 'B', 'V', 'Rc', 'Ic'],
+        'time': 'JD',
+        'time_format': 'jd',
+        'time_offset': '2456000',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2013MNRAS.433.1871B table3b', {
+        'catalog': 'J/MNRAS/433/1871/table3b',
+        'bands': ['g', 'r', 'i', 'z'],
+        'time': 'JD',
+        'time_format': 'jd',
+        'time_offset': '2456000',
+        'columns': {
+            PHOTOMETRY.TELESCOPE: 'Tel'
+        }
+    }),
+    ('2014AJ....148....1Z', {
+        'catalog': 'J/AJ/148/1/table2',
+        'bands': ['B', 'V', 'R', 'I'],
+        'time': 'MJD',
+        'values': {
+            PHOTOMETRY.TELESCOPE: 'LJT',
+            PHOTOMETRY.INSTRUMENT: 'YFOSC'
+        }
+    }),
+])
+
+# VizieR queries made by `do_vizier`, in order, so they can be prefetched.
+# Queries of the specs in `VIZIER_TABLES` are given by their labels.
+VIZIER_QUERIES = [
+    '2008MNRAS.384..107E',
+    '2016ApJ...824....6O',
+    '2016AJ....151..125Z',
+    'J/A+A/592/A40/table2',
+    ['J/A+A/593/A68/ph12os', 'J/A+A/593/A68/ph13bvn'],
+    '2016ApJ...825L..22F',
+    'J/ApJ/826/144/table1',
+    ['J/ApJ/756/173/table2', 'J/ApJ/756/173/table3'],
+    'J/ApJ/819/35/table2',
+    'J/other/NewA/20.30/table1',
+    'J/other/NewA/20.30/table2',
+    'J/other/NewA/20.30/table3',
+    '2008ApJ...686..749K',
+    'J/ApJ/686/749/table12',
+    '2013A&A...555A..10T',
+    'J/ApJ/820/33/table1',
+    'J/ApJ/820/33/table2',
+    'J/ApJS/200/12/table1',
+    'J/ApJ/746/85/table1',
+    'J/ApJ/746/85/table2',
+    'J/ApJ/602/571/table8',
+    'J/MNRAS/444/3258/SNe',
+    'J/MNRAS/438/1391/table2',
+    'J/ApJ/749/18/table1',
+    'J/A+A/523/A7/table9',
+    'J/A+A/415/863/table1',
+    'J/AJ/136/2306/sources',
+    'J/ApJ/708/661/sn',
+    'J/ApJ/708/661/table1',
+    'J/ApJ/795/44/ps1_snIa',
+    'J/ApJ/795/44/table6',
+    'II/189/mag',
+    'VII/272/snrs',
+    'J/MNRAS/442/844/table1',
+    'J/MNRAS/442/844/table2',
+    'J/MNRAS/425/1789/table1',
+    'J/ApJS/219/13/table3',
+    'J/ApJS/219/13/table2',
+    'J/other/Nat/491.228/tablef1',
+    'J/other/Nat/491.228/tablef2',
+    'J/other/Nat/474.484/tables1',
+    'J/ApJ/736/159/table1',
+    'J/ApJ/760/L33/table1',
+    'J/ApJ/769/39/table1',
+    'J/MNRAS/394/2266/table2',
+    'J/MNRAS/394/2266/table3',
+    '2009MNRAS.394.2266P',
+    'J/AJ/145/99/table1',
+    'J/ApJ/729/143/table1',
+    '2011ApJ...729..143C',
+    'J/ApJ/729/143/table4',
+    'J/ApJ/729/143/table5',
+    '2011ApJ...728...14P table1',
+    '2011ApJ...728...14P table2',
+    '2011ApJ...728...14P table3',
+    '2011PAZh...37..837T',
+    '2013MNRAS.433.1871B table3a',
+    '2013MNRAS.433.1871B table3b',
+    '2014AJ....148....1Z',
+    'J/AJ/148/1/table3',
+    'J/AJ/148/1/table5',
+    'J/ApJ/805/74/table1',
+    'J/ApJ/741/97/table2',
+    'J/MNRAS/448/1206/table3',
+    'J/MNRAS/448/1206/table4',
+    'J/MNRAS/448/1206/table5',
+    'J/MNRAS/448/1206/table6',
+    'J/MNRAS/448/1206/tablea2',
+    'J/MNRAS/448/1206/tablea3',
+    'J/AJ/143/126/table4',
+    'J/ApJS/220/9/table1',
+    'J/ApJS/220/9/table2',
+    'J/ApJS/220/9/table8',
+    'J/ApJ/673/999/table1',
+    'J/MNRAS/417/916/table2',
+    'J/MNRAS/430/1746/table4',
+    'J/AJ/148/13/high_z',
+    'J/AJ/148/13/low_z',
+    'J/ApJ/666/674/table3',
+    'J/AcA/63/1/table1',
+    'J/MNRAS/410/1262/tablea2',
+    'J/ApJ/755/61/table3',
+    'J/AJ/135/348/SNe',
+    'J/ApJ/713/1026/SNe',
+    'J/ApJ/770/107/galaxies',
+    'J/ApJ/738/162/table3',
+    'J/ApJ/738/162/table4',
+    'J/MNRAS/446/943/ngc2403',
+    'J/MNRAS/446/943/ngc2903',
+    'J/MNRAS/446/943/ngc300',
+    'J/MNRAS/446/943/ngc3077',
+    'J/MNRAS/446/943/ngc4214',
+    'J/MNRAS/446/943/ngc4395',
+    'J/MNRAS/446/943/ngc4449',
+    'J/MNRAS/446/943/ngc5204',
+    'J/MNRAS/446/943/ngc5585',
+    'J/MNRAS/446/943/ngc6946',
+    'J/MNRAS/446/943/ngc7793',
+    'J/MNRAS/446/943/m33',
+    'J/MNRAS/446/943/m74',
+    'J/MNRAS/446/943/m81',
+    'J/MNRAS/446/943/m82',
+    'J/MNRAS/446/943/m83',
+    'J/MNRAS/446/943/m101',
+    'J/MNRAS/446/943/m31',
+    'J/ApJ/703/370/tables',
+    'J/ApJ/821/57/table1',
+    'J/ApJ/821/57/table2',
+    'J/ApJ/821/57/table3',
+    'J/ApJ/821/57/table4',
+    'J/ApJ/607/665/table1',
+    'J/ApJ/607/665/table2',
+    'J/ApJ/607/665/table5'
+]
+
+VIZIER_CATALOGS = [
+    VIZIER_TABLES[x]['catalog'] if isinstance(x, str) and
+    x in VIZIER_TABLES else x for x in VIZIER_QUERIES
+]
 
 
 def do_vizier(catalog):
     """
     """
     task_str = catalog.get_current_task_str()
-
-    Vizier.ROW_LIMIT = -1
-    Vizier.VIZIER_SERVER = 'vizier.cfa.harvard.edu'
+    catalog.vizier.prefetch(VIZIER_CATALOGS)
 
     # 2008MNRAS.384..107E
-    results = Vizier.get_catalogs([
-        'J/MNRAS/384/107/table3', 'J/MNRAS/384/107/table5',
-        'J/MNRAS/384/107/table4'
-    ])
-    for ti, table in enumerate(results):
-        table.convert_bytestring_to_unicode(python3_only=True)
-        (name, source) = catalog.new_entry(
-            'SN2002cv', bibcode='2008MNRAS.384..107E')
-        for row in pbar(table, task_str):
-            row = convert_aq_output(row)
-            bands = [
-                x for x in row if x.endswith('mag') and not x.startswith('e_')
-            ]
-            for bandtag in bands:
-                band = bandtag.replace('mag', '')
-                if (bandtag in row and is_number(row[bandtag]) and
-                        not isnan(float(row[bandtag]))):
-                    photodict = {
-                        PHOTOMETRY.TIME: jd_to_mjd(Decimal(str(row['JD']))),
-                        PHOTOMETRY.U_TIME: 'MJD',
-                        PHOTOMETRY.BAND: band,
-                        PHOTOMETRY.MAGNITUDE: row[bandtag],
-                        PHOTOMETRY.SOURCE: source,
-                        PHOTOMETRY.INSTRUMENT: row['Inst']
-                    }
-                    if ti == 2:
-                        photodict[PHOTOMETRY.SCORRECTED] = True
-                    if row.get('l_' + bandtag, '') in ['>', '>=']:
-                        photodict[PHOTOMETRY.UPPER_LIMIT] = True
-                    else:
-                        if ('e_' + bandtag) in row:
-                            photodict[PHOTOMETRY.E_MAGNITUDE] = row['e_' +
-                                                                    bandtag]
-                    catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2008MNRAS.384..107E'],
+                         task_str)
     catalog.journal_entries()
 
     # 2016ApJ...824....6O
-    result = Vizier.get_catalogs('J/ApJ/824/6/table1')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    (name, source) = catalog.new_entry(
-        'SN2015bh', bibcode='2016ApJ...824....6O')
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        bands = [
-            x for x in row if x.endswith('mag') and not x.startswith('e_')
-        ]
-        for bandtag in bands:
-            band = bandtag.replace('mag', '')
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: str(row['MJD']),
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.COUNT_RATE: str(row['Cts']),
-                    PHOTOMETRY.E_COUNT_RATE: str(row['e_Cts']),
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.SOURCE: source
-                }
-                if row.get('l_' + bandtag, '') == '>':
-                    photodict[PHOTOMETRY.UPPER_LIMIT] = True
-                else:
-                    photodict[PHOTOMETRY.E_MAGNITUDE] = row['e_' + bandtag]
-                catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2016ApJ...824....6O'],
+                         task_str)
     catalog.journal_entries()
 
     # 2016AJ....151..125Z
-    result = Vizier.get_catalogs('J/AJ/151/125/table2')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    (name, source) = catalog.new_entry(
-        'SN2013dy', bibcode='2016AJ....151..125Z')
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        bands = [
-            x for x in row if x.endswith('mag') and not x.startswith('e_')
-        ]
-        for bandtag in bands:
-            band = bandtag.replace('mag', '')
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: str(row['MJD']),
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.SOURCE: source,
-                    PHOTOMETRY.TELESCOPE: row['Tel']
-                }
-                if row.get('l_' + bandtag, '') == '>':
-                    photodict[PHOTOMETRY.UPPER_LIMIT] = True
-                else:
-                    photodict[PHOTOMETRY.E_MAGNITUDE] = str(Decimal(
-                        '0.01') * Decimal(row['e_' + bandtag]))
-                catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2016AJ....151..125Z'],
+                         task_str)
     catalog.journal_entries()
 
     # 2016A&A...592..A40F
-    result = Vizier.get_catalogs('J/A+A/592/A40/table2')
+    result = catalog.vizier.get_catalogs('J/A+A/592/A40/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -146,7 +352,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2016A&A...593A..68F
-    results = Vizier.get_catalogs(
+    results = catalog.vizier.get_catalogs(
         ['J/A+A/593/A68/ph12os', 'J/A+A/593/A68/ph13bvn'])
     for ti, table in enumerate(results):
         table.convert_bytestring_to_unicode(python3_only=True)
@@ -166,37 +372,12 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2016ApJ...825L..22F
-    result = Vizier.get_catalogs('J/ApJ/825/L22/table3')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    (name, source) = catalog.new_entry(
-        'iPTF13bvn', bibcode='2016ApJ...825L..22F')
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        bands = [
-            x for x in row if x.endswith('mag') and not x.startswith('e_')
-        ]
-        for bandtag in bands:
-            band = bandtag.replace('mag', '')
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: str(row['MJD']),
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.SOURCE: source,
-                    PHOTOMETRY.TELESCOPE: row['Tel']
-                }
-                if row.get('l_' + bandtag, '') == '>':
-                    photodict[PHOTOMETRY.UPPER_LIMIT] = True
-                else:
-                    photodict[PHOTOMETRY.E_MAGNITUDE] = row['e_' + bandtag]
-                catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2016ApJ...825L..22F'],
+                         task_str)
     catalog.journal_entries()
 
     # 2016ApJ...826..144S
-    result = Vizier.get_catalogs('J/ApJ/826/144/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/826/144/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     (name, source) = catalog.new_entry(
@@ -220,7 +401,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012ApJ...756..173S
-    results = Vizier.get_catalogs(
+    results = catalog.vizier.get_catalogs(
         ['J/ApJ/756/173/table2', 'J/ApJ/756/173/table3'])
     for ti, table in enumerate(results):
         table.convert_bytestring_to_unicode(python3_only=True)
@@ -255,7 +436,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2016ApJ...819...35A
-    result = Vizier.get_catalogs('J/ApJ/819/35/table2')
+    result = catalog.vizier.get_catalogs('J/ApJ/819/35/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -281,8 +462,8 @@ def do_vizier(catalog):
     errdict = {'B': '0.011', 'V': '0.007', 'Rc': '0.010', 'Ic': '0.016'}
     snnames = ['SN2011fe', 'SN2012cg', 'SN2012aw']
     for sni in range(3):
-        results = Vizier.get_catalogs('J/other/NewA/20.30/table' + str(sni +
-                                                                       1))
+        results = catalog.vizier.get_catalogs(
+            'J/other/NewA/20.30/table' + str(sni + 1))
         for ti, table in enumerate(results):
             table.convert_bytestring_to_unicode(python3_only=True)
             for row in pbar(table, task_str):
@@ -316,31 +497,9 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2008ApJ...686..749K
-    result = Vizier.get_catalogs('J/ApJ/686/749/table10')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        name, source = catalog.new_entry(
-            row['SN'], bibcode='2008ApJ...686..749K')
-        bands = [
-            x for x in row if x.endswith('mag') and not x.startswith('e_')
-        ]
-        for bandtag in bands:
-            band = bandtag.replace('mag', '')
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: jd_to_mjd(Decimal(row['JD'])),
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.E_MAGNITUDE: row['e_' + bandtag],
-                    PHOTOMETRY.SOURCE: source,
-                    PHOTOMETRY.TELESCOPE: row['Tel']
-                }
-                catalog.entries[name].add_photometry(**photodict)
-    result = Vizier.get_catalogs('J/ApJ/686/749/table12')
+    add_table_photometry(catalog, VIZIER_TABLES['2008ApJ...686..749K'],
+                         task_str)
+    result = catalog.vizier.get_catalogs('J/ApJ/686/749/table12')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -374,47 +533,12 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2013A&A...555A..10T
-    results = Vizier.get_catalogs(
-        ['J/A+A/555/A10/table4', 'J/A+A/555/A10/table5'])
-    for ti, table in enumerate(results):
-        table.convert_bytestring_to_unicode(python3_only=True)
-        for row in pbar(table, task_str):
-            row = convert_aq_output(row)
-            name = row['SN']
-            if is_number(name[:4]):
-                name = 'SN' + name
-            name, source = catalog.new_entry(
-                name, bibcode='2013A&A...555A..10T')
-            bands = [
-                x for x in row if x.endswith('mag') and not x.startswith('e_')
-            ]
-            for bandtag in bands:
-                band = bandtag.replace('mag', '')
-                if (bandtag in row and is_number(row[bandtag]) and
-                        not isnan(float(row[bandtag]))):
-                    photodict = {
-                        PHOTOMETRY.TIME: str(
-                            jd_to_mjd(
-                                Decimal(str(row['Epoch'])) + Decimal(
-                                    '2453000'))),
-                        PHOTOMETRY.U_TIME: 'MJD',
-                        PHOTOMETRY.MAGNITUDE: row[bandtag],
-                        PHOTOMETRY.SOURCE: source,
-                        PHOTOMETRY.TELESCOPE: row['Tel']
-                    }
-                    if ti == 0:
-                        photodict[PHOTOMETRY.BAND_SET] = 'SDSS'
-                        photodict[PHOTOMETRY.SYSTEM] = 'SDSS'
-                        band = band + "'"
-                    photodict[PHOTOMETRY.BAND] = band
-                    if (is_number(row['e_' + bandtag]) and
-                            not isnan(float(row['e_' + bandtag]))):
-                        photodict[PHOTOMETRY.E_MAGNITUDE] = row['e_' + bandtag]
-                    catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2013A&A...555A..10T'],
+                         task_str)
     catalog.journal_entries()
 
     # 2016ApJ...820...33R
-    result = Vizier.get_catalogs('J/ApJ/820/33/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/820/33/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -428,7 +552,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(
             SUPERNOVA.REDSHIFT, str(row['z']), source, kind='spectroscopic')
 
-    result = Vizier.get_catalogs('J/ApJ/820/33/table2')
+    result = catalog.vizier.get_catalogs('J/ApJ/820/33/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -452,7 +576,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012ApJS..200...12H
-    result = Vizier.get_catalogs('J/ApJS/200/12/table1')
+    result = catalog.vizier.get_catalogs('J/ApJS/200/12/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     oldname = ''
@@ -483,7 +607,7 @@ def do_vizier(catalog):
                                            source)
 
     # 2012ApJ...746...85S
-    result = Vizier.get_catalogs('J/ApJ/746/85/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/746/85/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     oldname = ''
@@ -512,7 +636,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.DEC, row['DEJ2000'],
                                            source)
 
-    result = Vizier.get_catalogs('J/ApJ/746/85/table2')
+    result = catalog.vizier.get_catalogs('J/ApJ/746/85/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     oldname = ''
@@ -540,7 +664,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_photometry(**photodict)
 
     # 2004ApJ...602..571B
-    result = Vizier.get_catalogs('J/ApJ/602/571/table8')
+    result = catalog.vizier.get_catalogs('J/ApJ/602/571/table8')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     oldname = ''
@@ -576,7 +700,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_photometry(**photodict)
 
     # 2014MNRAS.444.3258M
-    result = Vizier.get_catalogs('J/MNRAS/444/3258/SNe')
+    result = catalog.vizier.get_catalogs('J/MNRAS/444/3258/SNe')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     oldname = ''
@@ -603,7 +727,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2014MNRAS.438.1391P
-    result = Vizier.get_catalogs('J/MNRAS/438/1391/table2')
+    result = catalog.vizier.get_catalogs('J/MNRAS/438/1391/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -622,7 +746,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012ApJ...749...18B
-    result = Vizier.get_catalogs('J/ApJ/749/18/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/749/18/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -657,7 +781,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2010A&A...523A...7G
-    result = Vizier.get_catalogs('J/A+A/523/A7/table9')
+    result = catalog.vizier.get_catalogs('J/A+A/523/A7/table9')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -688,7 +812,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2004A&A...415..863G
-    result = Vizier.get_catalogs('J/A+A/415/863/table1')
+    result = catalog.vizier.get_catalogs('J/A+A/415/863/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -723,7 +847,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2008AJ....136.2306H
-    result = Vizier.get_catalogs('J/AJ/136/2306/sources')
+    result = catalog.vizier.get_catalogs('J/AJ/136/2306/sources')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -742,7 +866,7 @@ def do_vizier(catalog):
                                            source)
 
     # 2010ApJ...708..661D
-    result = Vizier.get_catalogs('J/ApJ/708/661/sn')
+    result = catalog.vizier.get_catalogs('J/ApJ/708/661/sn')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -765,7 +889,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.DEC, row['DEJ2000'],
                                            source)
 
-    result = Vizier.get_catalogs('J/ApJ/708/661/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/708/661/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -783,7 +907,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2014ApJ...795...44R
-    result = Vizier.get_catalogs('J/ApJ/795/44/ps1_snIa')
+    result = catalog.vizier.get_catalogs('J/ApJ/795/44/ps1_snIa')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -810,7 +934,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, 'Ia', source, kind='spectroscopic')
 
-    result = Vizier.get_catalogs('J/ApJ/795/44/table6')
+    result = catalog.vizier.get_catalogs('J/ApJ/795/44/table6')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -836,7 +960,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 1990A&AS...82..145C
-    result = Vizier.get_catalogs('II/189/mag')
+    result = catalog.vizier.get_catalogs('II/189/mag')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
 
@@ -893,7 +1017,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2014yCat.7272....0G
-    result = Vizier.get_catalogs('VII/272/snrs')
+    result = catalog.vizier.get_catalogs('VII/272/snrs')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
 
@@ -949,7 +1073,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2014MNRAS.442..844F
-    result = Vizier.get_catalogs('J/MNRAS/442/844/table1')
+    result = catalog.vizier.get_catalogs('J/MNRAS/442/844/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -968,7 +1092,7 @@ def do_vizier(catalog):
                                            str(row['E_B-V_']), source)
     catalog.journal_entries()
 
-    result = Vizier.get_catalogs('J/MNRAS/442/844/table2')
+    result = catalog.vizier.get_catalogs('J/MNRAS/442/844/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     instr = 'KAIT'
@@ -997,7 +1121,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012MNRAS.425.1789S
-    result = Vizier.get_catalogs('J/MNRAS/425/1789/table1')
+    result = catalog.vizier.get_catalogs('J/MNRAS/425/1789/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1022,7 +1146,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2015ApJS..219...13W
-    result = Vizier.get_catalogs('J/ApJS/219/13/table3')
+    result = catalog.vizier.get_catalogs('J/ApJS/219/13/table3')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1046,7 +1170,7 @@ def do_vizier(catalog):
                                            source)
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, 'Ia', source, kind='spectroscopic')
-    result = Vizier.get_catalogs('J/ApJS/219/13/table2')
+    result = catalog.vizier.get_catalogs('J/ApJS/219/13/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1072,7 +1196,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012Natur.491..228C
-    result = Vizier.get_catalogs('J/other/Nat/491.228/tablef1')
+    result = catalog.vizier.get_catalogs('J/other/Nat/491.228/tablef1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'SN2213-1745'
@@ -1097,7 +1221,7 @@ def do_vizier(catalog):
                 }
                 catalog.entries[name].add_photometry(**photodict)
 
-    result = Vizier.get_catalogs('J/other/Nat/491.228/tablef2')
+    result = catalog.vizier.get_catalogs('J/other/Nat/491.228/tablef2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'SN1000+0216'
@@ -1124,7 +1248,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011Natur.474..484Q
-    result = Vizier.get_catalogs('J/other/Nat/474.484/tables1')
+    result = catalog.vizier.get_catalogs('J/other/Nat/474.484/tables1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1147,7 +1271,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011ApJ...736..159G
-    result = Vizier.get_catalogs('J/ApJ/736/159/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/736/159/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'PTF10vdl'
@@ -1171,7 +1295,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012ApJ...760L..33B
-    result = Vizier.get_catalogs('J/ApJ/760/L33/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/760/L33/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'PTF12gzk'
@@ -1196,7 +1320,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2013ApJ...769...39S
-    result = Vizier.get_catalogs('J/ApJ/769/39/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/769/39/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'PS1-12sk'
@@ -1232,7 +1356,7 @@ def do_vizier(catalog):
     name = catalog.add_entry(name)
     source = catalog.entries[name].add_source(bibcode='2009MNRAS.394.2266P')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
-    result = Vizier.get_catalogs('J/MNRAS/394/2266/table2')
+    result = catalog.vizier.get_catalogs('J/MNRAS/394/2266/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1266,7 +1390,7 @@ def do_vizier(catalog):
             }
             catalog.entries[name].add_photometry(**photodict)
 
-    result = Vizier.get_catalogs('J/MNRAS/394/2266/table3')
+    result = catalog.vizier.get_catalogs('J/MNRAS/394/2266/table3')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1287,26 +1411,12 @@ def do_vizier(catalog):
                     source=source,
                     upperlimit=(row['l_' + bandtag] == '>'))
 
-    result = Vizier.get_catalogs('J/MNRAS/394/2266/table4')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        for band in ['J', 'H', 'K']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=str(jd_to_mjd(Decimal(row['JD']))),
-                    u_time='MJD',
-                    band=band,
-                    magnitude=row[bandtag],
-                    e_magnitude=row['e_' + bandtag],
-                    source=source)
+    add_table_photometry(catalog, VIZIER_TABLES['2009MNRAS.394.2266P'],
+                         task_str, name=name, source=source)
     catalog.journal_entries()
 
     # 2013AJ....145...99A
-    result = Vizier.get_catalogs('J/AJ/145/99/table1')
+    result = catalog.vizier.get_catalogs('J/AJ/145/99/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     name = 'SN2003ie'
@@ -1349,7 +1459,7 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2011ApJ...729..143C')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/ApJ/729/143/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/729/143/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1368,28 +1478,10 @@ def do_vizier(catalog):
         }
         catalog.entries[name].add_photometry(**photodict)
 
-    result = Vizier.get_catalogs('J/ApJ/729/143/table2')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        for band in ['J', 'H', 'Ks']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: row["MJD"],
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.TELESCOPE: "PAIRITEL",
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.E_MAGNITUDE: row["e_" + bandtag],
-                    PHOTOMETRY.SYSTEM: 'Vega',
-                    PHOTOMETRY.SOURCE: source
-                }
-                catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2011ApJ...729..143C'],
+                         task_str, name=name, source=source)
 
-    result = Vizier.get_catalogs('J/ApJ/729/143/table4')
+    result = catalog.vizier.get_catalogs('J/ApJ/729/143/table4')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1406,7 +1498,7 @@ def do_vizier(catalog):
         }
         catalog.entries[name].add_photometry(**photodict)
 
-    result = Vizier.get_catalogs('J/ApJ/729/143/table5')
+    result = catalog.vizier.get_catalogs('J/ApJ/729/143/table5')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1431,61 +1523,10 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2011ApJ...728...14P')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/ApJ/728/14/table1')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        for band in ['B', 'V', 'R', 'I']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=str(jd_to_mjd(Decimal(row["JD"]))),
-                    u_time='MJD',
-                    telescope=row["Tel"],
-                    band=band,
-                    magnitude=row[bandtag],
-                    e_magnitude=row["e_" + bandtag],
-                    source=source)
-
-    result = Vizier.get_catalogs('J/ApJ/728/14/table2')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        for band in ['u', 'g', 'r', 'i', 'z']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=str(jd_to_mjd(Decimal(row["JD"]))),
-                    u_time='MJD',
-                    telescope=row["Tel"],
-                    band=band + "'",
-                    magnitude=row[bandtag],
-                    e_magnitude=row["e_" + bandtag],
-                    source=source)
-
-    result = Vizier.get_catalogs('J/ApJ/728/14/table3')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        for band in ['Y', 'J', 'H']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: str(jd_to_mjd(Decimal(row["JD"]))),
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.INSTRUMENT: row['Inst'],
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.E_MAGNITUDE: row["e_" + bandtag],
-                    PHOTOMETRY.SOURCE: source
-                }
-                catalog.entries[name].add_photometry(**photodict)
+    for table in ['table1', 'table2', 'table3']:
+        add_table_photometry(
+            catalog, VIZIER_TABLES['2011ApJ...728...14P ' + table], task_str,
+            name=name, source=source)
     catalog.journal_entries()
 
     # 2011PAZh...37..837T
@@ -1494,24 +1535,8 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2011PAZh...37..837T')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/PAZh/37/837/table2')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        mjd = str(jd_to_mjd(Decimal(row['JD']) + Decimal('2455000')))
-        for band in ['U', 'B', 'V', 'R', 'I']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=mjd,
-                    u_time='MJD',
-                    telescope=row["Tel"],
-                    band=band,
-                    magnitude=row[bandtag],
-                    e_magnitude=row["e_" + bandtag],
-                    source=source)
+    add_table_photometry(catalog, VIZIER_TABLES['2011PAZh...37..837T'],
+                         task_str, name=name, source=source)
     catalog.journal_entries()
 
     # 2013MNRAS.433.1871B
@@ -1520,43 +1545,10 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2013MNRAS.433.1871B')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/MNRAS/433/1871/table3a')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        mjd = str(jd_to_mjd(Decimal(row['JD']) + Decimal('2456000')))
-        for band in ['U', 'B', 'V', 'Rc', 'Ic']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=mjd,
-                    u_time='MJD',
-                    telescope=row["Tel"],
-                    band=band,
-                    magnitude=row[bandtag],
-                    e_magnitude=row["e_" + bandtag],
-                    source=source)
-
-    result = Vizier.get_catalogs('J/MNRAS/433/1871/table3b')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        mjd = str(jd_to_mjd(Decimal(row['JD']) + Decimal('2456000')))
-        for band in ['g', 'r', 'i', 'z']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                catalog.entries[name].add_photometry(
-                    time=mjd,
-                    u_time='MJD',
-                    telescope=row["Tel"],
-                    band=band,
-                    magnitude=row[bandtag],
-                    e_magnitude=row["e_" + bandtag],
-                    source=source)
+    for table in ['table3a', 'table3b']:
+        add_table_photometry(
+            catalog, VIZIER_TABLES['2013MNRAS.433.1871B ' + table], task_str,
+            name=name, source=source)
     catalog.journal_entries()
 
     # 2014AJ....148....1Z
@@ -1565,29 +1557,10 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2014AJ....148....1Z')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/AJ/148/1/table2')
-    table = result[list(result.keys())[0]]
-    table.convert_bytestring_to_unicode(python3_only=True)
-    for row in pbar(table, task_str):
-        row = convert_aq_output(row)
-        mjd = row['MJD']
-        for band in ['B', 'V', 'R', 'I']:
-            bandtag = band + 'mag'
-            if (bandtag in row and is_number(row[bandtag]) and
-                    not isnan(float(row[bandtag]))):
-                photodict = {
-                    PHOTOMETRY.TIME: mjd,
-                    PHOTOMETRY.U_TIME: 'MJD',
-                    PHOTOMETRY.TELESCOPE: "LJT",
-                    PHOTOMETRY.INSTRUMENT: "YFOSC",
-                    PHOTOMETRY.BAND: band,
-                    PHOTOMETRY.MAGNITUDE: row[bandtag],
-                    PHOTOMETRY.E_MAGNITUDE: row["e_" + bandtag],
-                    PHOTOMETRY.SOURCE: source
-                }
-                catalog.entries[name].add_photometry(**photodict)
+    add_table_photometry(catalog, VIZIER_TABLES['2014AJ....148....1Z'],
+                         task_str, name=name, source=source)
 
-    result = Vizier.get_catalogs('J/AJ/148/1/table3')
+    result = catalog.vizier.get_catalogs('J/AJ/148/1/table3')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1609,7 +1582,7 @@ def do_vizier(catalog):
                 }
                 catalog.entries[name].add_photometry(**photodict)
 
-    result = Vizier.get_catalogs('J/AJ/148/1/table5')
+    result = catalog.vizier.get_catalogs('J/AJ/148/1/table5')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1635,7 +1608,7 @@ def do_vizier(catalog):
     source = catalog.entries[name].add_source(bibcode='2014AJ....148....1Z')
     catalog.entries[name].add_quantity(SUPERNOVA.ALIAS, name, source)
 
-    result = Vizier.get_catalogs('J/ApJ/805/74/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/805/74/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1670,7 +1643,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011ApJ...741...97D
-    result = Vizier.get_catalogs('J/ApJ/741/97/table2')
+    result = catalog.vizier.get_catalogs('J/ApJ/741/97/table2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1692,7 +1665,7 @@ def do_vizier(catalog):
 
     # 2015MNRAS.448.1206M
     # Note: Photometry from two SN can also be added from this source.
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/table3')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/table3')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1715,7 +1688,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.MAX_BAND, 'r', source)
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, 'Ia', source, kind='spectroscopic')
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/table4')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/table4')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1742,7 +1715,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.MAX_BAND, 'r', source)
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, 'Ia?', source, kind='photometric')
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/table5')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/table5')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1765,7 +1738,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.MAX_BAND, 'r', source)
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, row['Type'], source, kind='spectroscopic')
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/table6')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/table6')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1786,7 +1759,7 @@ def do_vizier(catalog):
         catalog.entries[name].add_quantity(SUPERNOVA.MAX_BAND, 'r', source)
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, row['Type'], source, kind='photometric')
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/tablea2')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/tablea2')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1815,7 +1788,7 @@ def do_vizier(catalog):
             row['Typepsnid'] + '?',
             source,
             kind='photometric')
-    result = Vizier.get_catalogs('J/MNRAS/448/1206/tablea3')
+    result = catalog.vizier.get_catalogs('J/MNRAS/448/1206/tablea3')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1839,7 +1812,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012AJ....143..126B
-    result = Vizier.get_catalogs('J/AJ/143/126/table4')
+    result = catalog.vizier.get_catalogs('J/AJ/143/126/table4')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1857,7 +1830,7 @@ def do_vizier(catalog):
 
     # 2015ApJS..220....9F
     for viztab in ['1', '2']:
-        result = Vizier.get_catalogs('J/ApJS/220/9/table' + viztab)
+        result = catalog.vizier.get_catalogs('J/ApJS/220/9/table' + viztab)
         table = result[list(result.keys())[0]]
         table.convert_bytestring_to_unicode(python3_only=True)
         for row in pbar(table, task_str):
@@ -1887,7 +1860,7 @@ def do_vizier(catalog):
                 e_value=row['e_z'],
                 kind=kind)
 
-    result = Vizier.get_catalogs('J/ApJS/220/9/table8')
+    result = catalog.vizier.get_catalogs('J/ApJS/220/9/table8')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1908,7 +1881,7 @@ def do_vizier(catalog):
             source=source)
     catalog.journal_entries()
 
-    result = Vizier.get_catalogs('J/ApJ/673/999/table1')
+    result = catalog.vizier.get_catalogs('J/ApJ/673/999/table1')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1935,7 +1908,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011MNRAS.417..916G
-    result = Vizier.get_catalogs("J/MNRAS/417/916/table2")
+    result = catalog.vizier.get_catalogs("J/MNRAS/417/916/table2")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1964,7 +1937,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2013MNRAS.430.1746G
-    result = Vizier.get_catalogs("J/MNRAS/430/1746/table4")
+    result = catalog.vizier.get_catalogs("J/MNRAS/430/1746/table4")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -1987,7 +1960,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2014AJ....148...13R
-    result = Vizier.get_catalogs("J/AJ/148/13/high_z")
+    result = catalog.vizier.get_catalogs("J/AJ/148/13/high_z")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2021,7 +1994,7 @@ def do_vizier(catalog):
             source,
             kind='host',
             e_value=row['e_zhost'])
-    result = Vizier.get_catalogs("J/AJ/148/13/low_z")
+    result = catalog.vizier.get_catalogs("J/AJ/148/13/low_z")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2058,7 +2031,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2007ApJ...666..674M
-    result = Vizier.get_catalogs("J/ApJ/666/674/table3")
+    result = catalog.vizier.get_catalogs("J/ApJ/666/674/table3")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2091,7 +2064,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2013AcA....63....1K
-    result = Vizier.get_catalogs("J/AcA/63/1/table1")
+    result = catalog.vizier.get_catalogs("J/AcA/63/1/table1")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2113,7 +2086,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011MNRAS.410.1262W
-    result = Vizier.get_catalogs("J/MNRAS/410/1262/tablea2")
+    result = catalog.vizier.get_catalogs("J/MNRAS/410/1262/tablea2")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2133,7 +2106,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2012ApJ...755...61S
-    result = Vizier.get_catalogs("J/ApJ/755/61/table3")
+    result = catalog.vizier.get_catalogs("J/ApJ/755/61/table3")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2159,7 +2132,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2008AJ....135..348S
-    result = Vizier.get_catalogs("J/AJ/135/348/SNe")
+    result = catalog.vizier.get_catalogs("J/AJ/135/348/SNe")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2186,7 +2159,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2010ApJ...713.1026D
-    result = Vizier.get_catalogs("J/ApJ/713/1026/SNe")
+    result = catalog.vizier.get_catalogs("J/ApJ/713/1026/SNe")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2207,7 +2180,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2013ApJ...770..107C
-    result = Vizier.get_catalogs("J/ApJ/770/107/galaxies")
+    result = catalog.vizier.get_catalogs("J/ApJ/770/107/galaxies")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2227,7 +2200,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2011ApJ...738..162S
-    result = Vizier.get_catalogs("J/ApJ/738/162/table3")
+    result = catalog.vizier.get_catalogs("J/ApJ/738/162/table3")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2249,7 +2222,7 @@ def do_vizier(catalog):
             e_value=row['e_z'])
         catalog.entries[name].add_quantity(
             SUPERNOVA.CLAIMED_TYPE, 'Ia', source, probability=row['PzIa'])
-    result = Vizier.get_catalogs("J/ApJ/738/162/table4")
+    result = catalog.vizier.get_catalogs("J/ApJ/738/162/table4")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2276,7 +2249,7 @@ def do_vizier(catalog):
         "m81", "m82", "m83", "m101", "m31"
     ]
     for tab in pbar(snrtabs, task_str):
-        result = Vizier.get_catalogs("J/MNRAS/446/943/" + tab)
+        result = catalog.vizier.get_catalogs("J/MNRAS/446/943/" + tab)
         table = result[list(result.keys())[0]]
         table.convert_bytestring_to_unicode(python3_only=True)
         for ri, row in enumerate(pbar(table, task_str)):
@@ -2300,7 +2273,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2009ApJ...703..370C
-    result = Vizier.get_catalogs("J/ApJ/703/370/tables")
+    result = catalog.vizier.get_catalogs("J/ApJ/703/370/tables")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2319,7 +2292,7 @@ def do_vizier(catalog):
 
     # 2016ApJ...821...57D
     name, source = catalog.new_entry('SN2013ge', bibcode="2016ApJ...821...57D")
-    result = Vizier.get_catalogs("J/ApJ/821/57/table1")
+    result = catalog.vizier.get_catalogs("J/ApJ/821/57/table1")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2339,7 +2312,7 @@ def do_vizier(catalog):
                     PHOTOMETRY.SOURCE: source
                 }
                 catalog.entries[name].add_photometry(**photodict)
-    result = Vizier.get_catalogs("J/ApJ/821/57/table2")
+    result = catalog.vizier.get_catalogs("J/ApJ/821/57/table2")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2358,7 +2331,7 @@ def do_vizier(catalog):
                     PHOTOMETRY.SOURCE: source
                 }
                 catalog.entries[name].add_photometry(**photodict)
-    result = Vizier.get_catalogs("J/ApJ/821/57/table3")
+    result = catalog.vizier.get_catalogs("J/ApJ/821/57/table3")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2377,7 +2350,7 @@ def do_vizier(catalog):
                     PHOTOMETRY.SOURCE: source
                 }
                 catalog.entries[name].add_photometry(**photodict)
-    result = Vizier.get_catalogs("J/ApJ/821/57/table4")
+    result = catalog.vizier.get_catalogs("J/ApJ/821/57/table4")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2406,7 +2379,7 @@ def do_vizier(catalog):
     catalog.journal_entries()
 
     # 2004ApJ...607..665R
-    result = Vizier.get_catalogs("J/ApJ/607/665/table1")
+    result = catalog.vizier.get_catalogs("J/ApJ/607/665/table1")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2419,7 +2392,7 @@ def do_vizier(catalog):
                                            source)
         catalog.entries[name].add_quantity(SUPERNOVA.DEC, row['DEJ2000'],
                                            source)
-    result = Vizier.get_catalogs("J/ApJ/607/665/table2")
+    result = catalog.vizier.get_catalogs("J/ApJ/607/665/table2")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2437,7 +2410,7 @@ def do_vizier(catalog):
             PHOTOMETRY.SOURCE: source
         }
         catalog.entries[name].add_photometry(**photodict)
-    result = Vizier.get_catalogs("J/ApJ/607/665/table5")
+    result = catalog.vizier.get_catalogs("J/ApJ/607/665/table5")
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
     for row in pbar(table, task_str):
@@ -2455,8 +2428,7 @@ def do_lennarz(catalog):
     """
     """
     task_str = catalog.get_current_task_str()
-    Vizier.ROW_LIMIT = -1
-    result = Vizier.get_catalogs('J/A+A/538/A120/usc')
+    result = catalog.vizier.get_catalogs('J/A+A/538/A120/usc')
     table = result[list(result.keys())[0]]
     table.convert_bytestring_to_unicode(python3_only=True)
 
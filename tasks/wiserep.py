@@ -7,12 +7,11 @@ import warnings
 from glob import glob
 from html import unescape
 
-from astropy.time import Time as astrotime
-
 from astrocats.catalog.source import SOURCE
 from astrocats.catalog.utils import is_number, pbar, pbar_strings, uniq_cdl
 
 from ..supernova import SUPERNOVA
+from ..utils import iso_to_mjd
 
 
 def do_wiserep_spectra(catalog):
@@ -144,7 +143,7 @@ def do_wiserep_spectra(catalog):
                 errors = ''
                 if len(data) == 3:
                     errors = data[1]
-                time = str(astrotime(epoch).mjd)
+                time = str(iso_to_mjd(epoch))
 
                 if max([float(x) for x in fluxes]) < 1.0e-5:
                     fluxunit = 'erg/s/cm^2/Angstrom'
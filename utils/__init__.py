@@ -1,9 +1,34 @@
-from . import clean, compare, sorting
+from . import (ads, asciitable, clean, compare, coords, cosmology, dates,
+               dust, entries, lazy, sorting, store, tables, tns, vizier)
+from .ads import *
+from .asciitable import *
 from .clean import *
 from .compare import *
+from .coords import *
+from .cosmology import *
+from .dates import *
+from .dust import *
+from .entries import *
+from .lazy import *
 from .sorting import *
+from .store import *
+from .tables import *
+from .tns import *
+from .vizier import *
 
 __all__ = []
 __all__.extend(sorting.__all__)
 __all__.extend(clean.__all__)
+__all__.extend(ads.__all__)
+__all__.extend(asciitable.__all__)
 __all__.extend(compare.__all__)
+__all__.extend(coords.__all__)
+__all__.extend(cosmology.__all__)
+__all__.extend(dates.__all__)
+__all__.extend(dust.__all__)
+__all__.extend(entries.__all__)
+__all__.extend(lazy.__all__)
+__all__.extend(store.__all__)
+__all__.extend(tables.__all__)
+__all__.extend(tns.__all__)
+__all__.extend(vizier.__all__)
@@ -0,0 +1,43 @@
+'''Resolve bibcodes to short author strings through ADS.
+'''
+import time
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from http.client import HTTPException
+
+__all__ = ['query_bibauthor', 'query_bibauthors']
+
+
+def query_bibauthor(url, bibcode, retries=3, timeout=30.0, backoff=2.0):
+    """Return the ADS author string of `bibcode`, or '' if none was found.
+
+    `url` is the ADS abstract service prefix (`Catalog.ADS_BIB_URL`). Failed
+    requests are retried with exponential backoff.
+    """
+    adsquery = (url + urllib.parse.quote(bibcode) +
+                '&data_type=Custom&format=%253m%20%25(y)')
+    for attempt in range(retries):
+        try:
+            with urllib.request.urlopen(adsquery, timeout=timeout) as response:
+                html = response.read().decode('utf-8')
+        except (OSError, ValueError, HTTPException):
+            if attempt + 1 < retries:
+                time.sleep(backoff * 2 ** attempt)
+            continue
+        hsplit = html.split("\n")
+        return unescape(hsplit[5]).strip() if len(hsplit) > 5 else ''
+    return ''
+
+
+def query_bibauthors(url, bibcodes, threads=8, **kwargs):
+    """Resolve `bibcodes` concurrently, returning an ordered dict of author
+    strings in the order the bibcodes were given.
+    """
+    bibcodes = list(bibcodes)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        authors = executor.map(
+            lambda x: query_bibauthor(url, x, **kwargs), bibcodes)
+        return OrderedDict(zip(bibcodes, authors))
@@ -0,0 +1,76 @@
+'''Read delimited text tables into columns.
+'''
+import csv
+from decimal import Decimal
+
+import numpy as np
+from astrocats.catalog.utils import is_number, jd_to_mjd
+
+__all__ = ['AsciiTable']
+
+
+class AsciiTable(object):
+    """A delimited text file, split into rows by `csv.reader`.
+
+    The file is read once and closed. If `comment` is set, rows whose first
+    cell starts with it are kept apart in `comments`, and empty rows are
+    dropped; otherwise `rows` holds every row of the file. The first `skip`
+    rows are dropped before that. Columns are returned as NumPy arrays, so
+    that masks and conversions apply to a whole column at once.
+    """
+
+    # Cells that stand for a missing number.
+    MISSING = ('', '-', '--', '–', 'NaN', 'nan')
+
+    def __init__(self, path, delimiter='\t', comment=None, skip=0,
+                 skipinitialspace=True, **kwargs):
+        """Read the table at `path`, passing `kwargs` to `csv.reader`."""
+        with open(path, 'r') as f:
+            rows = list(csv.reader(f, delimiter=delimiter,
+                                   skipinitialspace=skipinitialspace,
+                                   **kwargs))[skip:]
+        self.comments = []
+        if comment is not None:
+            self.comments = [x for x in rows if x and x[0].startswith(comment)]
+            rows = [x for x in rows if x and not x[0].startswith(comment)]
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, index):
+        """Return cell `index` of each row as strings, counting from the end
+        of each row if negative, and '' where a row is too short.
+        """
+        cells = np.empty(len(self.rows), dtype=object)
+        cells[:] = [
+            x[index] if -len(x) <= index < len(x) else '' for x in self.rows
+        ]
+        return cells
+
+    def numbers(self, index, missing=MISSING):
+        """Return cell `index` of each row as floats, NaN where the cell is
+        not a number or is one of `missing`.
+        """
+        cells = self.column(index)
+        try:
+            values = cells.astype(float)
+        except ValueError:
+            values = np.array(
+                [float(x) if is_number(x) else np.nan for x in cells])
+        if len(missing):
+            values[np.isin(cells, list(missing))] = np.nan
+        return values
+
+    def mjd(self, index, offset=None):
+        """Return the Julian dates in cell `index` of each row as MJD strings,
+        adding `offset` first. Decimal arithmetic keeps every digit given.
+        """
+        cells = self.column(index)
+        converted = {}
+        for cell in set(cells):
+            jd = Decimal(cell)
+            if offset:
+                jd += Decimal(offset)
+            converted[cell] = str(jd_to_mjd(jd))
+        return np.array([converted[x] for x in cells], dtype=object)
@@ -1,23 +1,53 @@
 '''Clean various supernova-specific values.
 '''
+import urllib.parse
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from html import unescape
 from math import floor
+from types import MappingProxyType
 
+import numpy as np
 from astrocats.catalog.utils import (get_sig_digits, is_integer, is_number,
-                                     pretty_num, zpad)
+                                     pretty_num, round_sig, zpad)
 
 from decimal import Decimal
 
-__all__ = ['name_clean', 'host_clean', 'radec_clean', 'clean_snname']
+__all__ = ['name_clean', 'host_clean', 'radec_clean', 'radec_clean_array',
+           'clean_snname', 'invert_synonyms', 'clean_bibcode']
 
 
-def name_clean(name):
-    newname = name.strip(' ;,*.')
-    if newname.startswith('NAME '):
-        newname = newname.replace('NAME ', '', 1)
+# `name_clean` rules, in the order they apply. Each is registered with the
+# prefixes of the names it changes ('' for any name) and returns the name.
+_NAME_RULES = []
+
+
+def _name_rule(*prefixes):
+    def register(rule):
+        _NAME_RULES.append((prefixes, rule))
+        return rule
+    return register
+
+
+def _name_replace(old, new):
+    _NAME_RULES.append(((old,), lambda name: name.replace(old, new, 1)))
+
+
+_name_replace('NAME ', '')
+
+
+@_name_rule('')
+def _name_suffix(newname):
     if newname.endswith(' SN'):
         newname = newname.replace(' SN', '')
     if newname.endswith(':SN'):
         newname = newname.replace(':SN', '')
+    return newname
+
+
+@_name_rule('MAS')
+def _name_master(newname):
     if newname.startswith('MASJ'):
         newname = newname.replace('MASJ', 'MASTER OT J', 1)
     if (newname.startswith('MASTER') and len(newname) > 7 and
@@ -28,6 +58,11 @@ def name_clean(name):
         newname = newname.replace('MASTER OT', 'MASTER OT J', 1)
     if newname.startswith('MASTER OT J '):
         newname = newname.replace('MASTER OT J ', 'MASTER OT J', 1)
+    return newname
+
+
+@_name_rule('OGLE')
+def _name_ogle(newname):
     if newname.startswith('OGLE '):
         newname = newname.replace('OGLE ', 'OGLE-', 1)
     if newname.startswith('OGLE-') and len(newname) != 16:
@@ -38,6 +73,11 @@ def name_clean(name):
         elif (len(namesp) == 2 and is_number(namesp[1][:2]) and
               not is_number(namesp[1][2:])):
             newname = 'OGLE' + namesp[1]
+    return newname
+
+
+@_name_rule('SN SDSS', 'SDSS')
+def _name_sdss(newname):
     if newname.startswith('SN SDSS'):
         newname = newname.replace('SN SDSS ', 'SDSS', 1)
     if newname.startswith('SDSS '):
@@ -51,50 +91,92 @@ def name_clean(name):
         namesp = newname.split()
         if len(namesp) == 3 and is_number(namesp[2]):
             newname = 'SDSS-II SN ' + namesp[2].lstrip('0')
-    if newname.startswith('SN CL'):
-        newname = newname.replace('SN CL', 'CL', 1)
-    if newname.startswith('SN HiTS'):
-        newname = newname.replace('SN HiTS', 'SNHiTS', 1)
-    if newname.startswith('SNHiTS '):
-        newname = newname.replace('SNHiTS ', 'SNHiTS', 1)
-    if newname.startswith('GAIA'):
-        newname = newname.replace('GAIA', 'Gaia', 1)
+    return newname
+
+
+_name_replace('SN CL', 'CL')
+_name_replace('SN HiTS', 'SNHiTS')
+_name_replace('SNHiTS ', 'SNHiTS')
+_name_replace('GAIA', 'Gaia')
+
+
+@_name_rule('KSN')
+def _name_ksn(newname):
     if newname.startswith('KSN-'):
         newname = newname.replace('KSN-', 'KSN', 1)
-    if newname.startswith('KSN'):
-        newname = 'KSN' + newname[3:].lower()
+    return 'KSN' + newname[3:].lower()
+
+
+@_name_rule('Gaia')
+def _name_gaia(newname):
     if newname.startswith('Gaia '):
         newname = newname.replace('Gaia ', 'Gaia', 1)
-    if newname.startswith('Gaia'):
-        newname = 'Gaia' + newname[4:].lower()
-    if newname.startswith('GRB'):
-        newname = newname.replace('GRB', 'GRB ', 1)
-    if newname.startswith('GRB ') and is_number(newname[4:].strip()):
+    return 'Gaia' + newname[4:].lower()
+
+
+@_name_rule('GRB')
+def _name_grb(newname):
+    newname = newname.replace('GRB', 'GRB ', 1)
+    if is_number(newname[4:].strip()):
         newname = 'GRB ' + newname[4:].strip() + 'A'
-    if newname.startswith('ESSENCE '):
-        newname = newname.replace('ESSENCE ', 'ESSENCE', 1)
+    return newname
+
+
+_name_replace('ESSENCE ', 'ESSENCE')
+
+
+@_name_rule('LSQ')
+def _name_lsq(newname):
     if newname.startswith('LSQ '):
         newname = newname.replace('LSQ ', 'LSQ', 1)
-    if newname.startswith('LSQ') and is_number(newname[3]):
+    if is_number(newname[3]):
         newname = newname[:3] + newname[3:].lower()
-    if newname.startswith('DES') and is_number(newname[3]):
+    return newname
+
+
+@_name_rule('DES')
+def _name_des(newname):
+    if is_number(newname[3]):
         newname = newname[:7] + newname[7:].lower()
+    return newname
+
+
+@_name_rule('SNSDF')
+def _name_snsdf(newname):
     if newname.startswith('SNSDF '):
         newname = newname.replace(' ', '')
-    if newname.startswith('SNSDF'):
-        namesp = newname.split('.')
-        if len(namesp[0]) == 9:
-            newname = namesp[0] + '-' + namesp[1].zfill(2)
-    if newname.startswith('HFF '):
-        newname = newname.replace(' ', '')
-    if newname.startswith('SN HST'):
-        newname = newname.replace('SN HST', 'HST', 1)
-    if newname.startswith('HST ') and newname[4] != 'J':
+    namesp = newname.split('.')
+    if len(namesp[0]) == 9:
+        newname = namesp[0] + '-' + namesp[1].zfill(2)
+    return newname
+
+
+@_name_rule('HFF ')
+def _name_hff(newname):
+    return newname.replace(' ', '')
+
+
+_name_replace('SN HST', 'HST')
+
+
+@_name_rule('HST ')
+def _name_hst(newname):
+    if newname[4] != 'J':
         newname = newname.replace('HST ', 'HST J', 1)
-    if newname.startswith('SNLS') and newname[4] != '-':
+    return newname
+
+
+@_name_rule('SNLS')
+def _name_snls(newname):
+    if newname[4] != '-':
         newname = newname.replace('SNLS', 'SNLS-', 1)
     if newname.startswith('SNLS- '):
         newname = newname.replace('SNLS- ', 'SNLS-', 1)
+    return newname
+
+
+@_name_rule('CRTS ', 'CSS', 'MLS', 'SSS')
+def _name_crts(newname):
     if newname.startswith('CRTS CSS'):
         newname = newname.replace('CRTS CSS', 'CSS', 1)
     if newname.startswith('CRTS MLS'):
@@ -103,20 +185,28 @@ def name_clean(name):
         newname = newname.replace('CRTS SSS', 'SSS', 1)
     if newname.startswith(('CSS', 'MLS', 'SSS')):
         newname = newname.replace(' ', ':').replace('J', '')
-    if newname.startswith('SN HFF'):
-        newname = newname.replace('SN HFF', 'HFF', 1)
-    if newname.startswith('SN GND'):
-        newname = newname.replace('SN GND', 'GND', 1)
-    if newname.startswith('SN SCP'):
-        newname = newname.replace('SN SCP', 'SCP', 1)
-    if newname.startswith('SN UDS'):
-        newname = newname.replace('SN UDS', 'UDS', 1)
-    if newname.startswith('SCP') and newname[3] != '-':
+    return newname
+
+
+_name_replace('SN HFF', 'HFF')
+_name_replace('SN GND', 'GND')
+_name_replace('SN SCP', 'SCP')
+_name_replace('SN UDS', 'UDS')
+
+
+@_name_rule('SCP')
+def _name_scp(newname):
+    if newname[3] != '-':
         newname = newname.replace('SCP', 'SCP-', 1)
     if newname.startswith('SCP- '):
         newname = newname.replace('SCP- ', 'SCP-', 1)
-    if newname.startswith('SCP-') and is_integer(newname[7:]):
+    if is_integer(newname[7:]):
         newname = 'SCP-' + newname[4:7] + str(int(newname[7:]))
+    return newname
+
+
+@_name_rule('PS 1', 'PS1')
+def _name_ps1(newname):
     if newname.startswith('PS 1'):
         newname = newname.replace('PS 1', 'PS1', 1)
     if newname.startswith('PS1 SN PS'):
@@ -127,22 +217,29 @@ def name_clean(name):
         newname = newname[:3] + newname[3:].lower()
     elif newname.startswith('PS1-') and is_number(newname[4]):
         newname = newname[:4] + newname[4:].lower()
+    return newname
+
+
+@_name_rule('PSN K', 'K')
+def _name_k(newname):
     if newname.startswith('PSN K'):
         newname = newname.replace('PSN K', 'K', 1)
     if newname.startswith('K') and is_number(newname[1:5]):
         namesp = newname.split('-')
         if len(namesp[0]) == 5:
             newname = namesp[0] + '-' + namesp[1].zfill(3)
-    if newname.startswith('Psn'):
-        newname = newname.replace('Psn', 'PSN', 1)
-    if newname.startswith('PSNJ'):
-        newname = newname.replace('PSNJ', 'PSN J', 1)
-    if newname.startswith('TCPJ'):
-        newname = newname.replace('TCPJ', 'TCP J', 1)
-    if newname.startswith('SMTJ'):
-        newname = newname.replace('SMTJ', 'SMT J', 1)
-    if newname.startswith('PSN20J'):
-        newname = newname.replace('PSN20J', 'PSN J', 1)
+    return newname
+
+
+_name_replace('Psn', 'PSN')
+_name_replace('PSNJ', 'PSN J')
+_name_replace('TCPJ', 'TCP J')
+_name_replace('SMTJ', 'SMT J')
+_name_replace('PSN20J', 'PSN J')
+
+
+@_name_rule('SN ASASSN', 'ASASSN')
+def _name_asassn(newname):
     if newname.startswith('SN ASASSN'):
         newname = newname.replace('SN ASASSN', 'ASASSN', 1)
     if newname.startswith('ASASSN-20') and is_number(newname[9]):
@@ -153,12 +250,16 @@ def name_clean(name):
         newname = newname.replace('ASASSN', 'ASASSN-', 1)
     if newname.startswith('ASASSN-') and is_number(newname[7]):
         newname = newname[:7] + newname[7:].lower()
-    if newname.startswith('ROTSE3J'):
-        newname = newname.replace('ROTSE3J', 'ROTSE3 J', 1)
-    if newname.startswith('MACSJ'):
-        newname = newname.replace('MACSJ', 'MACS J', 1)
-    if newname.startswith('MWSNR'):
-        newname = newname.replace('MWSNR', 'MWSNR ', 1)
+    return newname
+
+
+_name_replace('ROTSE3J', 'ROTSE3 J')
+_name_replace('MACSJ', 'MACS J')
+_name_replace('MWSNR', 'MWSNR ')
+
+
+@_name_rule('SN HUNT', 'SN Hunt', 'SNHunt', 'SNhunt ')
+def _name_snhunt(newname):
     if newname.startswith('SN HUNT'):
         newname = newname.replace('SN HUNT', 'SNhunt', 1)
     if newname.startswith('SN Hunt'):
@@ -167,6 +268,11 @@ def name_clean(name):
         newname = newname.replace('SNHunt', 'SNhunt', 1)
     if newname.startswith('SNhunt '):
         newname = newname.replace('SNhunt ', 'SNhunt', 1)
+    return newname
+
+
+@_name_rule('ptf', 'SN PTF', 'PTF')
+def _name_ptf(newname):
     if newname.startswith('ptf'):
         newname = newname.replace('ptf', 'PTF', 1)
     if newname.startswith('SN PTF'):
@@ -175,42 +281,74 @@ def name_clean(name):
         newname = newname.replace('PTF ', 'PTF', 1)
     if newname.startswith('PTF') and is_number(newname[3]):
         newname = newname[:3] + newname[3:].lower()
+    return newname
+
+
+@_name_rule('IPTF', 'iPTF')
+def _name_iptf(newname):
     if newname.startswith('IPTF'):
         newname = newname.replace('IPTF', 'iPTF', 1)
     if newname.startswith('iPTF '):
         newname = newname.replace('iPTF ', 'iPTF', 1)
-    if newname.startswith('iPTF') and is_number(newname[4]):
+    if is_number(newname[4]):
         newname = newname[:4] + newname[4:].lower()
-    if newname.startswith('PESSTOESO'):
-        newname = newname.replace('PESSTOESO', 'PESSTO ESO ', 1)
+    return newname
+
+
+_name_replace('PESSTOESO', 'PESSTO ESO ')
+
+
+@_name_rule('snf', 'SNF')
+def _name_snf(newname):
     if newname.startswith('snf'):
         newname = newname.replace('snf', 'SNF', 1)
     if newname.startswith('SNF '):
         newname = newname.replace('SNF ', 'SNF', 1)
-    if (newname.startswith('SNF') and is_number(newname[3:]) and
-            len(newname) >= 12):
+    if is_number(newname[3:]) and len(newname) >= 12:
         newname = 'SNF' + newname[3:11] + '-' + newname[11:]
-    if newname.startswith(('MASTER OT J', 'ROTSE3 J')):
-        prefix = newname.split('J')[0]
-        coords = newname.split('J')[-1].strip()
-        decsign = '+' if '+' in coords else '-'
-        coordsplit = coords.replace('+', '-').split('-')
-        if ('.' not in coordsplit[0] and len(coordsplit[0]) > 6 and
-                '.' not in coordsplit[1] and len(coordsplit[1]) > 6):
-            newname = (
-                prefix + 'J' + coordsplit[0][:6] + '.' + coordsplit[0][6:] +
-                decsign + coordsplit[1][:6] + '.' + coordsplit[1][6:])
-    if (newname.startswith('Gaia ') and is_number(newname[3:4]) and
-            len(newname) > 5):
+    return newname
+
+
+@_name_rule('MASTER OT J', 'ROTSE3 J')
+def _name_coords(newname):
+    prefix = newname.split('J')[0]
+    coords = newname.split('J')[-1].strip()
+    decsign = '+' if '+' in coords else '-'
+    coordsplit = coords.replace('+', '-').split('-')
+    if ('.' not in coordsplit[0] and len(coordsplit[0]) > 6 and
+            '.' not in coordsplit[1] and len(coordsplit[1]) > 6):
+        newname = (
+            prefix + 'J' + coordsplit[0][:6] + '.' + coordsplit[0][6:] +
+            decsign + coordsplit[1][:6] + '.' + coordsplit[1][6:])
+    return newname
+
+
+@_name_rule('Gaia ')
+def _name_gaia_space(newname):
+    if is_number(newname[3:4]) and len(newname) > 5:
         newname = newname.replace('Gaia ', 'Gaia', 1)
-    if (newname.startswith('AT ') and is_number(newname[3:7]) and
-            len(newname) > 7):
+    return newname
+
+
+@_name_rule('AT ')
+def _name_at_space(newname):
+    if is_number(newname[3:7]) and len(newname) > 7:
         newname = newname.replace('AT ', 'AT', 1)
+    return newname
+
+
+@_name_rule('')
+def _name_year(newname):
     if len(newname) <= 4 and is_number(newname):
         newname = 'SN' + newname + 'A'
     if (len(newname) > 4 and is_number(newname[:4]) and
             not is_number(newname[4:])):
         newname = 'SN' + newname
+    return newname
+
+
+@_name_rule('Sn ', 'sn', 'SN', 'AT')
+def _name_designation(newname):
     if (newname.startswith('Sn ') and is_number(newname[3:7]) and
             len(newname) > 7):
         newname = newname.replace('Sn ', 'SN', 1)
@@ -232,6 +370,49 @@ def name_clean(name):
     elif (newname.startswith('AT') and is_number(newname[2:6]) and
           (len(newname) == 8 or len(newname) == 9) and newname[6:].isupper()):
         newname = 'AT' + newname[2:6] + newname[6:].lower()
+    return newname
+
+
+def _name_dispatch():
+    """Return the indices of the rules for names starting with each first
+    character, and those of the rules for any name.
+    """
+    anyname = [i for i, (prefixes, rule) in enumerate(_NAME_RULES)
+               if '' in prefixes]
+    firsts = {x[0] for prefixes, rule in _NAME_RULES for x in prefixes if x}
+    table = {}
+    for first in firsts:
+        table[first] = tuple(
+            i for i, (prefixes, rule) in enumerate(_NAME_RULES)
+            if any(x[:1] in ('', first) for x in prefixes))
+    return table, tuple(anyname)
+
+
+_NAME_DISPATCH, _NAME_ANY = _name_dispatch()
+
+
+@lru_cache(maxsize=65536)
+def name_clean(name):
+    """Return the standard form of a supernova name.
+
+    The rules apply in order, but only those whose prefixes match the first
+    character of the name are visited; the candidates are looked up again
+    whenever a rule changes that character. Results are memoized.
+    """
+    newname = name.strip(' ;,*.')
+    rules = _NAME_DISPATCH.get(newname[:1], _NAME_ANY)
+    pos = 0
+    while pos < len(rules):
+        index = rules[pos]
+        pos += 1
+        prefixes, rule = _NAME_RULES[index]
+        if not newname.startswith(prefixes):
+            continue
+        first = newname[:1]
+        newname = rule(newname)
+        if newname[:1] != first:
+            rules = _NAME_DISPATCH.get(newname[:1], _NAME_ANY)
+            pos = bisect_right(rules, index)
 
     newname = (' '.join(newname.split())).strip()
     return newname
@@ -308,6 +489,113 @@ def radec_clean(svalue, quantity, unit=''):
     return (svalue, sunit)
 
 
+def _round_sigs(values, sig):
+    """Return `round_sig(x, sig=s)` for each value and number of significant
+    digits in the arrays `values` and `sig`.
+    """
+    nonzero = values != 0.0
+    magnitude = np.zeros(values.shape)
+    magnitude[nonzero] = np.log10(np.abs(values[nonzero]))
+    digits = sig - np.floor(magnitude).astype(int) - 1
+    scale = 10.0 ** np.abs(digits)
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = np.where(digits >= 0, values * scale, values / scale)
+        rounded = np.rint(scaled)
+        rounded = np.where(digits >= 0, rounded / scale, rounded * scale)
+        # `round` rounds the exact decimal value, so values whose scaled
+        # product is within rounding error of a tie, or is inexact, are
+        # rounded one at a time.
+        tie = (np.abs(scaled - np.floor(scaled) - 0.5) <=
+               2.0 * np.spacing(np.abs(scaled)))
+        exact = nonzero & (
+            tie | (np.abs(digits) > 22) | ~(np.abs(scaled) < 2.0 ** 52) |
+            (np.abs(magnitude - np.rint(magnitude)) < 1.e-9))
+    rounded[~nonzero] = values[~nonzero]
+    for i in np.flatnonzero(exact):
+        rounded[i] = round_sig(float(values[i]), sig=int(sig[i]))
+    return rounded
+
+
+def _zpads(values):
+    """Return `zpad(x)` for each string in `values`."""
+    parts = np.char.partition(values, '.')
+    return np.where(
+        np.char.count(values, '.') == 1,
+        np.char.add(np.char.add(np.char.zfill(parts[:, 0], 2), '.'),
+                    parts[:, 2]),
+        np.char.zfill(values, 2))
+
+
+# Zero-padded integers, as `str(x).zfill(2)` writes them.
+_PADDED = np.array([str(x).zfill(2) for x in range(1000)])
+
+
+def radec_clean_array(values, quantity, unit=''):
+    """Clean an array of RA or Dec strings, as `radec_clean` cleans each one.
+
+    Returns the cleaned values and their units as two arrays of strings.
+    Decimal degrees ('floatdegrees') are converted for the whole array at
+    once, with the same rounding to significant digits. Values in other
+    units, and decimal degrees that are not numbers below 1000, are cleaned
+    by `radec_clean`, once per distinct value.
+    """
+    values = np.char.strip(np.asarray(values, dtype=str))
+    cleaned = np.empty(values.shape, dtype=object)
+    units = np.empty(values.shape, dtype=object)
+    scalar = np.ones(values.shape, dtype=bool)
+    vector = np.flatnonzero(~scalar)
+
+    if unit == 'floatdegrees' and ('ra' in quantity or 'dec' in quantity):
+        try:
+            deg = values.astype(float)
+        except ValueError:
+            deg = np.array(
+                [float(x) if is_number(x) else np.nan for x in values])
+        scalar = ~(np.abs(deg) < 1000.0)
+        vector = np.flatnonzero(~scalar)
+    if len(vector):
+        # As `float('%g' % Decimal(x))`, keeping six significant digits.
+        deg = _round_sigs(deg[vector], np.full(len(vector), 6))
+        sig = np.char.str_len(
+            np.char.strip(np.char.replace(values[vector], '.', ''), '0'))
+        if 'ra' in quantity:
+            flhours = deg / 360.0 * 24.0
+            hours = np.floor(flhours)
+            minutes = np.floor((flhours - hours) * 60.0)
+            seconds = (flhours * 60.0 - (hours * 60.0 + minutes)) * 60.0
+            hours[hours < 1.e-6] = 0
+            head = _PADDED[hours.astype(int)]
+            sunit = 'hours'
+        else:
+            fldeg = np.abs(deg)
+            degree = np.floor(fldeg)
+            minutes = np.floor((fldeg - degree) * 60.0)
+            seconds = (fldeg * 60.0 - (degree * 60.0 + minutes)) * 60.0
+            head = np.char.add(np.where(deg >= 0.0, '+', '-'),
+                               _PADDED[degree.astype(int)])
+            sunit = 'degrees'
+        minutes[minutes < 1.e-6] = 0
+        seconds[seconds < 1.e-6] = 0.0
+        if np.any(seconds > 60.0):
+            raise (ValueError('Invalid seconds value for ' + quantity))
+        tail = _zpads(np.char.mod('%g', _round_sigs(seconds, sig - 1)))
+        svalues = np.char.add(
+            np.char.add(np.char.add(head, ':'), _PADDED[minutes.astype(int)]),
+            np.char.add(':', tail))
+        cleaned[vector] = np.char.rstrip(svalues, '.')
+        units[vector] = sunit
+        # Seconds rounded up to 60 carry into the minutes.
+        scalar[vector[np.isin(tail, ['60.0', '60.', '60'])]] = True
+
+    indices = np.flatnonzero(scalar)
+    distinct = {
+        x: radec_clean(x, quantity, unit=unit) for x in set(values[indices])
+    }
+    for i in indices:
+        cleaned[i], units[i] = distinct[values[i]]
+    return cleaned, units
+
+
 def host_clean(name):
     newname = name.strip(' ;,*')
 
@@ -383,3 +671,27 @@ def clean_snname(string):
         newstring = head + tail
 
     return newstring
+
+
+def invert_synonyms(synonyms):
+    """Return a read-only synonym -> canonical value mapping.
+
+    `synonyms` maps each canonical value to a list of its synonyms, as in the
+    `input/*-synonyms.json` files.  If a synonym is listed under more than
+    one canonical value the first one wins, as it would in a linear scan.
+    """
+    inverse = OrderedDict()
+    for rep in synonyms:
+        for syn in synonyms[rep]:
+            inverse.setdefault(syn, rep)
+    return MappingProxyType(inverse)
+
+
+def clean_bibcode(bibcode, biberrors=None):
+    """Unescape a malformed bibcode and apply known bibcode corrections."""
+    if len(bibcode) != 19:
+        bibcode = urllib.parse.unquote(unescape(bibcode)).replace('A.A.',
+                                                                  'A&A')
+    if biberrors is None:
+        return bibcode
+    return biberrors.get(bibcode, bibcode)
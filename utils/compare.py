@@ -3,7 +3,11 @@ they are unique.
 '''
 from decimal import Decimal
 
-__all__ = ['same_tag_num', 'same_tag_str']
+from astrocats.catalog.key import KEY_TYPES
+from astrocats.catalog.utils import is_number
+
+__all__ = ['same_tag_num', 'same_tag_str', 'dupe_fingerprint',
+           'fingerprint_value']
 
 
 def same_tag_num(photo, val, tag, canbelist=False):
@@ -53,3 +57,37 @@ def same_tag_str(photo, val, tag):
     issame = ((tag not in photo and not val) or (
         tag in photo and not val) or (tag in photo and photo[tag] == val))
     return issame
+
+
+def dupe_fingerprint(cat_dict):
+    '''Return a hashable fingerprint of the values `cat_dict` is compared on.
+
+    Two `CatDict`s of the same type have equal fingerprints when every key
+    with `compare` set holds the same value in both, with numeric values
+    compared as `Decimal`s so that e.g. '15.30' and '15.3' match, and NaNs
+    all matching each other.  Sources are not compared, duplicates have
+    their sources merged instead.
+    '''
+    return tuple((key.name, fingerprint_value(key, cat_dict[key]))
+                 for key in cat_dict._KEYS.compare_vals() if key in cat_dict)
+
+
+def _number_key(value):
+    '''Return numeric string `value` as a `Decimal`, or 'nan' for NaNs,
+    which do not compare equal to themselves.
+    '''
+    number = Decimal(value)
+    return 'nan' if number.is_nan() else number
+
+
+def fingerprint_value(key, value):
+    '''Return `value` of `key` as it is compared in `dupe_fingerprint`.'''
+    if key.type not in [KEY_TYPES.STRING, KEY_TYPES.BOOL]:
+        if isinstance(value, list):
+            return tuple(_number_key(x) if is_number(x) else x
+                         for x in value)
+        if is_number(value):
+            return _number_key(value)
+    elif isinstance(value, list):
+        return tuple(value)
+    return value
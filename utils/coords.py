@@ -0,0 +1,77 @@
+'''Measure separations between sky coordinates given as strings.
+'''
+import re
+from functools import lru_cache
+
+import numpy as np
+
+__all__ = ['angular_separations']
+
+_SEXAGESIMAL_RE = re.compile(r'([+-]?)([0-9]+):([0-9]+):([0-9]+(?:\.[0-9]*)?)\Z')
+
+
+@lru_cache(maxsize=1)
+def _scales():
+    """Return the factors converting hours and degrees to radians, and
+    radians to arcseconds, as `astropy.units` gives them.
+    """
+    from astropy import units as un
+    return (un.hourangle.to(un.rad), un.deg.to(un.rad), un.rad.to(un.deg),
+            un.deg.to(un.arcsec))
+
+
+@lru_cache(maxsize=131072)
+def _parse_angle(value, hours):
+    """Return the RA in hours (if `hours`) or Dec in degrees that `value`
+    stands for, parsed as `SkyCoord` does, or None if it is not one.
+
+    Values of the form `[+-]dd:mm:ss.s` within range are parsed directly,
+    with the same arithmetic as `astropy.coordinates.Angle`; all others are
+    passed to astropy.
+    """
+    match = _SEXAGESIMAL_RE.match(value)
+    if match:
+        sign, d, m, s = match.groups()
+        d, m, s = float(sign + d), int(m), float(s)
+        if m < 60 and s < 60.0:
+            angle = np.copysign(abs(d) + m / 60.0 + s / 3600.0, d)
+            if (0.0 <= angle < 24.0) if hours else (-90.0 <= angle <= 90.0):
+                return float(angle)
+    # `astropy.coordinates` is slow to import; only load it when needed.
+    from astropy import units as un
+    from astropy.coordinates import Latitude, Longitude
+    try:
+        if hours:
+            return float(Longitude(value, unit=un.hourangle).hourangle)
+        return float(Latitude(value, unit=un.deg).deg)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception:
+        return None
+
+
+def angular_separations(ras, decs, ras2, decs2):
+    """Return the separations in arcseconds between each RA/Dec string pair
+    and the matching pair of `ras2`, `decs2`, NaN where any of the four
+    cannot be parsed.
+
+    Each distinct string is parsed once and kept. The separations are found
+    by the Vincenty formula on whole arrays, with the same unit conversions
+    as `SkyCoord.separation`, which gives the same values.
+    """
+    hour, deg, todeg, toarcsec = _scales()
+    columns = []
+    for values, hours in ((ras, True), (decs, False), (ras2, True),
+                          (decs2, False)):
+        parsed = [_parse_angle(x, hours) for x in values]
+        columns.append(np.array(
+            [np.nan if x is None else x for x in parsed], dtype=float))
+    ra1, dec1, ra2, dec2 = columns
+    with np.errstate(invalid='ignore'):
+        dlon = hour * (ra2 - ra1)
+        slat1, slat2 = np.sin(deg * dec1), np.sin(deg * dec2)
+        clat1, clat2 = np.cos(deg * dec1), np.cos(deg * dec2)
+        num1 = clat2 * np.sin(dlon)
+        num2 = clat1 * slat2 - slat1 * clat2 * np.cos(dlon)
+        denominator = slat1 * slat2 + clat1 * clat2 * np.cos(dlon)
+        return np.arctan2(np.hypot(num1, num2), denominator) * todeg * toarcsec
@@ -0,0 +1,162 @@
+'''Tabulated Planck15 distances for fast forward and inverse lookups.
+'''
+import json
+import os
+import warnings
+
+import numpy as np
+from astropy import __version__ as astropy_version
+from astropy import units as un
+
+__all__ = ['CosmologyTable']
+
+
+class CosmologyTable(object):
+    """Planck15 comoving distance tabulated on a grid in `ln(1 + z)`.
+
+    Values between nodes are found by cubic Hermite interpolation using the
+    exact derivative `dD_C/dz = D_H / E(z)`, which keeps the relative error
+    of every distance below `MAX_REL_ERROR` (checked against astropy when
+    the table is built) for `0 <= z <= ZMAX`. This is several orders of
+    magnitude finer than the significant digits `pretty_num` writes out.
+    Redshifts beyond `ZMAX` fall back to astropy.
+    """
+
+    ZMAX = 20.0
+    NODES = 4001
+    MAX_REL_ERROR = 1.0e-10
+
+    def __init__(self, path=None):
+        """Load the table from `path`, rebuilding it if missing or stale."""
+        # Importing `astropy.cosmology` is slow, so defer it until needed.
+        from astropy.cosmology import Planck15 as cosmo
+        self._cosmo = cosmo
+        self._meta = {
+            'cosmology': repr(self._cosmo),
+            'astropy': astropy_version,
+            'zmax': self.ZMAX,
+            'nodes': self.NODES
+        }
+        built = not path or not self._load(path)
+        if built:
+            self._build()
+        self._dh = self._meta['hubble_distance']
+        self._du = self._u[1] - self._u[0]
+        if built:
+            self._check()
+            if path:
+                self._save(path)
+
+    def _load(self, path):
+        if not os.path.isfile(path):
+            return False
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                if any(meta.get(x) != self._meta[x] for x in self._meta):
+                    return False
+                self._meta = meta
+                self._u = data['u']
+                self._dc = data['dc']
+                self._ddc = data['ddc']
+        except (OSError, ValueError, KeyError):
+            return False
+        return True
+
+    def _save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, meta=np.array(json.dumps(self._meta)), u=self._u,
+                 dc=self._dc, ddc=self._ddc)
+
+    def _build(self):
+        self._u = np.linspace(0.0, np.log1p(self.ZMAX), self.NODES)
+        z = np.expm1(self._u)
+        dh = self._cosmo.hubble_distance.to('Mpc').value
+        self._meta['hubble_distance'] = dh
+        self._dc = self._cosmo.comoving_distance(z).to('Mpc').value
+        # dD_C/du, with u = ln(1 + z).
+        self._ddc = dh * (1.0 + z) / self._cosmo.efunc(z)
+
+    def _check(self):
+        mid = np.expm1(0.5 * (self._u[1:] + self._u[:-1]))
+        exact = self._cosmo.comoving_distance(mid).to('Mpc').value
+        err = np.max(np.abs(self._comoving(mid) / exact - 1.0))
+        if err > self.MAX_REL_ERROR:
+            warnings.warn('Cosmology table interpolation error ' + str(err) +
+                          ' exceeds ' + str(self.MAX_REL_ERROR) + '.')
+
+    def _comoving(self, z):
+        """Interpolate D_C in Mpc at redshift(s) `z` within the grid."""
+        u = np.log1p(z)
+        i = np.clip((u / self._du).astype(int), 0, self.NODES - 2)
+        t = u / self._du - i
+        t2, t3 = t * t, t * t * t
+        p0, p1 = self._dc[i], self._dc[i + 1]
+        m0, m1 = self._ddc[i] * self._du, self._ddc[i + 1] * self._du
+        dc = ((2 * t3 - 3 * t2 + 1) * p0 + (t3 - 2 * t2 + t) * m0 +
+              (-2 * t3 + 3 * t2) * p1 + (t3 - t2) * m1)
+        return dc
+
+    def _out_of_range(self, z):
+        return np.any((z < 0.0) | (z > self.ZMAX))
+
+    def comoving_distance(self, z):
+        """Return the comoving distance in Mpc at redshift(s) `z`."""
+        za = np.asarray(z, dtype=float)
+        if self._out_of_range(za):
+            dc = self._cosmo.comoving_distance(za).to('Mpc').value
+        else:
+            dc = self._comoving(za)
+        return float(dc) if np.ndim(dc) == 0 else dc
+
+    def luminosity_distance(self, z):
+        """Return the luminosity distance in Mpc at redshift(s) `z`."""
+        za = np.asarray(z, dtype=float)
+        dl = (1.0 + za) * self.comoving_distance(za)
+        return float(dl) if np.ndim(dl) == 0 else dl
+
+    def distance_modulus(self, z):
+        """Return the distance modulus at redshift(s) `z`."""
+        dm = 5.0 * (np.log10(self.luminosity_distance(z) * 1.0e6) - 1.0)
+        return float(dm) if np.ndim(dm) == 0 else dm
+
+    def _invert(self, dist, luminosity, zmax):
+        da = np.asarray(dist, dtype=float)
+        dists = self._dc * np.exp(self._u) if luminosity else self._dc
+        if (np.any((da <= 0.0) | (da > dists[-1])) or
+                (zmax is not None and zmax > self.ZMAX)):
+            from astropy.cosmology import z_at_value
+            func = (self._cosmo.luminosity_distance if luminosity else
+                    self._cosmo.comoving_distance)
+            kwargs = {} if zmax is None else {'zmax': zmax}
+            # Older astropy returns plain floats, newer a dimensionless
+            # `Quantity`.
+            zs = [z_at_value(func, x * un.Mpc, **kwargs)
+                  for x in np.atleast_1d(da)]
+            z = np.array([getattr(x, 'value', x) for x in zs])
+            return float(z[0]) if np.ndim(da) == 0 else z
+        i = np.clip(np.searchsorted(dists, da) - 1, 0, self.NODES - 2)
+        t = (da - dists[i]) / (dists[i + 1] - dists[i])
+        z = np.expm1(self._u[i] + t * self._du)
+        # Newton iterations converge quadratically from the linear guess.
+        for _ in range(4):
+            dc = self._comoving(z)
+            ddc = self._dh / self._cosmo.efunc(z)
+            if luminosity:
+                f = (1.0 + z) * dc - da
+                fp = dc + (1.0 + z) * ddc
+            else:
+                f = dc - da
+                fp = ddc
+            z = z - f / fp
+        if zmax is not None and np.any(z > zmax):
+            raise ValueError('Redshift exceeds zmax = ' + str(zmax) + '.')
+        return float(z) if np.ndim(z) == 0 else z
+
+    def z_at_comoving_distance(self, dist, zmax=None):
+        """Return the redshift(s) at comoving distance(s) `dist` in Mpc."""
+        return self._invert(dist, False, zmax)
+
+    def z_at_luminosity_distance(self, dist, zmax=None):
+        """Return the redshift(s) at luminosity distance(s) `dist` in Mpc."""
+        return self._invert(dist, True, zmax)
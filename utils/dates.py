@@ -0,0 +1,80 @@
+'''Convert calendar dates and Julian dates to MJD without per-row astropy
+`Time` objects.
+'''
+from decimal import Decimal
+from functools import lru_cache
+from math import floor
+
+import numpy as np
+from astropy.time import Time as astrotime
+
+__all__ = ['date_to_mjd', 'dates_to_mjds', 'iso_to_mjd', 'jds_to_mjds',
+           'mjds_to_datetimes']
+
+JD_MJD_OFFSET = Decimal('2400000.5')
+
+
+def _split_date(date):
+    parts = date.replace('/', '-').split('-')
+    if len(parts) != 3:
+        raise ValueError('Date "' + date + '" is not of the form Y-M-D.')
+    return parts
+
+
+def _day_number(year, month, day):
+    """Return the MJD at midnight of the given proleptic Gregorian date.
+
+    Works on both plain integers and integer NumPy arrays.
+    """
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return (day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 +
+            y // 400 - 2432046)
+
+
+@lru_cache(maxsize=8192)
+def date_to_mjd(date):
+    """Return the MJD of a 'Y-M-D' or 'Y/M/D' date as a float.
+
+    The day may carry a fraction, which is added onto the MJD of midnight
+    in the same way `astrotime(...).mjd + fday - floor(fday)` would.
+    """
+    year, month, day = _split_date(date)
+    fday = float(day)
+    mjd = float(_day_number(int(year), int(month), int(floor(fday))))
+    return mjd + fday - floor(fday)
+
+
+def dates_to_mjds(dates):
+    """Return an array of MJDs for a column of 'Y-M-D' or 'Y/M/D' dates."""
+    parts = [_split_date(x) for x in dates]
+    if not parts:
+        return np.array([], dtype=float)
+    years, months, days = zip(*parts)
+    fdays = np.array(days, dtype=float)
+    idays = np.floor(fdays)
+    mjds = _day_number(
+        np.array(years, dtype=np.int64), np.array(months, dtype=np.int64),
+        idays.astype(np.int64)).astype(float)
+    return mjds + fdays - idays
+
+
+@lru_cache(maxsize=8192)
+def iso_to_mjd(date):
+    """Return the MJD of an ISO date/time string, caching repeat dates."""
+    return astrotime(date).mjd
+
+
+def jds_to_mjds(jds):
+    """Return a list of MJD strings for a column of JDs.
+
+    Decimal arithmetic keeps the digits of the input, matching
+    `str(jd_to_mjd(Decimal(jd)))`.
+    """
+    return [str(Decimal(x) - JD_MJD_OFFSET) for x in jds]
+
+
+def mjds_to_datetimes(mjds):
+    """Return an array of `datetime` objects for a column of MJDs."""
+    return astrotime(np.asarray(mjds, dtype=float), format='mjd').datetime
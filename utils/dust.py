@@ -0,0 +1,98 @@
+'''Look up Galactic E(B-V) in local copies of the SFD dust maps.
+'''
+import os
+
+import numpy as np
+from astropy import units as un
+
+__all__ = ['SFDMap']
+
+
+class SFDMap(object):
+    """Schlegel, Finkbeiner & Davis (1998) E(B-V) maps read from FITS.
+
+    The two polar ZEA projections are opened memory-mapped on first use, so
+    only the pixels sampled are read from disk. Values are the mean and
+    standard deviation of the pixels within `RADIUS` arcminutes of each
+    position, rescaled by `SCALE` to the Schlafly & Finkbeiner (2011)
+    calibration and rounded like the 'ext SandF' columns returned by IRSA.
+    """
+
+    FILES = {1: 'SFD_dust_4096_ngp.fits', -1: 'SFD_dust_4096_sgp.fits'}
+    SCALE = 0.86
+    RADIUS = 5.0
+    PIXEL_SIZE = 2.372
+    DIGITS = 4
+
+    def __init__(self, path):
+        """Use the map files found in the directory `path`."""
+        self._path = path
+        self._maps = {}
+        rad = int(np.ceil(self.RADIUS / self.PIXEL_SIZE))
+        dy, dx = np.mgrid[-rad:rad + 1, -rad:rad + 1]
+        inside = dx ** 2 + dy ** 2 <= (self.RADIUS / self.PIXEL_SIZE) ** 2
+        self._offsets = (dy[inside], dx[inside])
+
+    def available(self):
+        """Return whether both hemisphere maps are present."""
+        return all(os.path.isfile(os.path.join(self._path, x))
+                   for x in self.FILES.values())
+
+    def _get_map(self, nsgp):
+        if nsgp not in self._maps:
+            from astropy.io import fits
+            hdulist = fits.open(
+                os.path.join(self._path, self.FILES[nsgp]), memmap=True)
+            self._maps[nsgp] = (hdulist[0].data, hdulist[0].header)
+        return self._maps[nsgp]
+
+    def _parse(self, ras, decs):
+        """Return Galactic `l`, `b` in radians, NaN where unparseable."""
+        # `astropy.coordinates` is slow to import; only load it when needed.
+        from astropy.coordinates import SkyCoord as coord
+        try:
+            gal = coord(ra=ras, dec=decs, unit=(un.hourangle, un.deg)).galactic
+            return gal.l.radian, gal.b.radian
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            pass
+        ls, bs = np.full(len(ras), np.nan), np.full(len(ras), np.nan)
+        for i, (ra, dec) in enumerate(zip(ras, decs)):
+            try:
+                gal = coord(ra=ra, dec=dec,
+                            unit=(un.hourangle, un.deg)).galactic
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                continue
+            ls[i], bs[i] = gal.l.radian, gal.b.radian
+        return ls, bs
+
+    def query(self, ras, decs):
+        """Return `[ebv, ebverr]` for each RA/Dec string pair.
+
+        Positions that cannot be parsed give `None`.
+        """
+        ls, bs = self._parse(list(ras), list(decs))
+        results = [None] * len(ls)
+        good = np.isfinite(bs)
+        for nsgp in (1, -1):
+            sel = np.where(good & ((bs >= 0.0) if nsgp == 1 else (bs < 0.0)))
+            sel = sel[0]
+            if not len(sel):
+                continue
+            data, header = self._get_map(nsgp)
+            rho = header['LAM_SCAL'] * np.sqrt(1.0 - nsgp * np.sin(bs[sel]))
+            x = header['CRPIX1'] - 1.0 + rho * np.cos(ls[sel])
+            y = header['CRPIX2'] - 1.0 - nsgp * rho * np.sin(ls[sel])
+            xs = np.clip(np.rint(x).astype(int)[:, None] + self._offsets[1],
+                         0, data.shape[1] - 1)
+            ys = np.clip(np.rint(y).astype(int)[:, None] + self._offsets[0],
+                         0, data.shape[0] - 1)
+            pixels = self.SCALE * np.asarray(data[ys, xs], dtype=float)
+            means = np.round(pixels.mean(axis=1), self.DIGITS)
+            stds = np.round(pixels.std(axis=1), self.DIGITS)
+            for i, mean, std in zip(sel, means, stds):
+                results[i] = [float(mean), float(std)]
+        return results
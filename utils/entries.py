@@ -0,0 +1,220 @@
+'''Catalog entries indexed by every name they go by.
+'''
+import codecs
+import json
+import os
+from collections import OrderedDict
+
+from astrocats.catalog.utils import uncompress_gz
+
+from .store import JournaledDict
+
+__all__ = ['EntryDict', 'StubIndex']
+
+
+class EntryDict(OrderedDict):
+    """An `OrderedDict` of entries with an inverted index of their names.
+
+    Each entry is indexed under its key, its aliases and its extra aliases
+    whenever it is stored, and dropped from the index when it is removed.
+    Aliases added to a stored entry afterwards are indexed by `reindex`.
+    `holders` then returns the entries that may go by a name without
+    scanning them all. The index may hold names an entry has since lost, so
+    callers check the entries returned, but never misses a current one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._holders = {}
+        self._names = {}
+        self._order = {}
+        self._last = 0
+        super(EntryDict, self).__init__(*args, **kwargs)
+
+    def _next(self):
+        self._last += 1
+        return self._last
+
+    def _index(self, key):
+        entry = self[key]
+        names = set(entry.get_aliases())
+        names.update(entry.extra_aliases())
+        names.add(key)
+        self._unindex(key)
+        for name in names:
+            self._holders.setdefault(name, set()).add(key)
+        self._names[key] = names
+
+    def _unindex(self, key):
+        for name in self._names.pop(key, ()):
+            holders = self._holders[name]
+            holders.discard(key)
+            if not holders:
+                del self._holders[name]
+
+    def __setitem__(self, key, entry):
+        if key not in self:
+            self._order[key] = self._next()
+        super(EntryDict, self).__setitem__(key, entry)
+        self._index(key)
+
+    def __delitem__(self, key):
+        super(EntryDict, self).__delitem__(key)
+        self._unindex(key)
+        del self._order[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super(EntryDict, self).pop(key, *default)
+        entry = self[key]
+        del self[key]
+        return entry
+
+    def popitem(self, last=True):
+        key = next(reversed(self) if last else iter(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super(EntryDict, self).clear()
+        self._holders.clear()
+        self._names.clear()
+        self._order.clear()
+
+    def move_to_end(self, key, last=True):
+        super(EntryDict, self).move_to_end(key, last=last)
+        self._order[key] = self._next() * (1 if last else -1)
+
+    def reindex(self, key):
+        """Index the names of the entry stored at `key` again, if any."""
+        if key in self:
+            self._index(key)
+
+    def holders(self, name):
+        """Return the keys of the entries indexed under `name`, in order."""
+        return sorted(self._holders.get(name, ()), key=self._order.get)
+
+
+class StubIndex(object):
+    """The stubs of the entry files in the output repositories, persisted so
+    that loading them does not read every file.
+
+    Each file is recorded in a `JournaledDict` under its path relative to
+    `root`, with its modification time and size, the name of its entry, and
+    the stub keys `keys` of the entry. `record` is called as each entry is
+    saved. `stubs` returns the recorded stub of every file whose time and
+    size are unchanged, reads any other file again, and drops the records of
+    files that are gone, so the index is rebuilt wherever it is stale.
+    """
+
+    def __init__(self, path, root, keys):
+        """Persist the index at `path`, storing stub `keys` of entries."""
+        self._dict = JournaledDict(path)
+        self._root = root
+        self._keys = keys
+        self._paths = None
+
+    @property
+    def journaled(self):
+        """Whether changes are journaled, as `JournaledDict.journaled`."""
+        return self._dict.journaled
+
+    @journaled.setter
+    def journaled(self, journaled):
+        self._dict.journaled = journaled
+
+    def load(self):
+        """Read the index now rather than on first use."""
+        self._dict.load()
+
+    def compact(self):
+        """Write the index to its JSON file and discard the journal."""
+        self._dict.compact()
+
+    def clear(self):
+        """Drop every record, as when all entry files are deleted."""
+        self._dict.clear()
+        self._paths = {}
+
+    def _key(self, path):
+        return os.path.relpath(path, self._root)
+
+    def _names(self):
+        if self._paths is None:
+            self._paths = {}
+            for key, record in self._dict.items():
+                self._paths[record[0]] = key
+        return self._paths
+
+    def record(self, name, path, data):
+        """Record the stub keys in `data` of entry `name`, saved to `path`."""
+        stat = os.stat(path)
+        key = self._key(path)
+        data = OrderedDict((x, data[x]) for x in self._keys if x in data)
+        self._dict[key] = [name, [stat.st_mtime_ns, stat.st_size],
+                           self._copy(data)]
+        self._names()[name] = key
+
+    def _copy(self, data):
+        # Records never share objects with entries, which may change them.
+        return json.loads(json.dumps(data), object_pairs_hook=OrderedDict)
+
+    def _read(self, path):
+        with codecs.open(path, 'r', encoding='utf8') as f:
+            data = json.load(f, object_pairs_hook=OrderedDict)
+        if len(data) != 1:
+            raise ValueError("json file '{}' has multiple keys: {}".format(
+                path, list(data.keys())))
+        return next(iter(data.items()))
+
+    def stub(self, path):
+        """Return the entry name, the entry's data (only its stub keys if
+        the file is recorded) and the path of the entry file at `path`,
+        reading the file only if its record is stale.
+
+        A compressed file is uncompressed, as `Catalog.load_stubs` does.
+        """
+        key = self._key(path)
+        record = self._dict.get(key)
+        if record is not None:
+            stat = os.stat(path)
+            if record[1] != [stat.st_mtime_ns, stat.st_size]:
+                record = None
+        if path.endswith('.gz'):
+            path = uncompress_gz(path)
+            self._dict.pop(key, None)
+        elif record is not None:
+            return record[0], self._copy(record[2]), path
+        if record is None:
+            name, data = self._read(path)
+        else:
+            name, data = record[0], self._copy(record[2])
+        self.record(name, path, data)
+        return name, data, path
+
+    def stubs(self, paths):
+        """Yield the entry name and data of each file in `paths`, as `stub`
+        returns them, then drop the records of any other files.
+        """
+        found = set()
+        for path in paths:
+            name, data, path = self.stub(path)
+            found.add(self._key(path))
+            yield name, data
+        for key in [x for x in self._dict if x not in found]:
+            name = self._dict.pop(key)[0]
+            if self._names().get(name) == key:
+                del self._paths[name]
+
+    def path(self, name):
+        """Return the path of the file last recorded for entry `name`, or
+        None if there is none.
+        """
+        key = self._names().get(name)
+        if key is None:
+            return None
+        path = os.path.join(self._root, key)
+        return path if os.path.isfile(path) else None
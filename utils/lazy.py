@@ -0,0 +1,26 @@
+'''Attributes computed on first use.
+'''
+
+__all__ = ['lazyproperty']
+
+
+class lazyproperty(object):
+    """A read-only property computed once per instance.
+
+    The first access calls the decorated method and stores the result in
+    the instance `__dict__` under the same name, which then shadows this
+    descriptor, so later accesses are plain attribute lookups. Deleting
+    the attribute makes the next access compute it again.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.func(obj)
+        obj.__dict__[self.name] = value
+        return value
@@ -0,0 +1,137 @@
+'''Dictionary caches persisted as a JSON file plus an append-only journal.
+'''
+import codecs
+import json
+import os
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+__all__ = ['JournaledDict']
+
+
+class JournaledDict(MutableMapping):
+    """An ordered dict backed by a JSON file and a JSON-lines journal.
+
+    Each change is appended to `<path>.journal` and flushed as it is made,
+    so a crash loses at most the entry being written. Loading replays the
+    journal over the JSON file, ignoring a truncated last line. `compact`
+    rewrites the JSON file atomically, in the same format as before, and
+    removes the journal. Nothing is read from disk until first use.
+
+    Setting `journaled` to False keeps later changes in memory only, for
+    copies in worker processes whose changes the parent process applies.
+    """
+
+    def __init__(self, path):
+        """Back the dict with the JSON file at `path`."""
+        self.path = path
+        self.journal_path = path + '.journal'
+        self._data = None
+        self._persisted = None
+        self._journal = None
+        self._dirty = False
+        self.journaled = True
+
+    def load(self):
+        """Read the JSON file and journal now rather than on first use."""
+        self._load()
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        data = OrderedDict()
+        if os.path.isfile(self.path):
+            with codecs.open(self.path, 'r', encoding='utf8') as f:
+                data = json.loads(f.read(), object_pairs_hook=OrderedDict)
+        if os.path.isfile(self.journal_path):
+            good = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError
+                        record = json.loads(line.decode('utf8'))
+                    except ValueError:
+                        break
+                    if len(record) == 2:
+                        data[record[0]] = record[1]
+                    else:
+                        data.pop(record[0], None)
+                    good += len(line)
+            # Drop a partially written record so appends start cleanly.
+            if good != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good)
+            self._dirty = True
+        self._data = data
+        self._persisted = dict(data)
+        return data
+
+    def _append(self, record):
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._journal = codecs.open(
+                self.journal_path, 'a', encoding='utf8')
+        self._journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._journal.flush()
+        self._dirty = True
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __setitem__(self, key, value):
+        self._load()[key] = value
+        if not self.journaled:
+            return
+        if key not in self._persisted or self._persisted[key] != value:
+            self._append([key, value])
+            self._persisted[key] = value
+
+    def __delitem__(self, key):
+        del self._load()[key]
+        if self.journaled and key in self._persisted:
+            self._append([key])
+            del self._persisted[key]
+
+    def __contains__(self, key):
+        return key in self._load()
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def move_to_end(self, key, last=True):
+        """Reorder `key`, as `OrderedDict.move_to_end` does."""
+        self._load().move_to_end(key, last=last)
+        self._dirty = True
+
+    def clear(self):
+        """Remove all entries, writing the empty JSON file at once."""
+        self._load().clear()
+        if not self.journaled:
+            return
+        self._persisted.clear()
+        self._dirty = True
+        self.compact()
+
+    def compact(self):
+        """Write all entries to the JSON file and discard the journal."""
+        if not self._dirty:
+            return
+        jsonstring = json.dumps(self._data, indent='\t',
+                                separators=(',', ':'), ensure_ascii=False)
+        tmp_path = self.path + '.tmp'
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with codecs.open(tmp_path, 'w', encoding='utf8') as f:
+            f.write(jsonstring)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.isfile(self.journal_path):
+            os.remove(self.journal_path)
+        self._dirty = False
@@ -0,0 +1,216 @@
+'''Add photometry from published tables described by declarative specs.
+'''
+import os
+from collections import OrderedDict
+from decimal import Decimal
+from math import isnan
+
+import numpy as np
+from astrocats.catalog.photometry import PHOTOMETRY
+from astrocats.catalog.utils import is_number, jd_to_mjd, pbar
+
+__all__ = ['add_table_photometry', 'photometry_columns']
+
+
+def _column(table, colname):
+    """Return the cells of a column as `convert_aq_output` writes them, and
+    whether each is a finite number.
+    """
+    col = table[colname]
+    mask = np.ma.getmaskarray(col)
+    data = np.ma.getdata(col)
+    if data.dtype.kind in 'iuf':
+        values = data.astype(str).astype(object)
+        valid = ~mask
+        if data.dtype.kind == 'f':
+            valid &= ~np.isnan(data)
+    else:
+        values = np.array(
+            [str(x) if is_number(x) else x for x in data], dtype=object)
+        valid = ~mask & np.array(
+            [is_number(x) and not isnan(float(x)) for x in values],
+            dtype=bool)
+    values[mask] = '--'
+    return values, valid
+
+
+def _load_tables(catalog, spec):
+    if 'file' in spec:
+        from astropy.io.ascii import read
+        path = os.path.join(catalog.get_current_task_repo(), spec['file'])
+        return [read(path, format=spec.get('format'))]
+    result = catalog.vizier.get_catalogs(spec['catalog'])
+    tables = list(result)
+    if isinstance(spec['catalog'], str):
+        tables = tables[:1]
+    for table in tables:
+        table.convert_bytestring_to_unicode(python3_only=True)
+    return tables
+
+
+def _times(spec, values):
+    if spec.get('time_format', 'mjd') == 'mjd':
+        return values
+    offset = spec.get('time_offset')
+    times = []
+    for value in values:
+        jd = Decimal(value)
+        if offset:
+            jd += Decimal(offset)
+        times.append(str(jd_to_mjd(jd)))
+    return times
+
+
+def _entry_names(catalog, table, spec, name, source):
+    """Return the entry name and source of every row, creating the entries
+    as `new_entry` does.
+    """
+    if name is None and 'name_column' not in spec:
+        name, source = catalog.new_entry(spec['name'], bibcode=spec['bibcode'])
+    if name is not None:
+        return [name] * len(table), {name: source}
+    prefix = spec.get('name_prefix', '')
+    raw_names = [
+        prefix + x if prefix and is_number(x[:4]) else x
+        for x in _column(table, spec['name_column'])[0]
+    ]
+    resolved = OrderedDict()
+    for raw in raw_names:
+        if raw not in resolved:
+            resolved[raw] = catalog.new_entry(raw, bibcode=spec['bibcode'])
+    return ([resolved[x][0] for x in raw_names],
+            dict(resolved.values()))
+
+
+def _add_table(catalog, table, spec, task_str, name, source):
+    row_names, sources = _entry_names(catalog, table, spec, name, source)
+    colnames = table.colnames
+    suffix = spec.get('mag_suffix', 'mag')
+    if 'bands' in spec:
+        bandtags = [
+            x + suffix for x in spec['bands'] if x + suffix in colnames
+        ]
+    else:
+        bandtags = [
+            x for x in colnames
+            if x.endswith(suffix) and not x.startswith('e_')
+        ]
+    if not bandtags or not len(table):
+        return
+
+    # One row per table row and one column per band, so that points come out
+    # row by row, band by band within a row, as the tables are laid out.
+    mags, valid = zip(*[_column(table, x) for x in bandtags])
+    mags = np.stack(mags, axis=1)
+    valid = np.stack(valid, axis=1)
+    rows, cols = np.nonzero(valid)
+    if not len(rows):
+        return
+    bands = np.array([
+        x.replace(suffix, '') + spec.get('band_suffix', '') for x in bandtags
+    ], dtype=object)
+
+    upper = np.zeros(valid.shape, dtype=bool)
+    if spec.get('upper_limit'):
+        for bi, bandtag in enumerate(bandtags):
+            if 'l_' + bandtag in colnames:
+                upper[:, bi] = np.isin(
+                    _column(table, 'l_' + bandtag)[0].astype(str),
+                    spec['upper_limit'])
+
+    errs = np.full(valid.shape, None, dtype=object)
+    if spec.get('e_magnitude', True):
+        scale = spec.get('e_scale')
+        for bi, bandtag in enumerate(bandtags):
+            if 'e_' + bandtag not in colnames:
+                continue
+            evalues, evalid = _column(table, 'e_' + bandtag)
+            use = ~upper[:, bi]
+            if scale or spec.get('e_valid', False):
+                use &= evalid
+            if scale:
+                evalues[use] = [
+                    str(Decimal(scale) * Decimal(x)) for x in evalues[use]
+                ]
+            errs[use, bi] = evalues[use]
+
+    point_rows = np.unique(rows)
+    times = dict(zip(point_rows, _times(
+        spec, _column(table, spec['time'])[0][point_rows])))
+    extra = OrderedDict(
+        (key, _column(table, col)[0])
+        for key, col in spec.get('columns', {}).items())
+
+    point_names = np.array([row_names[x] for x in rows], dtype=object)
+    for entry_name in pbar(list(OrderedDict.fromkeys(point_names)),
+                           task_str):
+        sel = point_names == entry_name
+        prows, pcols = rows[sel], cols[sel]
+        photodict = dict(spec.get('values', {}))
+        photodict.update({
+            PHOTOMETRY.TIME: [times[x] for x in prows],
+            PHOTOMETRY.U_TIME: 'MJD',
+            PHOTOMETRY.BAND: bands[pcols].tolist(),
+            PHOTOMETRY.MAGNITUDE: mags[prows, pcols].tolist(),
+            PHOTOMETRY.E_MAGNITUDE: errs[prows, pcols].tolist(),
+            PHOTOMETRY.SOURCE: sources[entry_name]
+        })
+        upl = upper[prows, pcols]
+        if upl.any():
+            photodict[PHOTOMETRY.UPPER_LIMIT] = [
+                True if x else None for x in upl
+            ]
+        for key, values in extra.items():
+            photodict[key] = values[prows].tolist()
+        catalog.entries[entry_name].add_photometry_batch(**photodict)
+
+
+def add_table_photometry(catalog, spec, task_str=None, name=None,
+                         source=None):
+    """Add the photometry in the table(s) described by `spec` to `catalog`.
+
+    `spec` is a dict with the keys:
+
+    * `catalog`: a VizieR ID, or list of IDs, passed to `get_catalogs`
+      (only the first table of a single ID is read); or `file`, a path
+      within the task's repository, read with astropy in `format`.
+    * `tables`: optional list of dicts, one per table, updating `spec`.
+    * `bibcode`, plus either `name`, the name of the one entry, or
+      `name_column`, the column naming each row's entry, with `name_prefix`
+      added to names that start with a year.  Alternatively, the `name` and
+      `source` of an existing entry may be passed to this function.
+    * `time`: the time column, in MJD, or in JD if `time_format` is 'jd',
+      with `time_offset` added to it.
+    * `bands`: the bands, with a column of magnitudes named by adding
+      `mag_suffix` ('mag' by default); if omitted, every column ending in
+      the suffix is a band.  `band_suffix` is appended to each band.
+    * `upper_limit`: the values of the 'l_' column of a band that mark an
+      upper limit, which is given without an error.
+    * `e_magnitude`: set to False to ignore the 'e_' columns of errors.
+      Errors are multiplied by `e_scale`, and with `e_valid` only numbers
+      are kept.
+    * `columns`: a dict mapping photometry keys to the columns holding
+      them, and `values`, a dict of photometry values shared by every point.
+
+    Columns are converted and checked as a whole, keeping the cells
+    `convert_aq_output` would give, and every band magnitude that is a
+    finite number becomes a point, added to its entry in one batch.
+    """
+    base = dict(spec)
+    overrides = base.pop('tables', None)
+    tables = _load_tables(catalog, base)
+    for ti, table in enumerate(tables):
+        tspec = dict(base)
+        if overrides:
+            tspec.update(overrides[ti])
+        _add_table(catalog, table, tspec, task_str, name, source)
+
+
+def photometry_columns(photodicts):
+    """Return the columns `add_photometry_batch` takes for a list of
+    per-point photometry dicts, with `None` for keys a point lacks.
+    """
+    names = OrderedDict()
+    for photodict in photodicts:
+        names.update((x, None) for x in photodict)
+    return dict((name, [x.get(name) for x in photodicts]) for name in names)
@@ -0,0 +1,234 @@
+'''Query the Transient Name Server API concurrently.
+'''
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from astrocats.catalog.utils import sortOD
+
+from .store import JournaledDict
+
+__all__ = ['TNSCache', 'TNSClient']
+
+
+class TNSClient(object):
+    """Fetch objects from the TNS `get/object` API on a pool of threads.
+
+    Every request made by the pool waits for a shared rate limit, spacing
+    requests at least `1 / rate` seconds apart to stay within the TNS quota.
+    Each thread keeps its own HTTP session, so connections are reused. A
+    failed request is retried after a jittered exponential backoff.
+    """
+
+    def __init__(self, url, api_key, threads=4, rate=1.0, retries=3,
+                 backoff=5.0, timeout=60):
+        """Query the API at `url`, which ends in a slash, with `api_key`.
+
+        `retries` is the number of attempts made for each object, the first
+        retry waiting about `backoff` seconds, and `timeout` is the limit in
+        seconds on each request.
+        """
+        self._url = url
+        self._api_key = api_key
+        self._threads = threads
+        self._interval = 1.0 / rate
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def _wait(self):
+        # The lock is held while sleeping, and the next request is timed from
+        # the moment this one is let through, so that threads waking late
+        # cannot send their requests together.
+        with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next = time.monotonic() + self._interval
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+        return session
+
+    def get_object(self, objname, **options):
+        """Return the API reply for `objname`, or None if every attempt failed.
+
+        `options` are added to the request, e.g. `photometry='1'`.
+        """
+        from requests import RequestException
+        data = {
+            'api_key': self._api_key,
+            'data': json.dumps(dict(objname=objname, **options))
+        }
+        for attempt in range(self._retries):
+            self._wait()
+            try:
+                response = self._session().post(
+                    self._url + 'get/object', data=data,
+                    timeout=self._timeout)
+                response.raise_for_status()
+                reply = response.json()['data']['reply']
+                if reply:
+                    return reply
+            except (RequestException, ValueError, KeyError, TypeError):
+                pass
+            if attempt + 1 < self._retries:
+                time.sleep(self._backoff * 2 ** attempt *
+                           random.uniform(0.5, 1.5))
+        return None
+
+    def get_objects(self, objnames, **options):
+        """Yield `(objname, reply)` for each of `objnames`, in the order given.
+
+        Requests run ahead of the consumer on the thread pool, keeping a
+        bounded number outstanding. Closing the generator early cancels the
+        requests not yet started.
+        """
+        window = deque()
+        executor = ThreadPoolExecutor(max_workers=self._threads)
+        try:
+            for objname in objnames:
+                window.append((objname, executor.submit(
+                    self.get_object, objname, **options)))
+                if len(window) > 2 * self._threads:
+                    objname, future = window.popleft()
+                    yield objname, future.result()
+            while window:
+                objname, future = window.popleft()
+                yield objname, future.result()
+        finally:
+            for objname, future in window:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+class TNSCache(object):
+    """TNS objects kept on disk, with their photometry and spectra.
+
+    Each object is requested once with both payloads and written under
+    `path` as `<objname>.json`. The index `index.json` records the discovery
+    date of every cached object, so that freshness is decided without
+    reading the objects. An object discovered more than `FINAL_DAYS` ago is
+    final and is always read from disk; a more recent one is requested again
+    the first time it is asked for by each `TNSCache`.
+    """
+
+    INDEX = 'index.json'
+    FINAL_DAYS = 90
+
+    def __init__(self, path, url, api_key, threads=4, rate=1.0):
+        """Cache objects from the TNS API at `url` in the directory `path`.
+
+        `threads` and `rate` are passed to the `TNSClient` making requests.
+        """
+        self._path = path
+        self._client = TNSClient(url, api_key, threads=threads, rate=rate)
+        self._index = JournaledDict(os.path.join(path, self.INDEX))
+        self._fetched = set()
+
+    def _object_path(self, objname):
+        return os.path.join(self._path, objname + '.json')
+
+    def _is_cached(self, objname):
+        if objname in self._fetched:
+            return True
+        if objname not in self._index:
+            return False
+        try:
+            discovered = datetime.strptime(
+                self._index[objname], '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return False
+        return (datetime.now() - discovered).days > self.FINAL_DAYS
+
+    def _load(self, objname):
+        try:
+            with open(self._object_path(objname), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, objname, objdict):
+        with open(self._object_path(objname), 'w') as f:
+            json.dump(sortOD(objdict), f, indent='\t', separators=(',', ':'),
+                      ensure_ascii=False, sort_keys=True)
+        # The index is written last, marking the object as complete.
+        self._index[objname] = objdict.get('discoverydate') or ''
+
+    def _fetch(self, objname, reply):
+        """Save and return the API `reply` for `objname`, or return None if
+        it is not a valid object.
+        """
+        if (not reply or 'objname' not in reply or
+                not isinstance(reply['objname'], str)):
+            return None
+        self._write(objname, reply)
+        self._fetched.add(objname)
+        return reply
+
+    def seed(self, photometry_path, spectra_path):
+        """Fill an empty cache from the caches kept before it, holding the
+        objects requested with their photometry under `photometry_path` and
+        with their spectra under `spectra_path`.
+
+        Only objects found in both are copied, the others are requested
+        when first asked for. Does nothing once the cache has objects.
+        """
+        if len(self._index) or not os.path.isdir(photometry_path):
+            return
+        os.makedirs(self._path, exist_ok=True)
+        for fname in sorted(os.listdir(photometry_path)):
+            objname, ext = os.path.splitext(fname)
+            if ext != '.json':
+                continue
+            try:
+                with open(os.path.join(photometry_path, fname), 'r') as f:
+                    objdict = json.load(f)
+                with open(os.path.join(spectra_path, fname), 'r') as f:
+                    spectra = json.load(f).get('spectra')
+            except (OSError, ValueError, AttributeError):
+                continue
+            if not isinstance(objdict, dict) or 'objname' not in objdict:
+                continue
+            if spectra is not None:
+                objdict['spectra'] = spectra
+            self._write(objname, objdict)
+        self._index.compact()
+
+    def get_objects(self, objnames):
+        """Yield `(objname, objdict)` for each of `objnames`, in the order
+        given, with None for objects the TNS did not return.
+
+        Objects not cached are requested concurrently, ahead of the consumer.
+        Cached objects are read from disk as they are yielded.
+        """
+        os.makedirs(self._path, exist_ok=True)
+        objnames = list(objnames)
+        cached = set(x for x in objnames if self._is_cached(x))
+        replies = self._client.get_objects(
+            (x for x in objnames if x not in cached),
+            photometry='1', spectra='1')
+        try:
+            for objname in objnames:
+                if objname in cached:
+                    objdict = self._load(objname)
+                    if objdict is None:
+                        objdict = self._fetch(objname, self._client.get_object(
+                            objname, photometry='1', spectra='1'))
+                else:
+                    objdict = self._fetch(objname, next(replies)[1])
+                yield objname, objdict
+        finally:
+            replies.close()
+            self._index.compact()
@@ -0,0 +1,173 @@
+'''Query VizieR through astroquery, keeping every result on disk.
+'''
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['VizierCache']
+
+
+class VizierCache(object):
+    """A stand-in for `astroquery.vizier.Vizier` that caches on disk.
+
+    VizieR tables are frozen published data, so each `get_catalogs` result
+    is written under `path` the first time it is retrieved and read back
+    from there on every later call, without contacting VizieR. A warm cache
+    therefore also replays the queries offline. Each query is stored in its
+    own directory, named after the catalog IDs and a hash of the query
+    parameters. The directory holds one ECSV file per table, which keeps
+    masks, units, and metadata exactly, and an index of the table names.
+
+    `prefetch` retrieves uncached queries on a pool of threads ahead of
+    time; `get_catalogs` then waits only for the query it asks for.
+
+    Queries that return no tables are not cached, as they are more likely
+    a failed request than an empty catalog. `invalidate` drops a cached
+    query, and with `refresh` every query is retrieved again the first
+    time it is made, replacing the cached copy.
+    """
+
+    INDEX = 'tables.json'
+
+    def __init__(self, path, server=None, row_limit=-1, threads=8,
+                 timeout=60, refresh=False):
+        """Cache the results of queries to `server` in the directory `path`.
+
+        `threads` bounds the number of concurrent requests made by
+        `prefetch`, and `timeout` is the limit in seconds on each request.
+        """
+        self._path = path
+        self._server = server
+        self._row_limit = row_limit
+        self._threads = threads
+        self._timeout = timeout
+        self._refresh = refresh
+        self._local = threading.local()
+        self._pending = {}
+        self._fetched = set()
+
+    def _query_path(self, catalog):
+        catalogs = [catalog] if isinstance(catalog, str) else list(catalog)
+        params = json.dumps([catalogs, self._row_limit])
+        digest = hashlib.sha1(params.encode('utf-8')).hexdigest()[:12]
+        stem = re.sub(r'[^A-Za-z0-9.+-]+', '_', '-'.join(catalogs))[:100]
+        return os.path.join(self._path, stem + '-' + digest)
+
+    def _load(self, path):
+        from astropy.table import Table
+        try:
+            with open(os.path.join(path, self.INDEX), 'r') as f:
+                names = json.load(f)
+            if not names:
+                return None
+            return OrderedDict(
+                (name, Table.read(os.path.join(path, str(i) + '.ecsv'),
+                                  format='ascii.ecsv'))
+                for i, name in enumerate(names))
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, path, tables):
+        tmp_path = path + '.tmp' + str(os.getpid())
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for i, table in enumerate(tables.values()):
+            table.write(os.path.join(tmp_path, str(i) + '.ecsv'),
+                        format='ascii.ecsv')
+        # The index is written last, marking the directory as complete.
+        with open(os.path.join(tmp_path, self.INDEX), 'w') as f:
+            json.dump(list(tables.keys()), f)
+        if os.path.isdir(path):
+            # Move a stale or refreshed copy aside so that it can be replaced.
+            old_path = tmp_path + '.old'
+            try:
+                os.replace(path, old_path)
+            except OSError:
+                pass
+            shutil.rmtree(old_path, ignore_errors=True)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if self._load(path) is None:
+                raise
+
+    def _query(self, catalog):
+        # Each thread gets its own client, as they are not thread-safe.
+        vizier = getattr(self._local, 'vizier', None)
+        if vizier is None:
+            from astroquery.vizier import Vizier
+            kwargs = {'row_limit': self._row_limit, 'timeout': self._timeout}
+            if self._server:
+                kwargs['vizier_server'] = self._server
+            vizier = self._local.vizier = Vizier(**kwargs)
+        result = vizier.get_catalogs(catalog)
+        return OrderedDict((name, result[name]) for name in result.keys())
+
+    def _fetch(self, path, catalog):
+        tables = self._query(catalog)
+        if tables:
+            self._save(path, tables)
+        self._fetched.add(path)
+        return tables
+
+    def _cached(self, path):
+        return (os.path.isfile(os.path.join(path, self.INDEX)) and
+                not (self._refresh and path not in self._fetched))
+
+    def cached(self, catalog):
+        """Return whether the result of `catalog` is read from disk."""
+        return self._cached(self._query_path(catalog))
+
+    def invalidate(self, catalog):
+        """Drop the cached result of `catalog`, so that it is retrieved
+        again the next time it is asked for.
+        """
+        path = self._query_path(catalog)
+        self._pending.pop(path, None)
+        self._fetched.discard(path)
+        shutil.rmtree(path, ignore_errors=True)
+
+    def prefetch(self, catalogs):
+        """Start retrieving each query in `catalogs` that is not cached.
+
+        Each element is an argument that will later be passed to
+        `get_catalogs`.
+        """
+        os.makedirs(self._path, exist_ok=True)
+        executor = None
+        for catalog in catalogs:
+            path = self._query_path(catalog)
+            if path in self._pending or self._cached(path):
+                continue
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=self._threads)
+            self._pending[path] = executor.submit(self._fetch, path, catalog)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def get_catalogs(self, catalog):
+        """Return the tables of `catalog`, a VizieR ID or list of IDs, as an
+        astroquery `TableList`.
+        """
+        from astroquery.utils import TableList
+        path = self._query_path(catalog)
+        tables = None
+        future = self._pending.pop(path, None)
+        if future is not None:
+            try:
+                tables = future.result()
+            except Exception:
+                # Retried below, raising the error if it happens again.
+                pass
+        if not tables and self._cached(path):
+            tables = self._load(path) or tables
+        if tables is None:
+            os.makedirs(self._path, exist_ok=True)
+            tables = self._fetch(path, catalog)
+        return TableList(tables)